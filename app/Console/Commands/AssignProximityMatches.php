@@ -0,0 +1,23 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Jobs\AssignAiProximityMatches;
+use Illuminate\Console\Command;
+
+class AssignProximityMatches extends Command
+{
+    protected $signature = 'proximity:assign-matches {--campus= : Only assign users of this campus}';
+
+    protected $description = 'Queue Find Your Match assignment for every eligible user without a pick (rate and concurrency limited).';
+
+    public function handle(): int
+    {
+        $campus = $this->option('campus') ?: null;
+        AssignAiProximityMatches::dispatch($campus);
+
+        $this->info('Queued Find Your Match assignment'.($campus ? " for campus {$campus}" : '').'.');
+
+        return self::SUCCESS;
+    }
+}
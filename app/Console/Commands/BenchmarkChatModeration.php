@@ -0,0 +1,82 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\ChatContentModeration;
+use Illuminate\Console\Command;
+use Illuminate\Support\Str;
+
+class BenchmarkChatModeration extends Command
+{
+    protected $signature = 'chat-moderation:benchmark
+        {--keywords=5000 : Synthetic banned keywords added on top of the configured lists}
+        {--messages=5000 : Synthetic messages to moderate}';
+
+    protected $description = 'Time chat moderation with large keyword lists: per-keyword scan vs compiled check() vs batched checkMany().';
+
+    public function handle(): int
+    {
+        $keywordCount = max(0, (int) $this->option('keywords'));
+        $messageCount = max(1, (int) $this->option('messages'));
+
+        $config = config('chat_moderation', []);
+        for ($i = 0; $i < $keywordCount; $i++) {
+            $config['banned_keywords'][] = Str::lower(Str::random(random_int(5, 12)));
+        }
+
+        $words = ['hey', 'how', 'are', 'you', 'study', 'later', 'library', 'coffee', 'class', 'see', 'tomorrow', 'exam', 'thanks', 'cool'];
+        $messages = [];
+        for ($i = 0; $i < $messageCount; $i++) {
+            $sentence = [];
+            for ($w = random_int(4, 20); $w > 0; $w--) {
+                $sentence[] = $words[array_rand($words)];
+            }
+            // Roughly 1 in 10 messages hits a rule
+            if ($i % 10 === 0) {
+                $sentence[] = $config['banned_keywords'][array_rand($config['banned_keywords'])];
+            }
+            $messages[] = implode(' ', $sentence);
+        }
+
+        $moderation = new ChatContentModeration($config);
+
+        $start = hrtime(true);
+        $moderation->check('warm up');
+        $compileMs = (hrtime(true) - $start) / 1e6;
+
+        $start = hrtime(true);
+        $naiveBlocked = 0;
+        $lists = array_merge($config['social_domains'] ?? [], $config['money_phrases'] ?? [], $config['banned_keywords'] ?? []);
+        foreach ($messages as $message) {
+            $lower = Str::lower($message);
+            foreach ($lists as $entry) {
+                if (str_contains($lower, Str::lower($entry))) {
+                    $naiveBlocked++;
+                    break;
+                }
+            }
+        }
+        $naiveMs = (hrtime(true) - $start) / 1e6;
+
+        $start = hrtime(true);
+        $singleBlocked = 0;
+        foreach ($messages as $message) {
+            $singleBlocked += $moderation->check($message)['allowed'] ? 0 : 1;
+        }
+        $singleMs = (hrtime(true) - $start) / 1e6;
+
+        $start = hrtime(true);
+        $batchBlocked = collect($moderation->checkMany($messages))->where('allowed', false)->count();
+        $batchMs = (hrtime(true) - $start) / 1e6;
+
+        $entries = count($lists);
+        $this->line("Rule entries: {$entries}, messages: {$messageCount}, compile: ".round($compileMs, 2).' ms');
+        $this->table(['Approach', 'Blocked', 'Total (ms)', 'Per message (µs)'], [
+            ['Per-keyword str_contains scan', $naiveBlocked, round($naiveMs, 2), round($naiveMs * 1000 / $messageCount, 2)],
+            ['check() per message', $singleBlocked, round($singleMs, 2), round($singleMs * 1000 / $messageCount, 2)],
+            ['checkMany() batch', $batchBlocked, round($batchMs, 2), round($batchMs * 1000 / $messageCount, 2)],
+        ]);
+
+        return self::SUCCESS;
+    }
+}
@@ -0,0 +1,133 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\User;
+use App\Services\DiscoverMatchmakingService;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Hash;
+use Illuminate\Support\Str;
+
+class BenchmarkDiscover extends Command
+{
+    protected $signature = 'discover:benchmark
+        {--users=100000 : Synthetic users to seed}
+        {--iterations=50 : Discover requests to time per mode}
+        {--boosted=200 : Seeded users with an active boost}';
+
+    protected $description = 'Seed synthetic users inside a transaction, time Discover (ORDER BY RAND + COUNT vs id-pivot sampling, p50/p95), then roll everything back.';
+
+    public function handle(DiscoverMatchmakingService $discover): int
+    {
+        $count = max(1, (int) $this->option('users'));
+        $iterations = max(1, (int) $this->option('iterations'));
+        $boosted = max(0, (int) $this->option('boosted'));
+
+        DB::beginTransaction();
+
+        try {
+            $this->info("Seeding {$count} users...");
+            $campus = 'Benchmark '.Str::random(6);
+            $this->seedUsers($campus, $count, $boosted);
+
+            $viewers = User::query()->where('campus', $campus)->inRandomOrder()->limit($iterations)->get();
+            $filterSets = [
+                'no filters' => [],
+                'campus + program' => ['campus' => $campus, 'academic_program' => 'BS Nursing'],
+            ];
+
+            $rows = [];
+            foreach ($filterSets as $label => $filters) {
+                $legacyTimes = [];
+                $sampledTimes = [];
+                foreach ($viewers as $viewer) {
+                    $start = hrtime(true);
+                    $this->legacyDiscover($viewer, $filters);
+                    $legacyTimes[] = (hrtime(true) - $start) / 1e6;
+
+                    $start = hrtime(true);
+                    $discover->getMatches($viewer, 1, $filters, true);
+                    $sampledTimes[] = (hrtime(true) - $start) / 1e6;
+                }
+                $rows[] = ["ORDER BY RAND + COUNT ({$label})", count($legacyTimes), ...$this->summarize($legacyTimes)];
+                $rows[] = ["id-pivot sampling ({$label})", count($sampledTimes), ...$this->summarize($sampledTimes)];
+            }
+
+            $this->table(['Path', 'Runs', 'p50 (ms)', 'p95 (ms)', 'Max (ms)'], $rows);
+        } finally {
+            DB::rollBack();
+        }
+
+        return self::SUCCESS;
+    }
+
+    /** The previous Discover query: full COUNT then ORDER BY RAND() LIMIT 20, boost first. */
+    private function legacyDiscover(User $viewer, array $filters): void
+    {
+        $q = User::query()
+            ->where('profile_completed', true)
+            ->where('is_disabled', false)
+            ->whereNotNull('profile_picture')
+            ->where('profile_picture', '!=', '')
+            ->whereNotIn('id', [$viewer->id]);
+        foreach ($filters as $column => $value) {
+            $q->where($column, 'like', '%'.$value.'%');
+        }
+
+        (clone $q)->count();
+        $q->orderByRaw('(boost_ends_at IS NOT NULL AND boost_ends_at > ?) DESC', [now()])
+            ->inRandomOrder()
+            ->limit(20)
+            ->get();
+    }
+
+    private function seedUsers(string $campus, int $count, int $boosted): void
+    {
+        $password = Hash::make(Str::random(16));
+        $now = now();
+        $genders = ['Male', 'Female', 'Lesbian', 'Gay'];
+        $programs = ['BS Computer Science', 'BS Nursing', 'BS Education', 'BS Criminology', 'BS Biology'];
+        $years = ['1st Year', '2nd Year', '3rd Year', '4th Year'];
+        $rows = [];
+
+        for ($i = 1; $i <= $count; $i++) {
+            $rows[] = [
+                'name' => "Bench User {$i}",
+                'email' => "bench-{$i}-".Str::lower(Str::random(8)).'@example.test',
+                'password' => $password,
+                'display_name' => "bench_{$i}_".Str::lower(Str::random(6)),
+                'campus' => $i % 4 === 0 ? $campus.' North' : $campus,
+                'academic_program' => $programs[$i % count($programs)],
+                'year_level' => $years[$i % count($years)],
+                'gender' => $genders[$i % count($genders)],
+                'profile_picture' => "https://picsum.photos/400/400?random={$i}",
+                'profile_completed' => true,
+                'boost_ends_at' => $i <= $boosted ? $now->copy()->addHour() : null,
+                'created_at' => $now,
+                'updated_at' => $now,
+            ];
+
+            if (count($rows) === 1000) {
+                DB::table('users')->insert($rows);
+                $rows = [];
+            }
+        }
+
+        if ($rows !== []) {
+            DB::table('users')->insert($rows);
+        }
+    }
+
+    /**
+     * @param  list<float>  $times
+     * @return array{0: float, 1: float, 2: float}
+     */
+    private function summarize(array $times): array
+    {
+        sort($times);
+        $pick = fn (float $p): float => round($times[(int) min(count($times) - 1, floor($p * count($times)))], 2);
+
+        return [$pick(0.50), $pick(0.95), round(end($times), 2)];
+    }
+}
@@ -0,0 +1,274 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\Campus;
+use App\Models\Conversation;
+use App\Models\LikeCounter;
+use App\Models\SwipeAction;
+use App\Models\User;
+use App\Services\GeoHash;
+use App\Services\LeaderboardService;
+use App\Services\MatchmakingService;
+use App\Services\NearbyMatchService;
+use App\Services\RequestMetrics;
+use Illuminate\Console\Command;
+use Illuminate\Contracts\Http\Kernel as HttpKernel;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Auth;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Str;
+
+class BenchmarkHotPaths extends Command
+{
+    protected $signature = 'benchmark:hot-paths
+        {--users=2000 : Synthetic users to seed}
+        {--viewers=30 : Users the requests are made as}
+        {--iterations=3 : Requests per viewer and path}
+        {--seed=42 : Random seed, so runs are comparable}
+        {--max-p95= : Exit with failure when any path\'s p95 (ms) is above this}';
+
+    protected $description = 'Seed realistic users, swipes, tags and messages inside a transaction, replay the hot endpoints with instrumentation on, report p50/p95 per path, then roll everything back.';
+
+    public function handle(HttpKernel $kernel, MatchmakingService $matchmaking, NearbyMatchService $nearby): int
+    {
+        $userCount = max(2, (int) $this->option('users'));
+        $viewerCount = max(1, min($userCount, (int) $this->option('viewers')));
+        $iterations = max(1, (int) $this->option('iterations'));
+        mt_srand((int) $this->option('seed'));
+        fake()->seed((int) $this->option('seed'));
+
+        // Keep the run self-contained: nothing cached, queued, broadcast or sent to OpenAI survives it
+        config([
+            'instrumentation.enabled' => true,
+            'instrumentation.headers' => true,
+            'instrumentation.log' => false,
+            'cache.default' => 'array',
+            'session.driver' => 'array',
+            'broadcasting.default' => 'null',
+            'queue.connections.benchmark' => ['driver' => 'null'],
+            'queue.default' => 'benchmark',
+            'openai.api_key' => null,
+        ]);
+
+        DB::beginTransaction();
+
+        try {
+            $this->info("Seeding {$userCount} users with swipes and conversations...");
+            $campus = $this->seedCampus();
+            $userIds = $this->seedUsers($campus, $userCount);
+            $this->seedSwipes($userIds);
+            $viewers = User::query()->whereIn('id', array_slice($userIds, 0, $viewerCount))->get();
+            $conversationIds = $this->seedConversations($viewers, $userIds);
+
+            foreach ($viewers as $viewer) {
+                $matchmaking->rebuildIndexFor($viewer);
+            }
+            app(LeaderboardService::class)->refreshAll();
+
+            $paths = [
+                'browse' => fn (User $u): string => '/api/matchmaking',
+                'discover' => fn (User $u): string => '/api/matchmaking/discover',
+                'radar' => fn (User $u): string => '/api/proximity-match/radar',
+                'proximity match' => fn (User $u): string => '/api/proximity-match',
+                'chat inbox' => fn (User $u): string => '/api/conversations',
+                'chat messages' => fn (User $u): string => '/api/conversations/'.$conversationIds[$u->id].'/messages',
+                'leaderboard' => fn (User $u): string => '/api/leaderboard?period=week',
+            ];
+
+            $rows = [];
+            $worstP95 = 0.0;
+            foreach ($paths as $label => $uri) {
+                $samples = [];
+                foreach ($viewers as $viewer) {
+                    for ($i = 0; $i < $iterations; $i++) {
+                        $samples[] = $this->request($kernel, $viewer, $uri($viewer));
+                    }
+                }
+                $rows[] = $this->row($label, $samples, $worstP95);
+            }
+
+            // Location heartbeat is a PUT behind CSRF, so it is timed at the service it calls
+            $samples = [];
+            $metrics = app(RequestMetrics::class);
+            foreach ($viewers as $viewer) {
+                for ($i = 0; $i < $iterations; $i++) {
+                    [$lat, $lon] = $this->randomPosition($campus);
+                    $metrics->start();
+                    $nearby->updateLocationAndNotify($viewer, $lat, $lon);
+                    $samples[] = $metrics->stop() + ['status' => 200];
+                }
+            }
+            $rows[] = $this->row('location heartbeat (service)', $samples, $worstP95);
+
+            $this->table(['Path', 'Runs', 'p50 (ms)', 'p95 (ms)', 'Max (ms)', 'Avg queries', 'Avg DB (ms)', 'Cache hit/miss', 'Non-2xx'], $rows);
+        } finally {
+            DB::rollBack();
+        }
+
+        $maxP95 = $this->option('max-p95');
+        if ($maxP95 !== null && $worstP95 > (float) $maxP95) {
+            $this->error("Slowest p95 {$worstP95} ms is above the {$maxP95} ms budget.");
+
+            return self::FAILURE;
+        }
+
+        return self::SUCCESS;
+    }
+
+    /**
+     * Send one GET through the full HTTP stack as $viewer and read the instrumentation headers back.
+     *
+     * @return array{duration_ms: float, queries: int, db_ms: float, cache_hits: int, cache_misses: int, status: int}
+     */
+    private function request(HttpKernel $kernel, User $viewer, string $uri): array
+    {
+        Auth::guard('web')->setUser($viewer);
+        $request = Request::create($uri, 'GET', server: ['HTTP_ACCEPT' => 'application/json']);
+        $response = $kernel->handle($request);
+        $kernel->terminate($request, $response);
+
+        preg_match('/hits=(\d+); misses=(\d+)/', (string) $response->headers->get('X-Metrics-Cache'), $cache);
+
+        return [
+            'duration_ms' => (float) $response->headers->get('X-Metrics-Duration-Ms'),
+            'queries' => (int) $response->headers->get('X-Metrics-Queries'),
+            'db_ms' => (float) $response->headers->get('X-Metrics-Db-Ms'),
+            'cache_hits' => (int) ($cache[1] ?? 0),
+            'cache_misses' => (int) ($cache[2] ?? 0),
+            'status' => $response->getStatusCode(),
+        ];
+    }
+
+    /**
+     * @param  list<array{duration_ms: float, queries: int, db_ms: float, cache_hits: int, cache_misses: int, status: int}>  $samples
+     * @return list<string|int|float>
+     */
+    private function row(string $label, array $samples, float &$worstP95): array
+    {
+        $times = array_column($samples, 'duration_ms');
+        sort($times);
+        $pick = fn (float $p): float => round($times[(int) min(count($times) - 1, floor($p * count($times)))], 2);
+        $worstP95 = max($worstP95, $pick(0.95));
+        $avg = fn (string $key): float => round(array_sum(array_column($samples, $key)) / count($samples), 1);
+
+        return [
+            $label,
+            count($samples),
+            $pick(0.50),
+            $pick(0.95),
+            round(end($times), 2),
+            $avg('queries'),
+            $avg('db_ms'),
+            $avg('cache_hits').' / '.$avg('cache_misses'),
+            count(array_filter($samples, fn (array $s): bool => $s['status'] >= 300)),
+        ];
+    }
+
+    private function seedCampus(): Campus
+    {
+        return Campus::create([
+            'name' => 'Benchmark '.Str::random(6),
+            'base_latitude' => 9.0783,
+            'base_longitude' => 126.1986,
+        ]);
+    }
+
+    /** @return list<int> */
+    private function seedUsers(Campus $campus, int $count): array
+    {
+        $now = now();
+        $firstId = (int) DB::table('users')->max('id') + 1;
+
+        foreach (array_chunk(range(1, $count), 500) as $chunk) {
+            $rows = [];
+            foreach ($chunk as $i) {
+                [$lat, $lon] = $this->randomPosition($campus);
+                $rows[] = array_merge(User::factory()->raw(), [
+                    'email' => "bench-{$i}-".Str::lower(Str::random(8)).'@example.test',
+                    'nemsu_id' => 'BENCH-'.Str::upper(Str::random(10)),
+                    'campus' => $campus->name,
+                    'terms_accepted_at' => $now,
+                    'latitude' => $lat,
+                    'longitude' => $lon,
+                    'geohash' => GeoHash::encode($lat, $lon),
+                    'location_updated_at' => $now,
+                    'last_seen_at' => $now,
+                    'created_at' => $now,
+                    'updated_at' => $now,
+                ]);
+            }
+            DB::table('users')->insert($rows);
+        }
+
+        return User::query()->where('id', '>=', $firstId)->where('campus', $campus->name)->orderBy('id')->pluck('id')->all();
+    }
+
+    /** Each user swipes on ~15 random others; like counters are rebuilt from the swipes. */
+    private function seedSwipes(array $userIds): void
+    {
+        $intents = [SwipeAction::INTENT_DATING, SwipeAction::INTENT_FRIEND, SwipeAction::INTENT_STUDY_BUDDY, SwipeAction::INTENT_IGNORED];
+        $now = now();
+        $rows = [];
+        foreach ($userIds as $userId) {
+            $targets = array_unique(array_map(fn () => $userIds[mt_rand(0, count($userIds) - 1)], range(1, 15)));
+            foreach ($targets as $targetId) {
+                if ($targetId === $userId) {
+                    continue;
+                }
+                $rows[] = [
+                    'user_id' => $userId,
+                    'target_user_id' => $targetId,
+                    'intent' => $intents[mt_rand(0, count($intents) - 1)],
+                    'created_at' => $now->subMinutes(mt_rand(0, 60 * 24 * 7)),
+                    'updated_at' => $now,
+                ];
+            }
+            if (count($rows) >= 1000) {
+                DB::table('swipe_actions')->insert($rows);
+                $rows = [];
+            }
+        }
+        if ($rows !== []) {
+            DB::table('swipe_actions')->insert($rows);
+        }
+
+        LikeCounter::rebuildFromSwipeActions();
+    }
+
+    /**
+     * Every viewer gets 20 conversations of 10 messages each.
+     *
+     * @return array<int, int> Viewer id => one of their conversation ids
+     */
+    private function seedConversations($viewers, array $userIds): array
+    {
+        $picked = [];
+        foreach ($viewers as $viewer) {
+            // Never pair a viewer with themselves, so every viewer has a conversation for the messages path
+            $otherIds = array_values(array_diff($userIds, [$viewer->id]));
+            for ($c = 0; $c < 20; $c++) {
+                $otherId = $otherIds[mt_rand(0, count($otherIds) - 1)];
+                $conversation = Conversation::between($viewer->id, $otherId);
+                for ($m = 0; $m < 10; $m++) {
+                    $conversation->postMessage($m % 2 === 0 ? $otherId : $viewer->id, fake()->sentence(mt_rand(4, 16)));
+                }
+                $picked[$viewer->id] ??= $conversation->id;
+            }
+        }
+
+        return $picked;
+    }
+
+    /** @return array{0: float, 1: float} A point within ~400 m of the campus base */
+    private function randomPosition(Campus $campus): array
+    {
+        $distance = 400 * sqrt(mt_rand() / mt_getrandmax());
+        $angle = 2 * M_PI * mt_rand() / mt_getrandmax();
+
+        return [
+            round($campus->base_latitude + ($distance * cos($angle)) / 111320, 8),
+            round($campus->base_longitude + ($distance * sin($angle)) / (111320 * cos(deg2rad($campus->base_latitude))), 8),
+        ];
+    }
+}
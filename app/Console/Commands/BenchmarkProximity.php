@@ -0,0 +1,120 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\Campus;
+use App\Models\User;
+use App\Services\GeoHash;
+use App\Services\ProximityMatchService;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Hash;
+use Illuminate\Support\Str;
+
+class BenchmarkProximity extends Command
+{
+    protected $signature = 'proximity:benchmark
+        {--users=20000 : Synthetic positions to seed}
+        {--iterations=200 : Nearby / radar lookups to time}
+        {--spread=600 : Radius (meters) around the campus base the positions are scattered in}';
+
+    protected $description = 'Seed synthetic same-campus positions inside a transaction, time nearby and radar lookups (p50/p95), then roll everything back.';
+
+    public function handle(ProximityMatchService $proximity): int
+    {
+        $count = max(1, (int) $this->option('users'));
+        $iterations = max(1, (int) $this->option('iterations'));
+        $spreadM = max(1.0, (float) $this->option('spread'));
+        $baseLat = 9.0783;
+        $baseLon = 126.1986;
+
+        DB::beginTransaction();
+
+        try {
+            $campusName = 'Benchmark '.Str::random(6);
+            Campus::create(['name' => $campusName, 'base_latitude' => $baseLat, 'base_longitude' => $baseLon]);
+
+            $this->info("Seeding {$count} positions within {$spreadM}m of the campus base...");
+            $this->seedPositions($campusName, $count, $baseLat, $baseLon, $spreadM);
+
+            $viewers = User::query()->where('campus', $campusName)->inRandomOrder()->limit($iterations)->get();
+
+            $nearbyTimes = [];
+            $radarTimes = [];
+            $nearbyFound = 0;
+            foreach ($viewers as $viewer) {
+                $start = hrtime(true);
+                $nearbyFound += count($proximity->getNearbyUsersWithPosition($viewer));
+                $nearbyTimes[] = (hrtime(true) - $start) / 1e6;
+
+                $start = hrtime(true);
+                $proximity->getRadarData($viewer);
+                $radarTimes[] = (hrtime(true) - $start) / 1e6;
+            }
+
+            $this->table(['Path', 'Runs', 'p50 (ms)', 'p95 (ms)', 'Max (ms)'], [
+                ['getNearbyUsersWithPosition', count($nearbyTimes), ...$this->summarize($nearbyTimes)],
+                ['getRadarData', count($radarTimes), ...$this->summarize($radarTimes)],
+            ]);
+            $this->line('Average nearby users per lookup: '.round($nearbyFound / max(1, $viewers->count()), 1));
+        } finally {
+            DB::rollBack();
+        }
+
+        return self::SUCCESS;
+    }
+
+    private function seedPositions(string $campusName, int $count, float $baseLat, float $baseLon, float $spreadM): void
+    {
+        $password = Hash::make(Str::random(16));
+        $now = now();
+        $genders = ['Male', 'Female', 'Lesbian', 'Gay'];
+        $rows = [];
+
+        for ($i = 1; $i <= $count; $i++) {
+            // Uniform point in a disc around the base
+            $distance = $spreadM * sqrt(mt_rand() / mt_getrandmax());
+            $angle = 2 * M_PI * mt_rand() / mt_getrandmax();
+            $lat = $baseLat + ($distance * cos($angle)) / 111320;
+            $lon = $baseLon + ($distance * sin($angle)) / (111320 * cos(deg2rad($baseLat)));
+
+            $rows[] = [
+                'name' => "Bench User {$i}",
+                'email' => "bench-{$i}-".Str::lower(Str::random(8)).'@example.test',
+                'password' => $password,
+                'display_name' => "bench_{$i}_".Str::lower(Str::random(6)),
+                'campus' => $campusName,
+                'gender' => $genders[$i % count($genders)],
+                'profile_completed' => true,
+                'latitude' => round($lat, 8),
+                'longitude' => round($lon, 8),
+                'geohash' => GeoHash::encode($lat, $lon),
+                'last_seen_at' => $now,
+                'location_updated_at' => $now,
+                'created_at' => $now,
+                'updated_at' => $now,
+            ];
+
+            if (count($rows) === 1000) {
+                DB::table('users')->insert($rows);
+                $rows = [];
+            }
+        }
+
+        if ($rows !== []) {
+            DB::table('users')->insert($rows);
+        }
+    }
+
+    /**
+     * @param  list<float>  $times
+     * @return array{0: float, 1: float, 2: float}
+     */
+    private function summarize(array $times): array
+    {
+        sort($times);
+        $pick = fn (float $p): float => round($times[(int) min(count($times) - 1, floor($p * count($times)))], 2);
+
+        return [$pick(0.50), $pick(0.95), round(end($times), 2)];
+    }
+}
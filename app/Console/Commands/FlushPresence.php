@@ -0,0 +1,21 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\PresenceService;
+use Illuminate\Console\Command;
+
+class FlushPresence extends Command
+{
+    protected $signature = 'presence:flush';
+
+    protected $description = 'Write buffered presence heartbeats to users.last_seen_at in one bulk update. Scheduled every minute.';
+
+    public function handle(PresenceService $presence): int
+    {
+        $count = $presence->flush();
+        $this->info("Last seen updated for {$count} users.");
+
+        return self::SUCCESS;
+    }
+}
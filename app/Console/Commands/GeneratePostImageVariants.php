@@ -0,0 +1,41 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Jobs\GeneratePostImageVariants as GenerateVariantsJob;
+use App\Models\Post;
+use App\Services\PostImageVariants;
+use Illuminate\Console\Command;
+
+class GeneratePostImageVariants extends Command
+{
+    protected $signature = 'posts:image-variants';
+
+    protected $description = 'Queue thumbnail and feed-sized WebP generation for existing post images (new uploads are queued automatically).';
+
+    public function handle(): int
+    {
+        if (! PostImageVariants::supported()) {
+            $this->error('GD with WebP support is required to generate image variants.');
+
+            return self::FAILURE;
+        }
+
+        $queued = 0;
+        Post::query()
+            ->without('user')
+            ->where(fn ($q) => $q->whereNotNull('image')->orWhereNotNull('images'))
+            ->whereNull('image_variants')
+            ->select('id')
+            ->chunkById(500, function ($posts) use (&$queued) {
+                foreach ($posts as $post) {
+                    GenerateVariantsJob::dispatch($post->id);
+                    $queued++;
+                }
+            });
+
+        $this->info("Queued image variants for {$queued} posts.");
+
+        return self::SUCCESS;
+    }
+}
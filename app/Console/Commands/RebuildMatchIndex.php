@@ -0,0 +1,40 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Jobs\RefreshMatchIndex;
+use App\Models\User;
+use Illuminate\Console\Command;
+
+class RebuildMatchIndex extends Command
+{
+    protected $signature = 'matchmaking:rebuild-index {--user= : Rebuild only this user id}';
+
+    protected $description = 'Queue a rebuild of the precomputed Browse compatibility index (match_scores) for every eligible user. Run nightly.';
+
+    public function handle(): int
+    {
+        if ($this->option('user')) {
+            RefreshMatchIndex::dispatch((int) $this->option('user'), false);
+            $this->info('Queued match index rebuild for user '.$this->option('user').'.');
+
+            return self::SUCCESS;
+        }
+
+        $queued = 0;
+        User::query()
+            ->where('profile_completed', true)
+            ->where('is_disabled', false)
+            ->select('id')
+            ->chunkById(1000, function ($users) use (&$queued): void {
+                foreach ($users as $user) {
+                    RefreshMatchIndex::dispatch($user->id, false);
+                    $queued++;
+                }
+            });
+
+        $this->info("Queued match index rebuild for {$queued} users.");
+
+        return self::SUCCESS;
+    }
+}
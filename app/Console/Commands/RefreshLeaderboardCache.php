@@ -2,19 +2,25 @@
 
 namespace App\Console\Commands;
 
-use App\Http\Controllers\LeaderboardController;
+use App\Models\LikeCounter;
+use App\Services\LeaderboardService;
 use Illuminate\Console\Command;
 
 class RefreshLeaderboardCache extends Command
 {
-    protected $signature = 'leaderboard:refresh';
+    protected $signature = 'leaderboard:refresh {--rebuild-counters : Recompute like_counters from swipe_actions first}';
 
-    protected $description = 'Clear leaderboard cache so day/week/month data is recomputed on next request. Run daily via cron for fresh daily reset.';
+    protected $description = 'Recompute day/week/month leaderboard rankings in place (readers keep the previous ranking until the new one is stored). Run at midnight for a warm "Today" reset.';
 
-    public function handle(): int
+    public function handle(LeaderboardService $leaderboard): int
     {
-        LeaderboardController::clearCache();
-        $this->info('Leaderboard cache cleared. Next page load will recompute day/week/month rankings.');
+        if ($this->option('rebuild-counters')) {
+            LikeCounter::rebuildFromSwipeActions();
+            $this->info('Like counters rebuilt from swipe actions.');
+        }
+
+        $leaderboard->refreshAll();
+        $this->info('Leaderboard rankings refreshed for day/week/month.');
 
         return self::SUCCESS;
     }
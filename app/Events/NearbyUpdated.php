@@ -2,7 +2,6 @@
 
 namespace App\Events;
 
-use App\Models\User;
 use Illuminate\Broadcasting\InteractsWithSockets;
 use Illuminate\Broadcasting\PrivateChannel;
 use Illuminate\Contracts\Broadcasting\ShouldBroadcastNow;
@@ -10,16 +9,18 @@
 use Illuminate\Queue\SerializesModels;
 
 /**
- * Fired when the count of people who like this user (dating intent) and are within 10m changes.
- * Anonymous: only the count is sent, not who they are (Love Alarm style).
+ * Broadcast on the geohash cell channels around someone who moved, so only Find Your Match clients
+ * that could have gained or lost a nearby heart refetch. Anonymous: no user, position or count is sent.
  */
-class ProximityAlarmTriggered implements ShouldBroadcastNow
+class NearbyUpdated implements ShouldBroadcastNow
 {
     use Dispatchable, InteractsWithSockets, SerializesModels;
 
+    /**
+     * @param  list<string>  $cells
+     */
     public function __construct(
-        public User $user,
-        public int $likersWithin10mCount
+        public array $cells
     ) {}
 
     /**
@@ -27,14 +28,12 @@ public function __construct(
      */
     public function broadcastOn(): array
     {
-        return [
-            new PrivateChannel('user.'.$this->user->id),
-        ];
+        return array_map(fn (string $cell) => new PrivateChannel('nearby.'.$cell), $this->cells);
     }
 
     public function broadcastAs(): string
     {
-        return 'ProximityAlarmTriggered';
+        return 'NearbyUpdated';
     }
 
     /**
@@ -42,8 +41,6 @@ public function broadcastAs(): string
      */
     public function broadcastWith(): array
     {
-        return [
-            'likers_within_10m_count' => $this->likersWithin10mCount,
-        ];
+        return [];
     }
 }
@@ -0,0 +1,58 @@
+<?php
+
+namespace App\Events;
+
+use App\Models\User;
+use Carbon\CarbonInterface;
+use Illuminate\Broadcasting\InteractsWithSockets;
+use Illuminate\Broadcasting\PrivateChannel;
+use Illuminate\Contracts\Broadcasting\ShouldBroadcastNow;
+use Illuminate\Foundation\Events\Dispatchable;
+use Illuminate\Queue\SerializesModels;
+use Illuminate\Support\Str;
+
+/**
+ * Broadcast on the user's private campus channel when they come back online, so lists showing
+ * online dots can update without polling. Clients treat a user as offline again once last_seen_at
+ * is older than online_within_minutes (unless they also see them on the online presence channel).
+ * Dispatched by PresenceService after the response has been sent.
+ */
+class PresenceChanged implements ShouldBroadcastNow
+{
+    use Dispatchable, InteractsWithSockets, SerializesModels;
+
+    public function __construct(
+        public User $user,
+        public CarbonInterface $lastSeenAt
+    ) {}
+
+    /**
+     * @return array<int, \Illuminate\Broadcasting\Channel>
+     */
+    public function broadcastOn(): array
+    {
+        $slug = Str::slug(trim((string) $this->user->campus), '-');
+
+        return [
+            new PrivateChannel('campus.'.($slug !== '' ? $slug : 'default')),
+        ];
+    }
+
+    public function broadcastAs(): string
+    {
+        return 'PresenceChanged';
+    }
+
+    /**
+     * @return array<string, mixed>
+     */
+    public function broadcastWith(): array
+    {
+        return [
+            'user_id' => $this->user->id,
+            'is_online' => true,
+            'last_seen_at' => $this->lastSeenAt->toIso8601String(),
+            'online_within_minutes' => User::onlineWithinMinutes(),
+        ];
+    }
+}
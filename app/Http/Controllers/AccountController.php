@@ -2,9 +2,11 @@
 
 namespace App\Http\Controllers;
 
+use App\Jobs\RefreshMatchIndex;
 use App\Models\Course;
 use App\Models\Interest;
 use App\Models\Post;
+use App\Services\MatchmakingService;
 use App\Services\NearbyMatchService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Auth;
@@ -191,6 +193,11 @@ public function update(Request $request)
         // Update user (array fields are cast to JSON by User model)
         $user->update($validated);
 
+        // Refresh the precomputed Browse index for this user (and their place in others' lists)
+        if ($user->wasChanged(MatchmakingService::SCORING_FIELDS)) {
+            RefreshMatchIndex::dispatch($user->id);
+        }
+
         return back()->with('success', 'Profile updated successfully!');
     }
 
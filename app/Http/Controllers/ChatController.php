@@ -47,11 +47,14 @@ private function canMessage(User $other): bool
 
     /**
      * List conversations: all conversations with messages (matched users or message requests).
+     * Last message, unread counters and pending request state are denormalized on the conversation,
+     * so the inbox is served with a constant number of queries regardless of its size.
      */
     public function index(Request $request)
     {
         $blocked = $this->blockedUserIds();
         $me = Auth::user();
+        $userColumns = 'id,display_name,fullname,profile_picture,last_seen_at,is_workspace_verified';
 
         $conversations = Conversation::query()
             ->where(function ($q) use ($me): void {
@@ -59,10 +62,8 @@ public function index(Request $request)
             })
             ->whereNotIn('user1_id', $blocked)
             ->whereNotIn('user2_id', $blocked)
-            ->has('messages') // Only show conversations that have at least one message
-            ->with(['user1', 'user2', 'messages' => function ($q) {
-                $q->latest()->limit(1);
-            }])
+            ->whereNotNull('last_message_id') // Only show conversations that have at least one message
+            ->with(['user1:'.$userColumns, 'user2:'.$userColumns])
             ->orderByDesc('updated_at')
             ->get();
 
@@ -78,20 +79,6 @@ public function index(Request $request)
             // Show all conversations (matched or message requests)
             // If conversation exists, both parties should see it
 
-            $lastMessage = $c->messages->first(); // Already loaded via with()
-            $unreadCount = $c->messages()
-                ->where('sender_id', '!=', $me->id)
-                ->whereNull('read_at')
-                ->count();
-
-            // Check if this is a pending message request
-            $pendingRequest = MessageRequest::where(function ($q) use ($me, $other): void {
-                $q->where('from_user_id', $me->id)->where('to_user_id', $other->id)
-                    ->orWhere('from_user_id', $other->id)->where('to_user_id', $me->id);
-            })
-                ->where('status', MessageRequest::STATUS_PENDING)
-                ->first();
-
             $list[] = [
                 'id' => $c->id,
                 'other_user' => [
@@ -102,17 +89,17 @@ public function index(Request $request)
                     'is_online' => $other->isOnline(),
                     'is_workspace_verified' => (bool) $other->is_workspace_verified,
                 ],
-                'last_message' => $lastMessage ? [
-                    'id' => $lastMessage->id,
-                    'sender_id' => $lastMessage->sender_id,
-                    'body' => \Str::limit($lastMessage->body, 60),
-                    'read_at' => $lastMessage->read_at?->toIso8601String(),
-                    'created_at' => $lastMessage->created_at->toIso8601String(),
-                ] : null,
-                'unread_count' => $unreadCount,
+                'last_message' => [
+                    'id' => $c->last_message_id,
+                    'sender_id' => $c->last_message_sender_id,
+                    'body' => $c->last_message_body,
+                    'read_at' => $c->last_message_read_at?->toIso8601String(),
+                    'created_at' => $c->last_message_at?->toIso8601String(),
+                ],
+                'unread_count' => $c->unreadCountFor($me->id),
                 'updated_at' => $c->updated_at->toIso8601String(),
-                'is_pending_request' => $pendingRequest !== null,
-                'pending_request_from_me' => $pendingRequest && $pendingRequest->from_user_id === $me->id,
+                'is_pending_request' => $c->pending_request_from_id !== null,
+                'pending_request_from_me' => (int) $c->pending_request_from_id === $me->id,
             ];
         }
 
@@ -127,19 +114,17 @@ public function unreadCount(Request $request)
         $me = Auth::id();
         $blocked = $this->blockedUserIds();
 
-        $count = Message::query()
-            ->whereNull('read_at')
-            ->where('sender_id', '!=', $me)
-            ->whereHas('conversation', function ($q) use ($me, $blocked): void {
-                $q->where(function ($q) use ($me): void {
-                    $q->where('user1_id', $me)->orWhere('user2_id', $me);
-                })
-                    ->whereNotIn('user1_id', $blocked)
-                    ->whereNotIn('user2_id', $blocked);
+        $count = Conversation::query()
+            ->where(function ($q) use ($me): void {
+                $q->where('user1_id', $me)->orWhere('user2_id', $me);
             })
-            ->count();
+            ->whereNotIn('user1_id', $blocked)
+            ->whereNotIn('user2_id', $blocked)
+            ->toBase()
+            ->selectRaw('COALESCE(SUM(CASE WHEN user1_id = ? THEN user1_unread_count ELSE user2_unread_count END), 0) AS unread', [$me])
+            ->value('unread');
 
-        return response()->json(['count' => $count]);
+        return response()->json(['count' => (int) $count]);
     }
 
     /**
@@ -271,10 +256,7 @@ public function sendMessage(Request $request, Conversation $conversation)
             return response()->json(['message' => 'Unauthorized'], 403);
         }
 
-        $message = $conversation->messages()->create([
-            'sender_id' => $me->id,
-            'body' => $request->body,
-        ]);
+        $message = $conversation->postMessage($me->id, $request->body);
         $message->load('sender:id,display_name,fullname,profile_picture');
         broadcast(new MessageSent($message));
 
@@ -365,7 +347,7 @@ public function sendMessageToUser(Request $request)
 
         // Create conversation immediately so sender can see it in their chat list
         $conversation = Conversation::between($me->id, $other->id);
-        $conversation->touch(); // Ensure updated_at is current
+        $conversation->forceFill(['pending_request_from_id' => $me->id])->touch(); // Ensure updated_at is current
 
         // Create the message request
         $req = MessageRequest::create([
@@ -377,10 +359,7 @@ public function sendMessageToUser(Request $request)
         $req->load('fromUser:id,display_name,fullname,profile_picture');
 
         // Add message to conversation so it appears in sender's chat list
-        $message = $conversation->messages()->create([
-            'sender_id' => $me->id,
-            'body' => $request->body,
-        ]);
+        $message = $conversation->postMessage($me->id, $request->body);
         $message->load('sender:id,display_name,fullname,profile_picture');
 
         $conversation->load(['user1:id,display_name,fullname,profile_picture,last_seen_at', 'user2:id,display_name,fullname,profile_picture,last_seen_at']);
@@ -444,14 +423,20 @@ public function markRead(Request $request, Conversation $conversation)
                 ->whereNull('read_at')
                 ->update(['read_at' => now()]);
             $readIds = $conversation->messages()->whereIn('id', $messageIds)->whereNotNull('read_at')->pluck('id')->all();
+            if ($updated > 0) {
+                $conversation->syncReadState($me->id);
+            }
             if (count($readIds) > 0) {
                 broadcast(new MessageReadEvent($conversation->id, $me->id, $readIds));
             }
         } else {
-            $conversation->messages()
+            $updated = $conversation->messages()
                 ->where('sender_id', '!=', $me->id)
                 ->whereNull('read_at')
                 ->update(['read_at' => now()]);
+            if ($updated > 0 || $conversation->unreadCountFor($me->id) > 0) {
+                $conversation->syncReadState($me->id);
+            }
             $readIds = $conversation->messages()->where('sender_id', '!=', $me->id)->pluck('id')->all();
             if (count($readIds) > 0) {
                 broadcast(new MessageReadEvent($conversation->id, $me->id, $readIds));
@@ -521,6 +506,7 @@ public function acceptRequest(MessageRequest $messageRequest)
         }
 
         $messageRequest->update(['status' => MessageRequest::STATUS_ACCEPTED]);
+        Conversation::clearPendingRequest($messageRequest);
 
         // Conversation already exists from when request was sent
         $conversation = Conversation::where(function ($q) use ($messageRequest): void {
@@ -561,6 +547,7 @@ public function declineRequest(MessageRequest $messageRequest)
             return response()->json(['message' => 'Request already handled'], 422);
         }
         $messageRequest->update(['status' => MessageRequest::STATUS_DECLINED]);
+        Conversation::clearPendingRequest($messageRequest);
 
         return response()->json(['declined' => true]);
     }
@@ -2,25 +2,16 @@
 
 namespace App\Http\Controllers;
 
-use App\Models\SwipeAction;
-use App\Models\User;
-use Carbon\Carbon;
+use App\Services\LeaderboardService;
 use Illuminate\Http\Request;
-use Illuminate\Support\Facades\Cache;
-use Illuminate\Support\Facades\DB;
-use Illuminate\Support\Facades\Schema;
 use Inertia\Inertia;
 use Inertia\Response;
 
 class LeaderboardController extends Controller
 {
-    private const PERIOD_DAY = 'day';
-    private const PERIOD_WEEK = 'week';
-    private const PERIOD_MONTH = 'month';
-
-    private const CACHE_TTL_DAY = 300;      // 5 min
-    private const CACHE_TTL_WEEK = 900;     // 15 min
-    private const CACHE_TTL_MONTH = 3600;   // 1 hour
+    public function __construct(
+        private LeaderboardService $leaderboard
+    ) {}
 
     /**
      * Show the leaderboard page.
@@ -34,101 +25,15 @@ public function index(): Response
      * GET /api/leaderboard?period=day|week|month
      * Returns ranked users by likes received in the period (display_name, profile_picture, points, rank only).
      * Platform-wide: includes all registered users (any gender/orientation). No filter by viewer preferences.
+     * Served from the background-refreshed ranking cache (see LeaderboardService).
      */
     public function data(Request $request)
     {
-        $period = $request->input('period', self::PERIOD_DAY);
-        if (! in_array($period, [self::PERIOD_DAY, self::PERIOD_WEEK, self::PERIOD_MONTH], true)) {
-            $period = self::PERIOD_DAY;
-        }
-
-        $cacheKey = "leaderboard:{$period}";
-        $ttl = match ($period) {
-            self::PERIOD_WEEK => self::CACHE_TTL_WEEK,
-            self::PERIOD_MONTH => self::CACHE_TTL_MONTH,
-            default => self::CACHE_TTL_DAY,
-        };
-
-        $list = Cache::remember($cacheKey, $ttl, function () use ($period): array {
-            return $this->computeLeaderboard($period);
-        });
-
-        return response()->json(['data' => $list, 'period' => $period]);
-    }
-
-    /**
-     * Compute leaderboard for the given period.
-     * Platform-wide: counts every like received by any user. Includes all registered users
-     * (male, female, any orientation). Excludes only disabled and banned accounts.
-     * No filter by the current viewer's preferences or gender.
-     */
-    private function computeLeaderboard(string $period): array
-    {
-        $since = match ($period) {
-            self::PERIOD_WEEK => Carbon::now()->subDays(7)->startOfDay(),
-            self::PERIOD_MONTH => Carbon::now()->subDays(30)->startOfDay(),
-            default => Carbon::today()->startOfDay(),
-        };
-
-        $likeIntents = [
-            SwipeAction::INTENT_DATING,
-            SwipeAction::INTENT_FRIEND,
-            SwipeAction::INTENT_STUDY_BUDDY,
-        ];
-
-        // Count likes received by each user (all swipe_actions in period; no filter by who swiped or target gender)
-        $ranked = DB::table('swipe_actions')
-            ->whereIn('intent', $likeIntents)
-            ->where('created_at', '>=', $since)
-            ->whereNotNull('target_user_id')
-            ->selectRaw('target_user_id as user_id, count(*) as points')
-            ->groupBy('target_user_id')
-            ->orderByDesc('points')
-            ->limit(10)
-            ->get();
-
-        $userIds = $ranked->pluck('user_id')->unique()->values()->all();
-        if ($userIds === []) {
-            return [];
-        }
-
-        // Include all users who appear in the ranking: only exclude disabled and banned (no gender/preference filter)
-        $userQuery = User::query()
-            ->whereIn('id', $userIds)
-            ->where(function ($q) {
-                $q->where('is_disabled', false)->orWhereNull('is_disabled');
-            });
-        if (Schema::hasColumn('users', 'banned_at')) {
-            $userQuery->whereNull('banned_at');
-        }
-        $users = $userQuery->get(['id', 'display_name', 'profile_picture'])->keyBy('id');
-
-        $list = [];
-        $rank = 1;
-        foreach ($ranked as $row) {
-            $user = $users->get($row->user_id);
-            if (! $user) {
-                continue;
-            }
-            $list[] = [
-                'rank' => $rank,
-                'display_name' => $user->display_name ?? 'Unknown',
-                'profile_picture' => $user->profile_picture,
-                'points' => (int) $row->points,
-            ];
-            $rank++;
+        $period = $request->input('period', LeaderboardService::PERIOD_DAY);
+        if (! in_array($period, LeaderboardService::PERIODS, true)) {
+            $period = LeaderboardService::PERIOD_DAY;
         }
 
-        return $list;
-    }
-
-    /**
-     * Clear leaderboard cache (for cron / artisan command).
-     */
-    public static function clearCache(): void
-    {
-        Cache::forget('leaderboard:day');
-        Cache::forget('leaderboard:week');
-        Cache::forget('leaderboard:month');
+        return response()->json(['data' => $this->leaderboard->get($period), 'period' => $period]);
     }
 }
@@ -4,6 +4,7 @@
 
 use App\Events\NotificationSent;
 use App\Models\Conversation;
+use App\Models\LikeCounter;
 use App\Models\UserMatch;
 use App\Models\Notification;
 use App\Models\SwipeAction;
@@ -13,6 +14,7 @@
 use App\Services\DiscoverMatchmakingService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Auth;
+use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Carbon;
 
 class MatchmakingController extends Controller
@@ -257,10 +259,21 @@ public function action(Request $request)
             }
         }
 
-        SwipeAction::updateOrCreate(
-            ['user_id' => $me->id, 'target_user_id' => $targetId],
-            ['intent' => $intent]
-        );
+        // Read the previous intent and write the new one under a row lock, so a double submit counts a like once
+        // (two first-time inserts deadlock on the unique key; the retried one then sees the row)
+        DB::transaction(function () use ($me, $targetId, $intent): void {
+            $swipe = SwipeAction::where('user_id', $me->id)
+                ->where('target_user_id', $targetId)
+                ->lockForUpdate()
+                ->first();
+            $previousIntent = $swipe?->intent;
+            if ($swipe) {
+                $swipe->update(['intent' => $intent]);
+            } else {
+                $swipe = SwipeAction::create(['user_id' => $me->id, 'target_user_id' => $targetId, 'intent' => $intent]);
+            }
+            LikeCounter::recordIntentChange($swipe, $previousIntent);
+        }, 3);
 
         if ($request->boolean('super_like') && SwipeAction::isLikeIntent($intent) && $me->canSuperLikeToday()) {
             $me->useSuperLike();
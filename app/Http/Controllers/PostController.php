@@ -3,10 +3,12 @@
 namespace App\Http\Controllers;
 
 use App\Events\NotificationSent;
+use App\Jobs\GeneratePostImageVariants;
 use App\Models\Notification;
 use App\Models\Post;
 use App\Models\PostComment;
 use App\Models\PostReport;
+use App\Services\FeedService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Auth;
 use Illuminate\Support\Facades\Storage;
@@ -15,30 +17,14 @@
 class PostController extends Controller
 {
     /**
-     * Get all posts for feed
+     * Get posts for feed, newest first (cursor paging: follow next_page_url)
      */
-    public function index(Request $request)
+    public function index(Request $request, FeedService $feed)
     {
-        $perPage = min((int) $request->input('per_page', 15), 30);
-        $posts = Post::with(['user'])
-            ->latest()
-            ->paginate($perPage);
-
-        $payload = $posts->toArray();
-        $userIds = collect($payload['data'])->pluck('user_id')->unique()->values()->all();
-
-        $followingIds = Auth::user()->following()
-            ->whereIn('following_id', $userIds)
-            ->pluck('following_id')
-            ->all();
-
-        $authId = Auth::id();
-        foreach ($payload['data'] as &$item) {
-            $item['is_followed_by_user'] = in_array($item['user_id'], $followingIds);
-            $item['is_own_post'] = (int) $item['user_id'] === (int) $authId;
-        }
+        $perPage = max(1, min((int) $request->input('per_page', FeedService::DEFAULT_PER_PAGE), 30));
+        $cursor = $request->query('cursor');
 
-        $payload['current_user_id'] = $authId;
+        $payload = $feed->page(Auth::user(), is_string($cursor) ? $cursor : null, $perPage);
 
         // JSON for API consumers, Inertia page for normal visits (including admin link)
         if ($request->wantsJson()) {
@@ -107,6 +93,12 @@ public function store(Request $request)
         }
 
         $post = Post::create($validated);
+        FeedService::invalidate();
+
+        // Thumbnail and feed-sized WebP versions; the originals are served until they exist
+        if (count($imagePaths) > 0) {
+            GeneratePostImageVariants::dispatch($post->id);
+        }
 
         return response()->json([
             'message' => 'Post created successfully!',
@@ -273,6 +265,7 @@ public function update(Request $request, Post $post)
         ]);
 
         $post->update(['content' => $validated['content']]);
+        FeedService::invalidate();
 
         return response()->json([
             'message' => 'Post updated successfully!',
@@ -290,16 +283,13 @@ public function destroy(Post $post)
             return response()->json(['message' => 'Unauthorized'], 403);
         }
 
-        // Delete all images (images array and legacy single image)
-        $images = $post->images_list ?? [];
-        foreach ($images as $path) {
+        // Delete all images (originals, legacy single image and generated variants)
+        foreach ($post->storedImagePaths() as $path) {
             Storage::disk('public')->delete($path);
         }
-        if ($post->image && !in_array($post->image, $images)) {
-            Storage::disk('public')->delete($post->image);
-        }
 
         $post->delete();
+        FeedService::invalidate();
 
         return response()->json(['message' => 'Post deleted successfully!']);
     }
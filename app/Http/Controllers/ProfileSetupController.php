@@ -2,9 +2,11 @@
 
 namespace App\Http\Controllers;
 
+use App\Jobs\RefreshMatchIndex;
 use App\Models\AcademicProgram;
 use App\Models\Course;
 use App\Models\Interest;
+use App\Services\MatchmakingService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Auth;
 use Illuminate\Support\Facades\Storage;
@@ -120,6 +122,11 @@ public function store(Request $request)
         // Update user profile
         $user->update($validated);
 
+        // Refresh the precomputed Browse index for this user (and their place in others' lists)
+        if ($user->wasChanged(MatchmakingService::SCORING_FIELDS)) {
+            RefreshMatchIndex::dispatch($user->id);
+        }
+
         \Log::info('Profile updated successfully', ['user_id' => $user->id]);
 
         return redirect()->route('consent.show')->with('success', 'Profile completed! Please accept the terms to continue.');
@@ -176,6 +183,11 @@ public function update(Request $request)
 
         $user->update($validated);
 
+        // Refresh the precomputed Browse index for this user (and their place in others' lists)
+        if ($user->wasChanged(MatchmakingService::SCORING_FIELDS)) {
+            RefreshMatchIndex::dispatch($user->id);
+        }
+
         return back()->with('success', 'Profile updated successfully!');
     }
 }
@@ -4,6 +4,7 @@
 
 use App\Events\NotificationSent;
 use App\Models\Notification;
+use App\Services\NearbyMatchService;
 use App\Services\ProximityMatchService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Auth;
@@ -75,6 +76,7 @@ public function data(Request $request)
             'tapped_you_count' => $tappedYouCount,
             'tappers_for_tap_back' => $tappersForTapBack,
             'nearby_hearts' => $nearbyHearts,
+            'nearby_cell' => NearbyMatchService::nearbyCellFor($user),
         ];
 
         if ($request->query('debug') === '1') {
@@ -48,6 +48,7 @@ public function store(Request $request): RedirectResponse
         ]);
 
         Campus::create($validated);
+        Campus::forgetCanonicalNames();
         return redirect()->route('superadmin.campuses.index')
             ->with('success', 'Campus created.');
     }
@@ -81,6 +82,7 @@ public function update(Request $request, Campus $campus): RedirectResponse
         ]);
 
         $campus->update($validated);
+        Campus::forgetCanonicalNames();
         return redirect()->route('superadmin.campuses.index')
             ->with('success', 'Campus updated.');
     }
@@ -91,6 +93,7 @@ public function update(Request $request, Campus $campus): RedirectResponse
     public function destroy(Campus $campus): RedirectResponse
     {
         $campus->delete();
+        Campus::forgetCanonicalNames();
         return redirect()->route('superadmin.campuses.index')
             ->with('success', 'Campus deleted.');
     }
@@ -0,0 +1,53 @@
+<?php
+
+namespace App\Http\Middleware;
+
+use App\Services\RequestMetrics;
+use Closure;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Log;
+use Symfony\Component\HttpFoundation\Response;
+
+class InstrumentRequest
+{
+    /**
+     * Record query count, DB time, cache hits/misses and service timings for the request
+     * (only when instrumentation is enabled) and expose them as headers and/or a log line.
+     */
+    public function handle(Request $request, Closure $next): Response
+    {
+        if (! RequestMetrics::enabled()) {
+            return $next($request);
+        }
+
+        $metrics = app(RequestMetrics::class);
+        $metrics->start();
+        $response = $next($request);
+        $summary = $metrics->stop();
+
+        if (config('instrumentation.headers', true)) {
+            $response->headers->set('X-Metrics-Duration-Ms', (string) $summary['duration_ms']);
+            $response->headers->set('X-Metrics-Queries', (string) $summary['queries']);
+            $response->headers->set('X-Metrics-Db-Ms', (string) $summary['db_ms']);
+            $response->headers->set('X-Metrics-Cache', "hits={$summary['cache_hits']}; misses={$summary['cache_misses']}");
+
+            $serverTiming = ['total;dur='.$summary['duration_ms'], 'db;dur='.$summary['db_ms']];
+            foreach ($summary['timings'] as $name => $timing) {
+                $serverTiming[] = preg_replace('/[^A-Za-z0-9_-]/', '-', $name).';dur='.$timing['ms'];
+            }
+            $response->headers->set('Server-Timing', implode(', ', $serverTiming));
+        }
+
+        if (config('instrumentation.log', true) && $summary['duration_ms'] >= (int) config('instrumentation.log_slower_than_ms', 0)) {
+            Log::channel(config('instrumentation.log_channel'))->info('request.metrics', [
+                'method' => $request->method(),
+                'route' => $request->route()?->getName() ?? $request->path(),
+                'status' => $response->getStatusCode(),
+                'user_id' => $request->user()?->id,
+                ...$summary,
+            ]);
+        }
+
+        return $response;
+    }
+}
@@ -2,34 +2,30 @@
 
 namespace App\Http\Middleware;
 
+use App\Services\PresenceService;
 use Closure;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Auth;
-use Illuminate\Support\Facades\Cache;
 use Symfony\Component\HttpFoundation\Response;
 
 class UpdateLastSeen
 {
+    public function __construct(
+        private PresenceService $presence
+    ) {}
+
     /**
-     * Update the authenticated user's last_seen_at, throttled to once per minute.
+     * Record a presence heartbeat for the authenticated user (buffered, flushed to last_seen_at by presence:flush).
      */
     public function handle(Request $request, Closure $next): Response
     {
         $response = $next($request);
 
         $user = Auth::user();
-        if (! $user) {
-            return $response;
-        }
-
-        $key = 'last_seen:'.$user->id;
-        if (Cache::has($key)) {
-            return $response;
+        if ($user) {
+            $this->presence->heartbeat($user);
         }
 
-        Cache::put($key, true, now()->addMinute());
-        $user->update(['last_seen_at' => now()]);
-
         return $response;
     }
 }
@@ -0,0 +1,87 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\User;
+use App\Services\ProximityMatchService;
+use Illuminate\Contracts\Cache\Lock;
+use Illuminate\Contracts\Queue\ShouldBeUnique;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+use Illuminate\Queue\Middleware\RateLimited;
+use Illuminate\Support\Facades\Cache;
+
+/**
+ * Assign one user's Find Your Match pick in the background. Rate limited per minute and capped at
+ * `openai.match_concurrency` simultaneous runs so bulk assignment never floods the OpenAI API.
+ */
+class AssignAiProximityMatch implements ShouldQueue, ShouldBeUnique
+{
+    use Queueable;
+
+    /** Rate-limit and busy-slot releases don't count as failures; only real exceptions do. */
+    public int $maxExceptions = 3;
+
+    public int $uniqueFor = 3600;
+
+    public function __construct(
+        public int $userId
+    ) {}
+
+    /**
+     * Keep retrying while throttled for as long as the job stays unique; a bulk run can queue
+     * far more users than the rate limit lets through in a few attempts.
+     */
+    public function retryUntil(): \DateTimeInterface
+    {
+        return now()->addSeconds($this->uniqueFor);
+    }
+
+    public function uniqueId(): string
+    {
+        return (string) $this->userId;
+    }
+
+    /** @return array<int, object> */
+    public function middleware(): array
+    {
+        return [new RateLimited('ai-proximity-match')];
+    }
+
+    public function handle(ProximityMatchService $proximityMatch): void
+    {
+        $user = User::find($this->userId);
+        if (! $user) {
+            return;
+        }
+
+        $slot = $this->acquireSlot();
+        if (! $slot) {
+            $this->release(15);
+
+            return;
+        }
+
+        try {
+            $proximityMatch->getOrAssignMatch($user);
+        } finally {
+            $slot->release();
+        }
+    }
+
+    /** Take one of the concurrency slots, or null when all are busy */
+    private function acquireSlot(): ?Lock
+    {
+        $slots = max(1, (int) config('openai.match_concurrency', 4));
+        $timeout = (int) config('openai.request_timeout', 30) * 2;
+
+        for ($i = 0; $i < $slots; $i++) {
+            $lock = Cache::lock("ai-proximity-match:slot:{$i}", $timeout);
+            if ($lock->get()) {
+                return $lock;
+            }
+        }
+
+        return null;
+    }
+}
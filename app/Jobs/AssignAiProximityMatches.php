@@ -0,0 +1,46 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\AiProximityMatch;
+use App\Models\User;
+use Illuminate\Contracts\Queue\ShouldBeUnique;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+
+/**
+ * Fan out AssignAiProximityMatch for every eligible user (optionally one campus) without a current pick.
+ */
+class AssignAiProximityMatches implements ShouldQueue, ShouldBeUnique
+{
+    use Queueable;
+
+    public int $uniqueFor = 3600;
+
+    public function __construct(
+        public ?string $campus = null
+    ) {}
+
+    public function uniqueId(): string
+    {
+        return $this->campus ?? '*';
+    }
+
+    public function handle(): void
+    {
+        User::query()
+            ->whereNotNull('campus')
+            ->when($this->campus !== null, fn ($q) => $q->where('campus', $this->campus))
+            ->where('profile_completed', true)
+            ->where(function ($q) {
+                $q->where('is_disabled', false)->orWhereNull('is_disabled');
+            })
+            ->whereNotIn('id', AiProximityMatch::query()->select('user_id'))
+            ->select('id')
+            ->chunkById(500, function ($users): void {
+                foreach ($users as $user) {
+                    AssignAiProximityMatch::dispatch($user->id);
+                }
+            });
+    }
+}
@@ -0,0 +1,27 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Services\WebPushService;
+use Illuminate\Contracts\Queue\ShouldBeUniqueUntilProcessing;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+
+/**
+ * Drain the Web Push outbox. Dispatched with a short delay and unique until it starts, so every
+ * notification created inside the coalesce window is delivered by the same run.
+ */
+class DeliverWebPushes implements ShouldQueue, ShouldBeUniqueUntilProcessing
+{
+    use Queueable;
+
+    public int $tries = 3;
+
+    public function handle(WebPushService $webPush): void
+    {
+        if ($webPush->deliverPending() >= (int) config('webpush.batch_size', 1000)) {
+            // Full batch: more rows are likely waiting
+            self::dispatch();
+        }
+    }
+}
@@ -0,0 +1,54 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\Post;
+use App\Services\FeedService;
+use App\Services\PostImageVariants;
+use Illuminate\Contracts\Queue\ShouldBeUnique;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+
+/**
+ * Build the thumbnail and feed-sized WebP versions of a post's images after upload.
+ * The feed serves the originals until this has run.
+ */
+class GeneratePostImageVariants implements ShouldQueue, ShouldBeUnique
+{
+    use Queueable;
+
+    public int $uniqueFor = 600;
+
+    public function __construct(
+        public int $postId
+    ) {}
+
+    public function uniqueId(): string
+    {
+        return (string) $this->postId;
+    }
+
+    public function handle(PostImageVariants $variants): void
+    {
+        $post = Post::query()->without('user')->find($this->postId);
+        if (! $post || ! PostImageVariants::supported()) {
+            return;
+        }
+
+        $generated = $post->image_variants ?? [];
+        foreach ($post->originalImages() as $path) {
+            if (! isset($generated[$path])) {
+                $generated[$path] = $variants->generate($path);
+            }
+        }
+        $generated = array_filter($generated);
+        if ($generated === ($post->image_variants ?? [])) {
+            return;
+        }
+
+        // Don't bump updated_at: the post itself did not change
+        $post->timestamps = false;
+        $post->forceFill(['image_variants' => $generated])->saveQuietly();
+        FeedService::invalidate();
+    }
+}
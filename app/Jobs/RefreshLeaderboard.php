@@ -0,0 +1,32 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Services\LeaderboardService;
+use Illuminate\Contracts\Queue\ShouldBeUnique;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+
+/**
+ * Background recompute of one leaderboard period; unique so a burst of stale reads queues it once.
+ */
+class RefreshLeaderboard implements ShouldQueue, ShouldBeUnique
+{
+    use Queueable;
+
+    public int $uniqueFor = 300;
+
+    public function __construct(
+        public string $period
+    ) {}
+
+    public function uniqueId(): string
+    {
+        return $this->period;
+    }
+
+    public function handle(LeaderboardService $leaderboard): void
+    {
+        $leaderboard->refresh($this->period);
+    }
+}
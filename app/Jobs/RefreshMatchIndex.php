@@ -0,0 +1,52 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\User;
+use App\Services\MatchmakingService;
+use Illuminate\Contracts\Queue\ShouldBeUniqueUntilProcessing;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+
+/**
+ * Refresh the precomputed Browse index for one user: rebuild their own top-K list and,
+ * when their profile changed, re-score them inside everyone else's list.
+ */
+class RefreshMatchIndex implements ShouldQueue, ShouldBeUniqueUntilProcessing
+{
+    use Queueable;
+
+    /** Seconds a candidate refresh waits after a profile save, so a burst of saves costs one re-score. */
+    public const DEBOUNCE_SECONDS = 60;
+
+    /** Collapse repeated profile saves into one pending refresh; a save during a running refresh queues another. */
+    public int $uniqueFor = 600;
+
+    public function __construct(
+        public int $userId,
+        public bool $asCandidate = true
+    ) {
+        if ($asCandidate) {
+            $this->delay(self::DEBOUNCE_SECONDS);
+        }
+    }
+
+    public function uniqueId(): string
+    {
+        return $this->userId.':'.($this->asCandidate ? 'candidate' : 'viewer');
+    }
+
+    public function handle(MatchmakingService $matchmaking): void
+    {
+        $user = User::find($this->userId);
+        if (! $user) {
+            return;
+        }
+
+        $matchmaking->rebuildIndexFor($user);
+
+        if ($this->asCandidate) {
+            $matchmaking->refreshCandidateInIndexes($user);
+        }
+    }
+}
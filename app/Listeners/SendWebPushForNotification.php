@@ -4,23 +4,20 @@
 
 use App\Events\NotificationSent;
 use App\Services\WebPushService;
-use Illuminate\Contracts\Queue\ShouldQueue;
 
-class SendWebPushForNotification implements ShouldQueue
+class SendWebPushForNotification
 {
     public function __construct(
         protected WebPushService $webPush
     ) {}
 
+    /**
+     * Only records the notification in the push outbox; DeliverWebPushes sends it in the background.
+     */
     public function handle(NotificationSent $event): void
     {
-        $notification = $event->notification;
-        if ($notification->type !== 'nearby_heart_tap') {
-            $notification->load('fromUser:id,display_name,fullname,profile_picture');
-        }
-
         try {
-            $this->webPush->sendForNotification($notification);
+            $this->webPush->queueForNotification($event->notification);
         } catch (\Throwable $e) {
             report($e);
         }
@@ -3,6 +3,7 @@
 namespace App\Models;
 
 use Illuminate\Database\Eloquent\Model;
+use Illuminate\Support\Facades\Cache;
 
 class Campus extends Model
 {
@@ -20,4 +21,25 @@ public function hasBaseLocation(): bool
     {
         return $this->base_latitude !== null && $this->base_longitude !== null;
     }
+
+    /**
+     * Campus names keyed by their lowercased spelling, cached so normalizing a user's campus costs no query.
+     *
+     * @return array<string, string>
+     */
+    public static function canonicalNames(): array
+    {
+        return Cache::rememberForever('campuses:canonical_names', fn (): array => static::query()
+            ->pluck('name')
+            ->mapWithKeys(fn (string $name): array => [mb_strtolower(User::collapseWhitespace($name)) => $name])
+            ->all());
+    }
+
+    /**
+     * Drop the cached names after a campus is created, renamed or deleted.
+     */
+    public static function forgetCanonicalNames(): void
+    {
+        Cache::forget('campuses:canonical_names');
+    }
 }
@@ -5,11 +5,26 @@
 use Illuminate\Database\Eloquent\Model;
 use Illuminate\Database\Eloquent\Relations\BelongsTo;
 use Illuminate\Database\Eloquent\Relations\HasMany;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Str;
 
 class Conversation extends Model
 {
+    /** Length of the last-message snippet kept on the conversation for the inbox. */
+    public const SNIPPET_LENGTH = 60;
+
     protected $fillable = ['user1_id', 'user2_id'];
 
+    protected function casts(): array
+    {
+        return [
+            'last_message_read_at' => 'datetime',
+            'last_message_at' => 'datetime',
+            'user1_unread_count' => 'integer',
+            'user2_unread_count' => 'integer',
+        ];
+    }
+
     public function user1(): BelongsTo
     {
         return $this->belongsTo(User::class, 'user1_id');
@@ -31,6 +46,81 @@ public function otherUser(int $currentUserId): User
         return (int) $this->user1_id === (int) $currentUserId ? $this->user2 : $this->user1;
     }
 
+    /** Column holding the given participant's unread counter */
+    public function unreadColumnFor(int $userId): string
+    {
+        return (int) $this->user1_id === $userId ? 'user1_unread_count' : 'user2_unread_count';
+    }
+
+    /** Unread messages waiting for the given participant */
+    public function unreadCountFor(int $userId): int
+    {
+        return (int) $this->{$this->unreadColumnFor($userId)};
+    }
+
+    /**
+     * Create a message, store it as the inbox summary and bump the recipient's unread counter.
+     * Runs under a lock on the conversation row, as syncReadState() does, so a message arriving while the
+     * recipient reads is either counted by their recount or added to the counter after it.
+     */
+    public function postMessage(int $senderId, string $body): Message
+    {
+        return DB::transaction(function () use ($senderId, $body): Message {
+            static::query()->whereKey($this->id)->lockForUpdate()->value('id');
+
+            $message = $this->messages()->create(['sender_id' => $senderId, 'body' => $body]);
+            $recipientId = $senderId === (int) $this->user1_id ? (int) $this->user2_id : (int) $this->user1_id;
+
+            $this->increment($this->unreadColumnFor($recipientId), 1, [
+                'last_message_id' => $message->id,
+                'last_message_sender_id' => $message->sender_id,
+                'last_message_body' => Str::limit($message->body, self::SNIPPET_LENGTH),
+                'last_message_read_at' => null,
+                'last_message_at' => $message->created_at,
+            ]);
+
+            return $message;
+        });
+    }
+
+    /**
+     * Recount the reader's unread counter and refresh the last message read receipt after messages were marked read.
+     */
+    public function syncReadState(int $readerId): void
+    {
+        DB::transaction(function () use ($readerId): void {
+            $summary = static::query()
+                ->whereKey($this->id)
+                ->lockForUpdate()
+                ->first(['id', 'last_message_id', 'last_message_sender_id', 'last_message_read_at']);
+
+            $attributes = [$this->unreadColumnFor($readerId) => $this->messages()
+                ->where('sender_id', '!=', $readerId)
+                ->whereNull('read_at')
+                ->count()];
+            if ($summary->last_message_id !== null
+                && (int) $summary->last_message_sender_id !== $readerId
+                && $summary->last_message_read_at === null) {
+                $attributes['last_message_read_at'] = Message::whereKey($summary->last_message_id)->value('read_at');
+            }
+
+            // Reading must not reorder the inbox, so leave updated_at alone
+            static::query()->whereKey($this->id)->toBase()->update($attributes);
+            $this->forceFill($attributes)->syncOriginal();
+        });
+    }
+
+    /** Clear the pending message request marker once a request between the pair is handled */
+    public static function clearPendingRequest(MessageRequest $request): void
+    {
+        static::query()
+            ->where('user1_id', min($request->from_user_id, $request->to_user_id))
+            ->where('user2_id', max($request->from_user_id, $request->to_user_id))
+            ->where('pending_request_from_id', $request->from_user_id)
+            ->toBase()
+            ->update(['pending_request_from_id' => null]);
+    }
+
     /** Find or create a conversation between two users (user1_id < user2_id for uniqueness) */
     public static function between(int $userIdA, int $userIdB): self
     {
@@ -0,0 +1,85 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+use Illuminate\Database\Eloquent\Relations\BelongsTo;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Likes received by a user on one day. Maintained incrementally when a swipe is recorded so the
+ * leaderboard sums a few small buckets instead of grouping over swipe_actions.
+ * A like counts on the day its swipe row was created (same rule as swipe_actions.created_at).
+ */
+class LikeCounter extends Model
+{
+    /** Days of history kept by a rebuild (covers the 30-day "month" ranking). */
+    public const REBUILD_DAYS = 31;
+
+    public $timestamps = false;
+
+    protected $fillable = ['user_id', 'day', 'likes'];
+
+    protected function casts(): array
+    {
+        return [
+            'day' => 'date',
+            'likes' => 'integer',
+        ];
+    }
+
+    public function user(): BelongsTo
+    {
+        return $this->belongsTo(User::class);
+    }
+
+    /**
+     * Apply a swipe's intent change to the counters: +1 when it became a like, -1 when a like was withdrawn.
+     */
+    public static function recordIntentChange(SwipeAction $swipe, ?string $previousIntent): void
+    {
+        $wasLike = $previousIntent !== null && SwipeAction::isLikeIntent($previousIntent);
+        $isLike = SwipeAction::isLikeIntent($swipe->intent);
+        if ($wasLike === $isLike) {
+            return;
+        }
+
+        $day = ($swipe->created_at ?? now())->toDateString();
+
+        if ($isLike) {
+            DB::table('like_counters')->upsert(
+                [['user_id' => $swipe->target_user_id, 'day' => $day, 'likes' => 1]],
+                ['user_id', 'day'],
+                ['likes' => DB::raw('likes + 1')]
+            );
+
+            return;
+        }
+
+        DB::table('like_counters')
+            ->where('user_id', $swipe->target_user_id)
+            ->where('day', $day)
+            ->where('likes', '>', 0)
+            ->decrement('likes');
+    }
+
+    /**
+     * Recompute the recent counters from swipe_actions (migration backfill, seeders, repair).
+     */
+    public static function rebuildFromSwipeActions(): void
+    {
+        $since = now()->subDays(self::REBUILD_DAYS)->startOfDay();
+
+        DB::transaction(function () use ($since): void {
+            DB::table('like_counters')->delete();
+            DB::table('like_counters')->insertUsing(
+                ['user_id', 'day', 'likes'],
+                DB::table('swipe_actions')
+                    ->whereIn('intent', [SwipeAction::INTENT_DATING, SwipeAction::INTENT_FRIEND, SwipeAction::INTENT_STUDY_BUDDY])
+                    ->where('created_at', '>=', $since)
+                    ->selectRaw('target_user_id, DATE(created_at), count(*)')
+                    ->groupByRaw('target_user_id, DATE(created_at)')
+            );
+        });
+    }
+}
@@ -0,0 +1,34 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+use Illuminate\Database\Eloquent\Relations\BelongsTo;
+
+/**
+ * One row of the precomputed Browse index: how compatible candidate_user_id is for user_id (viewer).
+ * Rows are written only by MatchmakingService so scoring stays in one place.
+ */
+class MatchScore extends Model
+{
+    protected $fillable = ['user_id', 'candidate_user_id', 'compatibility_score', 'common_tags', 'score_breakdown'];
+
+    protected function casts(): array
+    {
+        return [
+            'compatibility_score' => 'integer',
+            'common_tags' => 'array',
+            'score_breakdown' => 'array',
+        ];
+    }
+
+    public function user(): BelongsTo
+    {
+        return $this->belongsTo(User::class);
+    }
+
+    public function candidate(): BelongsTo
+    {
+        return $this->belongsTo(User::class, 'candidate_user_id');
+    }
+}
@@ -27,13 +27,30 @@ protected function casts(): array
     {
         return [
             'images' => 'array',
+            'image_variants' => 'array',
         ];
     }
 
     /**
-     * Get list of image URLs (from images array or legacy single image)
+     * Get list of image paths to show: the feed-sized WebP once generated, otherwise the original upload
      */
     public function getImagesListAttribute(): array
+    {
+        return array_map(fn (string $path) => $this->image_variants[$path]['feed'] ?? $path, $this->originalImages());
+    }
+
+    /**
+     * Small WebP previews in the same order as images_list (originals until the variants exist)
+     */
+    public function thumbnailImages(): array
+    {
+        return array_map(fn (string $path) => $this->image_variants[$path]['thumb'] ?? $path, $this->originalImages());
+    }
+
+    /**
+     * Uploaded image paths (from images array or legacy single image)
+     */
+    public function originalImages(): array
     {
         $images = $this->images;
         if (is_array($images) && count($images) > 0) {
@@ -46,6 +63,22 @@ public function getImagesListAttribute(): array
         return [];
     }
 
+    /**
+     * Every stored file of this post: originals plus generated variants
+     */
+    public function storedImagePaths(): array
+    {
+        $paths = $this->originalImages();
+        if ($this->image && ! in_array($this->image, $paths)) {
+            $paths[] = $this->image;
+        }
+        foreach ($this->image_variants ?? [] as $variants) {
+            array_push($paths, ...array_values($variants));
+        }
+
+        return array_values(array_unique($paths));
+    }
+
     /**
      * Get the user who created the post
      */
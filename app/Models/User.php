@@ -66,6 +66,7 @@ class User extends Authenticatable
         'last_seen_at',
         'latitude',
         'longitude',
+        'geohash',
         'location_updated_at',
         'nearby_match_enabled',
         'nearby_match_radius_m',
@@ -112,6 +113,7 @@ protected function casts(): array
             'preferred_age_max' => 'integer',
             'nearby_match_enabled' => 'boolean',
             'location_updated_at' => 'datetime',
+            'match_index_built_at' => 'datetime',
             'courses' => 'array',
             'research_interests' => 'array',
             'extracurricular_activities' => 'array',
@@ -133,6 +135,36 @@ public function isBanned(): bool
         return $this->banned_at !== null;
     }
 
+    /**
+     * Store campus in one canonical spelling (trimmed, and the campuses.name casing when it matches one)
+     * so same-campus lookups can compare the column directly and use the (campus, geohash) index.
+     */
+    public function setCampusAttribute(?string $value): void
+    {
+        $this->attributes['campus'] = static::normalizeCampus($value);
+    }
+
+    public static function normalizeCampus(?string $campus): ?string
+    {
+        if ($campus === null) {
+            return null;
+        }
+        $campus = static::collapseWhitespace($campus);
+        if ($campus === '') {
+            return $campus;
+        }
+
+        return Campus::canonicalNames()[mb_strtolower($campus)] ?? $campus;
+    }
+
+    /**
+     * Trim and collapse runs of whitespace to a single space.
+     */
+    public static function collapseWhitespace(string $value): string
+    {
+        return preg_replace('/\s+/u', ' ', trim($value)) ?? trim($value);
+    }
+
     /**
      * Consider user "online" if last_seen_at is within this many minutes.
      */
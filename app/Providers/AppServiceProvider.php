@@ -6,9 +6,13 @@
 use Carbon\CarbonImmutable;
 use App\Events\NotificationSent;
 use App\Listeners\SendWebPushForNotification;
+use App\Services\RequestMetrics;
+use App\Services\WebPushService;
+use Illuminate\Cache\RateLimiting\Limit;
 use Illuminate\Support\Facades\Date;
 use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Facades\Event;
+use Illuminate\Support\Facades\RateLimiter;
 use Illuminate\Support\Facades\URL;
 use Illuminate\Support\Facades\Vite;
 use Illuminate\Support\Facades\View;
@@ -22,7 +26,11 @@ class AppServiceProvider extends ServiceProvider
      */
     public function register(): void
     {
-        //
+        // Shared per process so the Web Push HTTP client keeps its connections open between batches
+        $this->app->singleton(WebPushService::class);
+
+        // One collector per request lifecycle (see InstrumentRequest)
+        $this->app->singleton(RequestMetrics::class);
     }
 
     /**
@@ -32,6 +40,9 @@ public function boot(): void
     {
         Event::listen(NotificationSent::class, SendWebPushForNotification::class);
 
+        // Queued Find Your Match assignments share one OpenAI budget
+        RateLimiter::for('ai-proximity-match', fn () => Limit::perMinute(max(1, (int) config('openai.match_rate_per_minute', 60))));
+
         $this->configureDefaults();
         $this->configureVitePreload();
         $this->shareBrandingWithViews();
@@ -2,13 +2,29 @@
 
 namespace App\Services;
 
-use Illuminate\Support\Str;
+use Illuminate\Support\Facades\Cache;
 
 class ChatContentModeration
 {
     /** Generic URL pattern (http, https, or common tld-style) */
     private const URL_PATTERN = '/(?:https?:\/\/|www\.)[^\s<>"\']+|(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,}(?:\/[^\s<>"\']*)?/iu';
 
+    /** Keep each combined alternation well below PCRE's compiled pattern size limit */
+    private const MAX_PATTERN_LENGTH = 16000;
+
+    private const REASON_EMPTY = 'Message cannot be empty.';
+
+    private const REASON_LINK = 'Sharing links is not allowed in chat. Keep conversations on the app.';
+
+    private const REASON_SOCIAL = 'Sharing social media or external links is not allowed. Keep conversations on the app.';
+
+    private const REASON_MONEY = 'Messages about money, payments, or financial requests are not allowed.';
+
+    private const REASON_KEYWORD = 'This message contains content that is not allowed. Please keep the conversation appropriate and on the app.';
+
+    /** @var array<string, array{social: list<string>, money: list<string>, keywords: list<string>}> Compiled patterns per config hash (per process) */
+    private static array $compiled = [];
+
     public function __construct(
         private readonly array $config
     ) {}
@@ -23,89 +39,168 @@ public static function fromConfig(): self
      */
     public function check(string $body): array
     {
-        $body = trim($body);
-        if ($body === '') {
-            return ['allowed' => false, 'reason' => 'Message cannot be empty.'];
-        }
+        return $this->checkMany([$body])[0];
+    }
 
-        $lower = Str::lower($body);
+    /**
+     * Check many messages at once (imports, admin re-scans). Keys are preserved.
+     * Each rule runs as one preg_grep over the still-undecided messages instead of one call per message.
+     *
+     * @param  iterable<array-key, string>  $bodies
+     * @return array<array-key, array{allowed: bool, reason: string|null}>
+     */
+    public function checkMany(iterable $bodies): array
+    {
+        return RequestMetrics::measure('moderation', fn (): array => $this->moderate($bodies));
+    }
 
-        // 1. Links / URLs
-        if ($this->containsUrl($body)) {
-            if (! empty($this->config['block_links'])) {
-                return ['allowed' => false, 'reason' => 'Sharing links is not allowed in chat. Keep conversations on the app.'];
-            }
-            if ($this->containsSocialLink($body)) {
-                return ['allowed' => false, 'reason' => 'Sharing social media or external links is not allowed. Keep conversations on the app.'];
+    /**
+     * @param  iterable<array-key, string>  $bodies
+     * @return array<array-key, array{allowed: bool, reason: string|null}>
+     */
+    private function moderate(iterable $bodies): array
+    {
+        $results = [];
+        $pending = [];
+        foreach ($bodies as $key => $body) {
+            $body = trim((string) $body);
+            $results[$key] = null;
+            if ($body === '') {
+                $results[$key] = ['allowed' => false, 'reason' => self::REASON_EMPTY];
+            } else {
+                $pending[$key] = $body;
             }
         }
 
-        // 2. Social media links (even if block_links is false)
-        if ($this->containsSocialLink($body)) {
-            return ['allowed' => false, 'reason' => 'Sharing social media or external links is not allowed. Keep conversations on the app.'];
+        $patterns = $this->patterns();
+        $rules = [
+            [! empty($this->config['block_links']) ? [self::URL_PATTERN] : [], self::REASON_LINK],
+            [$patterns['social'], self::REASON_SOCIAL],
+            [$patterns['money'], self::REASON_MONEY],
+            [$patterns['keywords'], self::REASON_KEYWORD],
+        ];
+
+        foreach ($rules as [$rulePatterns, $reason]) {
+            foreach ($rulePatterns as $pattern) {
+                if ($pending === []) {
+                    break 2;
+                }
+                foreach ($this->matching($pattern, $pending) as $key) {
+                    $results[$key] = ['allowed' => false, 'reason' => $reason];
+                    unset($pending[$key]);
+                }
+            }
         }
 
-        // 3. Money / payment content
-        $moneyReason = $this->checkMoneyPhrases($lower);
-        if ($moneyReason !== null) {
-            return ['allowed' => false, 'reason' => $moneyReason];
+        foreach ($pending as $key => $body) {
+            $results[$key] = ['allowed' => true, 'reason' => null];
         }
 
-        // 4. Banned keywords
-        $keywordReason = $this->checkBannedKeywords($lower);
-        if ($keywordReason !== null) {
-            return ['allowed' => false, 'reason' => $keywordReason];
+        return $results;
+    }
+
+    /**
+     * Keys of the bodies the pattern matches. If PCRE fails on the batch (invalid UTF-8, backtrack or JIT limit)
+     * each body is retried alone, and a body the pattern still cannot be evaluated on counts as a match:
+     * moderation fails closed.
+     *
+     * @param  array<array-key, string>  $bodies
+     * @return list<array-key>
+     */
+    private function matching(string $pattern, array $bodies): array
+    {
+        $matched = preg_grep($pattern, $bodies);
+        if ($matched !== false && preg_last_error() === PREG_NO_ERROR) {
+            return array_keys($matched);
         }
 
-        return ['allowed' => true, 'reason' => null];
+        return array_keys(array_filter($bodies, fn (string $body): bool => preg_match($pattern, $body) !== 0));
     }
 
-    private function containsUrl(string $body): bool
+    /**
+     * Combined patterns for the configured lists, built once per config version and cached across requests.
+     *
+     * @return array{social: list<string>, money: list<string>, keywords: list<string>}
+     */
+    private function patterns(): array
     {
-        return (bool) preg_match(self::URL_PATTERN, $body);
+        $lists = [
+            'social' => array_values($this->config['social_domains'] ?? []),
+            'money' => array_values($this->config['money_phrases'] ?? []),
+            'keywords' => array_values($this->config['banned_keywords'] ?? []),
+        ];
+        $hash = md5(serialize($lists));
+
+        return self::$compiled[$hash] ??= Cache::rememberForever("chat_moderation:patterns:v2:{$hash}", fn () => [
+            'social' => $this->compile($lists['social'], fn (string $entry): bool => false),
+            'money' => $this->compile($lists['money'], fn (string $entry): bool => str_contains($entry, '.*') || str_contains($entry, '\d')),
+            'keywords' => $this->compile($lists['keywords'], fn (string $entry): bool => str_contains($entry, '.*')),
+        ]);
     }
 
-    private function containsSocialLink(string $body): bool
+    /**
+     * Compile a list into as few case-insensitive alternations as the size limit allows.
+     * Entries flagged by $isRegex are used as regex fragments; invalid ones, and ones with numbered backreferences
+     * (their group numbers shift once combined), are skipped. The rest match literally.
+     *
+     * @param  list<string>  $entries
+     * @param  callable(string): bool  $isRegex
+     * @return list<string>
+     */
+    private function compile(array $entries, callable $isRegex): array
     {
-        $domains = $this->config['social_domains'] ?? [];
-        $lower = Str::lower($body);
-        foreach ($domains as $domain) {
-            if (Str::contains($lower, $domain)) {
-                return true;
+        $alternatives = [];
+        foreach ($entries as $entry) {
+            $entry = (string) $entry;
+            if ($entry === '') {
+                continue;
+            }
+            if ($isRegex($entry)) {
+                $fragment = str_replace('#', '\\#', $entry);
+                if (preg_match('/\\\\(?:[1-9]|g\{?[-+]?\d)|\(\?[-+]?\d|\(\?R\)/', $fragment) || ! self::compiles('#'.$fragment.'#iu')) {
+                    continue;
+                }
+                $alternatives[] = '(?:'.$fragment.')';
+            } else {
+                $alternatives[] = preg_quote(mb_strtolower($entry), '#');
             }
         }
-        return false;
-    }
 
-    private function checkMoneyPhrases(string $lower): ?string
-    {
-        $phrases = $this->config['money_phrases'] ?? [];
-        foreach ($phrases as $phrase) {
-            if (str_contains($phrase, '.*') || str_contains($phrase, '\d')) {
-                $pattern = '#' . str_replace('#', '\\#', $phrase) . '#iu';
-                if (@preg_match($pattern, $lower) === 1) {
-                    return 'Messages about money, payments, or financial requests are not allowed.';
-                }
-            } elseif (Str::contains($lower, Str::lower($phrase))) {
-                return 'Messages about money, payments, or financial requests are not allowed.';
+        $chunks = [];
+        $chunk = [];
+        $length = 0;
+        foreach (array_unique($alternatives) as $alternative) {
+            if ($chunk !== [] && $length + strlen($alternative) > self::MAX_PATTERN_LENGTH) {
+                $chunks[] = $chunk;
+                $chunk = [];
+                $length = 0;
             }
+            $chunk[] = $alternative;
+            $length += strlen($alternative) + 1;
+        }
+        if ($chunk !== []) {
+            $chunks[] = $chunk;
         }
-        return null;
-    }
 
-    private function checkBannedKeywords(string $lower): ?string
-    {
-        $keywords = $this->config['banned_keywords'] ?? [];
-        foreach ($keywords as $keyword) {
-            if (str_contains($keyword, '.*')) {
-                $pattern = '#' . str_replace('#', '\\#', $keyword) . '#iu';
-                if (@preg_match($pattern, $lower) === 1) {
-                    return 'This message contains content that is not allowed. Please keep the conversation appropriate and on the app.';
-                }
-            } elseif (Str::contains($lower, Str::lower($keyword))) {
-                return 'This message contains content that is not allowed. Please keep the conversation appropriate and on the app.';
+        $patterns = [];
+        foreach ($chunks as $chunk) {
+            $combined = '#'.implode('|', $chunk).'#iu';
+            if (self::compiles($combined)) {
+                $patterns[] = $combined;
+
+                continue;
+            }
+            // Fragments that compile alone can still clash when combined (e.g. duplicate group names)
+            foreach ($chunk as $alternative) {
+                $patterns[] = '#'.$alternative.'#iu';
             }
         }
-        return null;
+
+        return $patterns;
+    }
+
+    private static function compiles(string $pattern): bool
+    {
+        return @preg_match($pattern, '') !== false;
     }
 }
@@ -5,6 +5,8 @@
 use App\Models\User;
 use Illuminate\Contracts\Pagination\LengthAwarePaginator;
 use Illuminate\Database\Eloquent\Builder;
+use Illuminate\Database\Eloquent\Collection;
+use Illuminate\Support\Facades\Cache;
 
 /**
  * Discover – random users (no scoring / no formula).
@@ -17,33 +19,69 @@
  * Safety exclusions (minimal to maximize variety):
  * - self, blocked, blocked-by
  *
+ * Sampling: instead of ORDER BY RAND() over the whole filtered set, rows are read from a few random
+ * id pivots (short indexed range scans). The total is a cached approximation, and faces served in the
+ * last SEEN_TTL_MINUTES are skipped until the pool runs dry.
+ *
  * Note: Unlike Browse, we do NOT exclude following or swipes, so Discover can show fresh faces.
  */
 class DiscoverMatchmakingService
 {
     private const PER_PAGE = 20;
 
+    /** Rows read per random pivot; smaller = more random, larger = fewer queries. */
+    private const PROBE_SIZE = 5;
+
+    /** Upper bound on pivots per request (sparse filters can leave probes short). */
+    private const MAX_PROBES = 8;
+
+    /** Seconds the approximate total / id range for a filter set is reused. */
+    private const STATS_TTL = 300;
+
+    /** Recently served faces are skipped for this long (sliding, per viewer). */
+    private const SEEN_TTL_MINUTES = 30;
+
+    /** Cap on remembered faces so the exclusion list stays small. */
+    private const SEEN_MAX = 500;
+
+    private const CANDIDATE_COLUMNS = [
+        'id', 'display_name', 'fullname', 'profile_picture',
+        'campus', 'academic_program', 'year_level', 'date_of_birth',
+        'courses', 'research_interests', 'extracurricular_activities',
+        'academic_goals', 'interests', 'bio',
+        'gender', 'relationship_status', 'looking_for',
+        'preferred_gender',
+        'preferred_age_min', 'preferred_age_max',
+        'preferred_campuses', 'ideal_match_qualities', 'preferred_courses',
+        'boost_ends_at',
+    ];
+
     /**
      * @param  array{campus?: string, academic_program?: string, year_level?: string}  $filters
      */
     public function getMatches(User $user, int $page = 1, array $filters = [], bool $applyBoostOrder = false): LengthAwarePaginator
     {
-        $excludedIds = $this->excludedUserIds($user);
         $page = max(1, $page);
-
-        $baseQuery = $this->candidateQuery($user, $excludedIds, $filters);
+        $baseQuery = $this->candidateQuery($user, $filters);
 
         // Total is used only for UI meta; Discover returns a fresh random set every request.
-        $total = (int) (clone $baseQuery)->count();
+        $stats = $this->stats($user, $filters, $baseQuery);
 
-        $query = clone $baseQuery;
-        if ($applyBoostOrder) {
-            $query->orderByRaw('(boost_ends_at IS NOT NULL AND boost_ends_at > ?) DESC', [now()]);
+        $excludedIds = $this->excludedUserIds($user);
+        $seenIds = $this->seenUserIds($user);
+        $users = RequestMetrics::measure('discover.sample', fn (): Collection => $this->sample($baseQuery, array_merge($excludedIds, $seenIds), $stats, $applyBoostOrder));
+        if ($users->count() < self::PER_PAGE && $seenIds !== []) {
+            // Everyone matching has been shown recently: start a new round
+            $seenIds = [];
+            $users = $users->concat($this->sample(
+                $baseQuery,
+                array_merge($excludedIds, $users->modelKeys()),
+                $stats,
+                $applyBoostOrder,
+                self::PER_PAGE - $users->count()
+            ));
         }
-        $users = $query
-            ->inRandomOrder()
-            ->limit(self::PER_PAGE)
-            ->get();
+        $this->rememberSeen($user, $seenIds, $users->modelKeys());
 
         /** @var array<int, array{user: User, compatibility_score: null, common_tags: array}> $items */
         $items = $users
@@ -57,13 +95,127 @@ public function getMatches(User $user, int $page = 1, array $filters = [], bool
 
         return new \Illuminate\Pagination\LengthAwarePaginator(
             $items,
-            $total,
+            $stats['total'],
             self::PER_PAGE,
             $page,
             ['path' => request()->url(), 'query' => request()->query()]
         );
     }
 
+    /**
+     * Random candidates: currently boosted users first (when requested), then rows from random id pivots.
+     *
+     * @param  array<int, int>  $excludedIds
+     * @param  array{total: int, min_id: int, max_id: int}  $stats
+     * @return Collection<int, User>
+     */
+    private function sample(Builder $baseQuery, array $excludedIds, array $stats, bool $applyBoostOrder, int $limit = self::PER_PAGE): Collection
+    {
+        $picked = new Collection;
+        if ($limit < 1) {
+            return $picked;
+        }
+
+        if ($applyBoostOrder) {
+            // Boosted users are a small, indexed subset, so a random sort over it stays cheap
+            $picked = (clone $baseQuery)
+                ->whereNotIn('id', $excludedIds)
+                ->where('boost_ends_at', '>', now())
+                ->select(self::CANDIDATE_COLUMNS)
+                ->inRandomOrder()
+                ->limit($limit)
+                ->get();
+        }
+
+        $random = new Collection;
+        for ($probe = 0; $probe < self::MAX_PROBES && $picked->count() + $random->count() < $limit; $probe++) {
+            $skip = array_merge($excludedIds, $picked->modelKeys(), $random->modelKeys());
+            $take = min(self::PROBE_SIZE, $limit - $picked->count() - $random->count());
+            $pivot = random_int($stats['min_id'], $stats['max_id']);
+
+            $rows = $this->readFromPivot($baseQuery, $skip, $pivot, $take);
+            if ($rows->isEmpty()) {
+                break; // Pool exhausted
+            }
+            $random = $random->concat($rows);
+        }
+
+        return $picked->concat($random->shuffle())->values();
+    }
+
+    /**
+     * Up to $take candidates with id >= $pivot, wrapping around to the lowest ids when the tail runs out.
+     *
+     * @param  array<int, int>  $skip
+     * @return Collection<int, User>
+     */
+    private function readFromPivot(Builder $baseQuery, array $skip, int $pivot, int $take): Collection
+    {
+        $rows = (clone $baseQuery)
+            ->whereNotIn('id', $skip)
+            ->where('id', '>=', $pivot)
+            ->select(self::CANDIDATE_COLUMNS)
+            ->orderBy('id')
+            ->limit($take)
+            ->get();
+
+        if ($rows->count() < $take) {
+            $rows = $rows->concat((clone $baseQuery)
+                ->whereNotIn('id', $skip)
+                ->where('id', '<', $pivot)
+                ->select(self::CANDIDATE_COLUMNS)
+                ->orderBy('id')
+                ->limit($take - $rows->count())
+                ->get());
+        }
+
+        return $rows;
+    }
+
+    /**
+     * Approximate total and id range for this filter set, shared by every viewer with the same filters.
+     * Per-viewer exclusions (self, blocks) are not subtracted; the total is only UI meta.
+     *
+     * @param  array{campus?: string, academic_program?: string, year_level?: string}  $filters
+     * @return array{total: int, min_id: int, max_id: int}
+     */
+    private function stats(User $me, array $filters, Builder $baseQuery): array
+    {
+        $key = 'discover:stats:'.md5(json_encode([
+            $this->normalizedPreferredGender($me->preferred_gender),
+            array_map(fn ($v) => trim((string) $v), $filters),
+        ]));
+
+        return Cache::remember($key, self::STATS_TTL, function () use ($baseQuery): array {
+            $row = (clone $baseQuery)
+                ->toBase()
+                ->selectRaw('COUNT(*) AS total, MIN(id) AS min_id, MAX(id) AS max_id')
+                ->first();
+
+            return [
+                'total' => (int) ($row->total ?? 0),
+                'min_id' => (int) ($row->min_id ?? 0),
+                'max_id' => (int) ($row->max_id ?? 0),
+            ];
+        });
+    }
+
+    /** @return array<int, int> */
+    private function seenUserIds(User $user): array
+    {
+        return Cache::get("discover:seen:{$user->id}", []);
+    }
+
+    /**
+     * @param  array<int, int>  $seenIds
+     * @param  array<int, int>  $servedIds
+     */
+    private function rememberSeen(User $user, array $seenIds, array $servedIds): void
+    {
+        $seen = array_slice(array_values(array_unique(array_merge($seenIds, $servedIds))), -self::SEEN_MAX);
+        Cache::put("discover:seen:{$user->id}", $seen, now()->addMinutes(self::SEEN_TTL_MINUTES));
+    }
+
     private function excludedUserIds(User $user): array
     {
         // Discover is a random feed: only exclude safety-critical users (self, blocked).
@@ -79,27 +231,17 @@ private function excludedUserIds(User $user): array
     }
 
     /**
+     * Candidates matching the viewer's gender preference and filters (no per-viewer exclusions, no select).
+     *
      * @param  array{campus?: string, academic_program?: string, year_level?: string}  $filters
      */
-    private function candidateQuery(User $me, array $excludedIds, array $filters = []): Builder
+    private function candidateQuery(User $me, array $filters = []): Builder
     {
-        $select = [
-            'id', 'display_name', 'fullname', 'profile_picture',
-            'campus', 'academic_program', 'year_level', 'date_of_birth',
-            'courses', 'research_interests', 'extracurricular_activities',
-            'academic_goals', 'interests', 'bio',
-            'gender', 'relationship_status', 'looking_for',
-            'preferred_gender',
-            'preferred_age_min', 'preferred_age_max',
-            'preferred_campuses', 'ideal_match_qualities', 'preferred_courses',
-        ];
         $q = User::query()
             ->where('profile_completed', true)
             ->where('is_disabled', false)
             ->whereNotNull('profile_picture')
-            ->where('profile_picture', '!=', '')
-            ->whereNotIn('id', $excludedIds)
-            ->select(array_merge($select, ['boost_ends_at']));
+            ->where('profile_picture', '!=', '');
 
         $preferredGender = $this->normalizedPreferredGender($me->preferred_gender);
         if ($preferredGender !== null) {
@@ -0,0 +1,154 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Post;
+use App\Models\User;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Social feed pages: keyset (cursor) paging on posts.id, so there is no COUNT(*) and deep pages cost the
+ * same as the first. Rendered pages are shared by every viewer for a few seconds; the per-viewer flags
+ * (liked, followed, own post) and the like/comment/repost counts are looked up for the page's posts and
+ * overlaid afterwards, so liking or reposting never drops the cached pages.
+ */
+class FeedService
+{
+    /** Seconds a rendered page is reused; a new, edited or deleted post drops every cached page at once. */
+    public const PAGE_TTL_SECONDS = 30;
+
+    public const DEFAULT_PER_PAGE = 15;
+
+    /** Author fields the post card shows. */
+    public const AUTHOR_COLUMNS = ['id', 'display_name', 'fullname', 'profile_picture', 'academic_program'];
+
+    private const VERSION_KEY = 'feed:version';
+
+    /**
+     * One feed page as the viewer sees it (CursorPaginator shape: data, next_cursor, next_page_url, ...).
+     *
+     * @return array<string, mixed>
+     */
+    public function page(User $viewer, ?string $cursor, int $perPage): array
+    {
+        $key = 'feed:page:'.Cache::get(self::VERSION_KEY, 0).':'.$perPage.':'.md5((string) $cursor);
+        $page = Cache::remember($key, self::PAGE_TTL_SECONDS, fn (): array => $this->render($cursor, $perPage));
+
+        return $this->overlayViewerFlags($this->overlayCounts($page), $viewer);
+    }
+
+    /**
+     * Drop all cached pages (new post, edit or delete; counts are overlaid per request).
+     */
+    public static function invalidate(): void
+    {
+        Cache::add(self::VERSION_KEY, 0);
+        Cache::increment(self::VERSION_KEY);
+    }
+
+    /**
+     * @return array<string, mixed>
+     */
+    private function render(?string $cursor, int $perPage): array
+    {
+        $paginator = Post::query()
+            ->with('user:'.implode(',', self::AUTHOR_COLUMNS))
+            ->orderByDesc('id')
+            ->cursorPaginate($perPage, ['*'], 'cursor', $cursor);
+        if ($perPage !== self::DEFAULT_PER_PAGE) {
+            $paginator->appends('per_page', $perPage);
+        }
+
+        // Built by hand: Post::toArray() would run the per-viewer is_liked_by_user query for every post
+        $data = array_map(fn (Post $post): array => [
+            'id' => $post->id,
+            'user_id' => $post->user_id,
+            'user' => $post->user?->only(self::AUTHOR_COLUMNS),
+            'content' => $post->content,
+            'image' => $post->image,
+            'images' => $post->images,
+            'images_list' => $post->images_list,
+            'image_thumbnails' => $post->thumbnailImages(),
+            'likes_count' => $post->likes_count,
+            'comments_count' => $post->comments_count,
+            'reposts_count' => $post->reposts_count,
+            'created_at' => $post->created_at?->toJSON(),
+            'updated_at' => $post->updated_at?->toJSON(),
+            'time_ago' => $post->time_ago,
+        ], $paginator->items());
+
+        return [
+            'data' => $data,
+            'path' => $paginator->path(),
+            'per_page' => $paginator->perPage(),
+            'next_cursor' => $paginator->nextCursor()?->encode(),
+            'next_page_url' => $paginator->nextPageUrl(),
+            'prev_cursor' => $paginator->previousCursor()?->encode(),
+            'prev_page_url' => $paginator->previousPageUrl(),
+        ];
+    }
+
+    /**
+     * Current counters for the page's posts: one primary-key lookup instead of re-rendering the page.
+     *
+     * @param  array<string, mixed>  $page
+     * @return array<string, mixed>
+     */
+    private function overlayCounts(array $page): array
+    {
+        $postIds = array_column($page['data'], 'id');
+        if ($postIds === []) {
+            return $page;
+        }
+
+        $counts = DB::table('posts')
+            ->whereIn('id', $postIds)
+            ->get(['id', 'likes_count', 'comments_count', 'reposts_count'])
+            ->keyBy('id');
+
+        foreach ($page['data'] as &$item) {
+            if ($row = $counts->get($item['id'])) {
+                $item['likes_count'] = (int) $row->likes_count;
+                $item['comments_count'] = (int) $row->comments_count;
+                $item['reposts_count'] = (int) $row->reposts_count;
+            }
+        }
+        unset($item);
+
+        return $page;
+    }
+
+    /**
+     * @param  array<string, mixed>  $page
+     * @return array<string, mixed>
+     */
+    private function overlayViewerFlags(array $page, User $viewer): array
+    {
+        $postIds = array_column($page['data'], 'id');
+        $authorIds = array_values(array_unique(array_column($page['data'], 'user_id')));
+
+        $likedIds = $postIds === [] ? [] : DB::table('post_likes')
+            ->where('user_id', $viewer->id)
+            ->whereIn('post_id', $postIds)
+            ->pluck('post_id')
+            ->flip()
+            ->all();
+        $followingIds = $authorIds === [] ? [] : $viewer->following()
+            ->whereIn('following_id', $authorIds)
+            ->pluck('following_id')
+            ->flip()
+            ->all();
+
+        foreach ($page['data'] as &$item) {
+            $item['is_liked_by_user'] = isset($likedIds[$item['id']]);
+            $item['is_followed_by_user'] = isset($followingIds[$item['user_id']]);
+            $item['is_own_post'] = (int) $item['user_id'] === (int) $viewer->id;
+        }
+        unset($item);
+
+        $page['current_user_id'] = $viewer->id;
+
+        return $page;
+    }
+}
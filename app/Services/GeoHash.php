@@ -0,0 +1,155 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Database\Eloquent\Builder;
+
+/**
+ * Geohash encoding and cell lookups for the users.geohash spatial index.
+ *
+ * Each user with a location stores a full-precision geohash. Nearby / radar queries pick the
+ * precision whose cells are at least as large as the search radius, so the circle always lies
+ * within the centre cell and its 8 neighbours, then match those cells by prefix (index range scan)
+ * together with a lat/long bounding box. Exact distances are still computed with
+ * NearbyMatchService::distanceMeters on the few rows that survive.
+ */
+class GeoHash
+{
+    /** Precision stored on users.geohash (~4.8m x 4.8m cells). */
+    public const STORED_PRECISION = 9;
+
+    private const BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz';
+
+    private const METERS_PER_DEGREE = 111320;
+
+    public static function encode(float $latitude, float $longitude, int $precision = self::STORED_PRECISION): string
+    {
+        $latRange = [-90.0, 90.0];
+        $lonRange = [-180.0, 180.0];
+        $hash = '';
+        $bit = 0;
+        $ch = 0;
+        $evenBit = true;
+
+        while (strlen($hash) < $precision) {
+            if ($evenBit) {
+                $mid = ($lonRange[0] + $lonRange[1]) / 2;
+                if ($longitude >= $mid) {
+                    $ch = ($ch << 1) | 1;
+                    $lonRange[0] = $mid;
+                } else {
+                    $ch <<= 1;
+                    $lonRange[1] = $mid;
+                }
+            } else {
+                $mid = ($latRange[0] + $latRange[1]) / 2;
+                if ($latitude >= $mid) {
+                    $ch = ($ch << 1) | 1;
+                    $latRange[0] = $mid;
+                } else {
+                    $ch <<= 1;
+                    $latRange[1] = $mid;
+                }
+            }
+            $evenBit = ! $evenBit;
+
+            if (++$bit === 5) {
+                $hash .= self::BASE32[$ch];
+                $bit = 0;
+                $ch = 0;
+            }
+        }
+
+        return $hash;
+    }
+
+    /**
+     * Cell size in degrees at the given precision.
+     *
+     * @return array{0: float, 1: float} [latitude degrees, longitude degrees]
+     */
+    public static function cellSizeDegrees(int $precision): array
+    {
+        $bits = 5 * $precision;
+        $lonBits = (int) ceil($bits / 2);
+        $latBits = $bits - $lonBits;
+
+        return [180 / (2 ** $latBits), 360 / (2 ** $lonBits)];
+    }
+
+    /**
+     * Finest precision whose cells are at least radiusM tall and wide at this latitude.
+     */
+    public static function precisionForRadius(float $latitude, float $radiusM): int
+    {
+        $metersPerLonDegree = self::METERS_PER_DEGREE * max(0.01, cos(deg2rad($latitude)));
+
+        for ($precision = self::STORED_PRECISION; $precision > 1; $precision--) {
+            [$latDeg, $lonDeg] = self::cellSizeDegrees($precision);
+            if ($latDeg * self::METERS_PER_DEGREE >= $radiusM && $lonDeg * $metersPerLonDegree >= $radiusM) {
+                return $precision;
+            }
+        }
+
+        return 1;
+    }
+
+    /**
+     * The centre cell plus its 8 neighbours covering a circle of radiusM around the point.
+     *
+     * @return list<string>
+     */
+    public static function cellsCovering(float $latitude, float $longitude, float $radiusM): array
+    {
+        $precision = self::precisionForRadius($latitude, $radiusM);
+        [$latDeg, $lonDeg] = self::cellSizeDegrees($precision);
+
+        $cells = [];
+        foreach ([-1, 0, 1] as $dLat) {
+            foreach ([-1, 0, 1] as $dLon) {
+                $lat = max(-90.0, min(90.0, $latitude + $dLat * $latDeg));
+                $lon = $longitude + $dLon * $lonDeg;
+                $lon = $lon > 180 ? $lon - 360 : ($lon < -180 ? $lon + 360 : $lon);
+                $cells[self::encode($lat, $lon, $precision)] = true;
+            }
+        }
+
+        return array_keys($cells);
+    }
+
+    /**
+     * Lat/long bounding box of a circle (meters).
+     *
+     * @return array{min_lat: float, max_lat: float, min_lon: float, max_lon: float}
+     */
+    public static function boundingBox(float $latitude, float $longitude, float $radiusM): array
+    {
+        $dLat = $radiusM / self::METERS_PER_DEGREE;
+        $dLon = $radiusM / (self::METERS_PER_DEGREE * max(0.01, cos(deg2rad($latitude))));
+
+        return [
+            'min_lat' => $latitude - $dLat,
+            'max_lat' => $latitude + $dLat,
+            'min_lon' => $longitude - $dLon,
+            'max_lon' => $longitude + $dLon,
+        ];
+    }
+
+    /**
+     * Restrict a users query to rows in the cells around the point and inside its bounding box.
+     */
+    public static function constrainToRadius(Builder $query, float $latitude, float $longitude, float $radiusM): Builder
+    {
+        $cells = self::cellsCovering($latitude, $longitude, $radiusM);
+        $box = self::boundingBox($latitude, $longitude, $radiusM);
+
+        return $query
+            ->where(function (Builder $q) use ($cells) {
+                foreach ($cells as $cell) {
+                    $q->orWhere('geohash', 'like', $cell.'%');
+                }
+            })
+            ->whereBetween('latitude', [$box['min_lat'], $box['max_lat']])
+            ->whereBetween('longitude', [$box['min_lon'], $box['max_lon']]);
+    }
+}
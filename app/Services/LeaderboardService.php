@@ -0,0 +1,182 @@
+<?php
+
+namespace App\Services;
+
+use App\Jobs\RefreshLeaderboard;
+use App\Models\User;
+use Carbon\Carbon;
+use Illuminate\Contracts\Cache\LockTimeoutException;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Most-liked rankings (day / week / month) computed from the like_counters buckets.
+ *
+ * Rankings are kept in the cache without expiry and refreshed in the background: a reader that
+ * finds a stale ranking gets it immediately and queues one RefreshLeaderboard job (unique per
+ * period); the refresh itself runs under a cache lock so concurrent refreshes never pile up.
+ */
+class LeaderboardService
+{
+    public const PERIOD_DAY = 'day';
+    public const PERIOD_WEEK = 'week';
+    public const PERIOD_MONTH = 'month';
+
+    public const PERIODS = [self::PERIOD_DAY, self::PERIOD_WEEK, self::PERIOD_MONTH];
+
+    /** Seconds before a cached ranking is considered stale. */
+    private const STALE_AFTER_DAY = 300;      // 5 min
+    private const STALE_AFTER_WEEK = 900;     // 15 min
+    private const STALE_AFTER_MONTH = 3600;   // 1 hour
+
+    private const LIMIT = 10;
+
+    /** Seconds a cold-cache reader waits on another process's rebuild before computing it itself. */
+    private const COLD_WAIT_SECONDS = 10;
+
+    /**
+     * Cached ranking for the period; never waits on a recompute except on a completely cold cache.
+     *
+     * @return list<array{rank: int, display_name: string, profile_picture: string|null, points: int}>
+     */
+    public function get(string $period): array
+    {
+        $cached = Cache::get($this->cacheKey($period));
+
+        if (! is_array($cached)) {
+            // Cold cache: one reader computes it, the rest wait for it to land
+            return $this->refresh($period) ?? $this->awaitRefresh($period);
+        }
+
+        if ($this->isStale($period, $cached)) {
+            RefreshLeaderboard::dispatch($period);
+        }
+
+        return $cached['data'];
+    }
+
+    /**
+     * Recompute and store the ranking. Returns null when another process is already refreshing it.
+     */
+    public function refresh(string $period): ?array
+    {
+        $data = Cache::lock($this->lockKey($period), 120)->get(function () use ($period): array {
+            $data = RequestMetrics::measure('leaderboard.compute', fn (): array => $this->compute($period));
+            Cache::forever($this->cacheKey($period), [
+                'data' => $data,
+                'computed_at' => now()->timestamp,
+                'day' => now()->toDateString(),
+            ]);
+
+            return $data;
+        });
+
+        return $data === false ? null : $data;
+    }
+
+    /**
+     * Wait for the in-flight refresh to release its lock and return what it stored; compute directly
+     * if it takes too long or failed without storing anything.
+     */
+    private function awaitRefresh(string $period): array
+    {
+        try {
+            Cache::lock($this->lockKey($period), 120)->block(self::COLD_WAIT_SECONDS, fn () => null);
+        } catch (LockTimeoutException) {
+            // Still running; fall through and compute our own copy
+        }
+
+        $cached = Cache::get($this->cacheKey($period));
+
+        return is_array($cached) ? $cached['data'] : $this->compute($period);
+    }
+
+    public function refreshAll(): void
+    {
+        foreach (self::PERIODS as $period) {
+            $this->refresh($period);
+        }
+    }
+
+    /**
+     * Platform-wide ranking by likes received in the period. Includes all registered users
+     * (male, female, any orientation); excludes only disabled and banned accounts.
+     * No filter by the current viewer's preferences or gender.
+     */
+    private function compute(string $period): array
+    {
+        $since = match ($period) {
+            self::PERIOD_WEEK => Carbon::now()->subDays(7)->startOfDay(),
+            self::PERIOD_MONTH => Carbon::now()->subDays(30)->startOfDay(),
+            default => Carbon::today()->startOfDay(),
+        };
+
+        $ranked = DB::table('like_counters')
+            ->join('users', 'users.id', '=', 'like_counters.user_id')
+            ->where('like_counters.day', '>=', $since->toDateString())
+            ->where(function ($q) {
+                $q->where('users.is_disabled', false)->orWhereNull('users.is_disabled');
+            })
+            ->whereNull('users.banned_at')
+            ->selectRaw('like_counters.user_id, sum(like_counters.likes) as points')
+            ->groupBy('like_counters.user_id')
+            ->havingRaw('sum(like_counters.likes) > 0')
+            ->orderByDesc('points')
+            ->orderBy('like_counters.user_id')
+            ->limit(self::LIMIT)
+            ->get();
+
+        if ($ranked->isEmpty()) {
+            return [];
+        }
+
+        $users = User::query()
+            ->whereIn('id', $ranked->pluck('user_id')->all())
+            ->get(['id', 'display_name', 'profile_picture'])
+            ->keyBy('id');
+
+        $list = [];
+        $rank = 1;
+        foreach ($ranked as $row) {
+            $user = $users->get($row->user_id);
+            if (! $user) {
+                continue;
+            }
+            $list[] = [
+                'rank' => $rank,
+                'display_name' => $user->display_name ?? 'Unknown',
+                'profile_picture' => $user->profile_picture,
+                'points' => (int) $row->points,
+            ];
+            $rank++;
+        }
+
+        return $list;
+    }
+
+    private function isStale(string $period, array $cached): bool
+    {
+        // Day buckets roll over at midnight; every period's window shifts with the date
+        if (($cached['day'] ?? null) !== now()->toDateString()) {
+            return true;
+        }
+
+        $staleAfter = match ($period) {
+            self::PERIOD_WEEK => self::STALE_AFTER_WEEK,
+            self::PERIOD_MONTH => self::STALE_AFTER_MONTH,
+            default => self::STALE_AFTER_DAY,
+        };
+
+        return now()->timestamp - (int) ($cached['computed_at'] ?? 0) >= $staleAfter;
+    }
+
+    private function cacheKey(string $period): string
+    {
+        return "leaderboard:{$period}";
+    }
+
+    private function lockKey(string $period): string
+    {
+        return "leaderboard:refresh:{$period}";
+    }
+}
@@ -2,10 +2,14 @@
 
 namespace App\Services;
 
+use App\Jobs\RefreshMatchIndex;
+use App\Models\MatchScore;
 use App\Models\User;
 use Illuminate\Contracts\Pagination\LengthAwarePaginator;
+use Illuminate\Database\Eloquent\Builder;
 use Illuminate\Support\Carbon;
 use Illuminate\Support\Collection;
+use Illuminate\Support\Facades\DB;
 
 /**
  * Hybrid matching: content-based + weighted score.
@@ -26,10 +30,213 @@ class MatchmakingService
     private const PER_PAGE = 20;
     /** Minimum compatibility score (0–100) to show on Discover/Browse. */
     private const MIN_COMPATIBILITY_SCORE = 35;
+    /** Max candidates kept per viewer in the precomputed index (match_scores). */
+    private const INDEX_TOP_K = 500;
+    private const INDEX_CHUNK = 500;
+    /** Swiping drains the index; below this many unswiped rows Browse scores live and queues a rebuild. */
+    private const INDEX_REFILL_BELOW = 40;
+    /** An index rebuilt this recently with few rows simply has few candidates; don't rebuild it again. */
+    private const INDEX_REFILL_COOLDOWN_MINUTES = 30;
+
+    /** Profile fields that feed the score; a change to any of them refreshes the index. */
+    public const SCORING_FIELDS = [
+        'profile_completed', 'is_disabled', 'profile_picture',
+        'campus', 'academic_program', 'year_level', 'date_of_birth',
+        'courses', 'research_interests', 'extracurricular_activities',
+        'academic_goals', 'interests', 'bio',
+        'gender', 'relationship_status', 'looking_for', 'preferred_gender',
+        'preferred_age_min', 'preferred_age_max', 'preferred_campuses', 'ideal_match_qualities', 'preferred_courses',
+    ];
+
+    private const CANDIDATE_COLUMNS = [
+        'id', 'display_name', 'fullname', 'profile_picture',
+        'campus', 'academic_program', 'year_level', 'date_of_birth',
+        'courses', 'research_interests', 'extracurricular_activities',
+        'academic_goals', 'interests', 'bio',
+        'gender', 'relationship_status', 'looking_for',
+        'preferred_age_min', 'preferred_age_max', 'preferred_campuses', 'ideal_match_qualities', 'preferred_courses',
+    ];
 
+    /**
+     * Page through the viewer's precomputed index (match_scores). Users without an index yet
+     * are scored live (previous behaviour) and a rebuild is queued for them.
+     */
     public function getMatches(User $user, int $page = 1): LengthAwarePaginator
     {
         $excludedIds = $this->excludedUserIds($user);
+
+        if ($user->match_index_built_at === null) {
+            RefreshMatchIndex::dispatch($user->id, false);
+
+            return $this->getLiveMatches($user, $excludedIds, $page);
+        }
+
+        $query = MatchScore::query()
+            ->join('users', 'users.id', '=', 'match_scores.candidate_user_id')
+            ->where('match_scores.user_id', $user->id)
+            ->where('match_scores.compatibility_score', '>=', self::MIN_COMPATIBILITY_SCORE)
+            ->whereNotIn('match_scores.candidate_user_id', $excludedIds)
+            ->where('users.profile_completed', true)
+            ->where('users.is_disabled', false)
+            ->whereNotNull('users.profile_picture')
+            ->where('users.profile_picture', '!=', '');
+
+        $preferredGender = $user->preferred_gender ? trim((string) $user->preferred_gender) : null;
+        if ($preferredGender !== null && $preferredGender !== '') {
+            $query->where('users.gender', $preferredGender);
+        }
+
+        $total = (clone $query)->count();
+        if ($total < self::INDEX_REFILL_BELOW
+            && $user->match_index_built_at->lt(now()->subMinutes(self::INDEX_REFILL_COOLDOWN_MINUTES))) {
+            RefreshMatchIndex::dispatch($user->id, false);
+
+            return $this->getLiveMatches($user, $excludedIds, $page);
+        }
+
+        $lastPage = (int) ceil($total / self::PER_PAGE) ?: 1;
+        $page = max(1, min($page, $lastPage));
+
+        $rows = $query
+            ->select('match_scores.*')
+            ->orderByDesc('match_scores.compatibility_score')
+            ->orderBy('match_scores.candidate_user_id')
+            ->forPage($page, self::PER_PAGE)
+            ->get();
+
+        $users = User::query()
+            ->select(self::CANDIDATE_COLUMNS)
+            ->whereIn('id', $rows->pluck('candidate_user_id')->all())
+            ->get()
+            ->keyBy('id');
+
+        $items = $rows
+            ->filter(fn (MatchScore $row): bool => $users->has($row->candidate_user_id))
+            ->map(fn (MatchScore $row): array => [
+                'user' => $users->get($row->candidate_user_id),
+                'compatibility_score' => $row->compatibility_score,
+                'common_tags' => $row->common_tags ?? [],
+                'score_breakdown' => $row->score_breakdown ?? [],
+            ])
+            ->values()
+            ->all();
+
+        return $this->paginate($items, $total, $page);
+    }
+
+    /**
+     * Rebuild the viewer's top-K list from scratch. Scans every eligible candidate in chunks
+     * (no CANDIDATE_LIMIT here since this runs in the queue, not in the request).
+     */
+    public function rebuildIndexFor(User $user): void
+    {
+        $excludedIds = $this->excludedUserIds($user);
+        $myTags = $this->tagArray($user);
+        $myInterestTags = $this->interestTagArray($user);
+        $top = [];
+
+        $this->candidateQuery($user, $excludedIds)
+            ->chunkById(self::INDEX_CHUNK, function (Collection $chunk) use ($user, $myTags, $myInterestTags, &$top): void {
+                foreach ($chunk as $other) {
+                    $item = $this->scoreCandidate($user, $other, $myTags, $myInterestTags);
+                    if ($item['compatibility_score'] >= self::MIN_COMPATIBILITY_SCORE) {
+                        $top[] = $this->indexRow($user->id, $item);
+                    }
+                }
+                $top = $this->trimTopK($top);
+            });
+
+        DB::transaction(function () use ($user, $top): void {
+            MatchScore::where('user_id', $user->id)->delete();
+            foreach (array_chunk($top, self::INDEX_CHUNK) as $rows) {
+                MatchScore::insert($rows);
+            }
+            User::whereKey($user->id)->update(['match_index_built_at' => now()]);
+        });
+    }
+
+    /**
+     * Re-score one user as a candidate in the indexes of viewers whose filters can show them: the viewer's
+     * preferred_gender accepts the candidate's gender, and neither side has blocked, followed or swiped the other.
+     * A viewer whose list is already full only gets the candidate when they beat its lowest score; the nightly
+     * rebuild trims lists back to INDEX_TOP_K.
+     */
+    public function refreshCandidateInIndexes(User $candidate): void
+    {
+        $eligible = $candidate->profile_completed
+            && ! $candidate->is_disabled
+            && $candidate->profile_picture !== null
+            && $candidate->profile_picture !== '';
+
+        if (! $eligible) {
+            MatchScore::where('candidate_user_id', $candidate->id)->delete();
+
+            return;
+        }
+
+        $gender = trim((string) $candidate->gender);
+        $acceptsGender = function ($q) use ($gender): void {
+            $q->whereNull('preferred_gender')->orWhere('preferred_gender', '')->orWhere('preferred_gender', $gender);
+        };
+
+        // A gender change drops the candidate from lists whose preference no longer matches
+        MatchScore::where('candidate_user_id', $candidate->id)
+            ->whereNotIn('user_id', User::query()->select('id')->where($acceptsGender))
+            ->delete();
+
+        $otherTags = $this->tagArray($candidate);
+        $candidateId = $candidate->id;
+
+        User::query()
+            ->select(array_merge(self::CANDIDATE_COLUMNS, ['preferred_gender']))
+            ->whereNotNull('match_index_built_at')
+            ->where('id', '!=', $candidateId)
+            ->where($acceptsGender)
+            ->whereNotIn('id', fn ($q) => $q->select('user_id')->from('swipe_actions')->where('target_user_id', $candidateId))
+            ->whereNotIn('id', fn ($q) => $q->select('follower_id')->from('follows')->where('following_id', $candidateId))
+            ->whereNotIn('id', fn ($q) => $q->select('blocker_id')->from('blocks')->where('blocked_id', $candidateId))
+            ->whereNotIn('id', fn ($q) => $q->select('blocked_id')->from('blocks')->where('blocker_id', $candidateId))
+            ->chunkById(self::INDEX_CHUNK, function (Collection $viewers) use ($candidate, $otherTags): void {
+                $upserts = [];
+                $deleteFor = [];
+                $viewerIds = $viewers->modelKeys();
+                $listed = MatchScore::where('candidate_user_id', $candidate->id)->whereIn('user_id', $viewerIds)->pluck('user_id')->flip();
+                $floors = MatchScore::query()
+                    ->whereIn('user_id', $viewerIds)
+                    ->groupBy('user_id')
+                    ->havingRaw('count(*) >= ?', [self::INDEX_TOP_K])
+                    ->selectRaw('user_id, min(compatibility_score) as floor')
+                    ->pluck('floor', 'user_id');
+
+                foreach ($viewers as $viewer) {
+                    $item = $this->scoreCandidate($viewer, $candidate, $this->tagArray($viewer), $this->interestTagArray($viewer), $otherTags);
+                    $full = isset($floors[$viewer->id]) && ! isset($listed[$viewer->id]);
+                    if ($item['compatibility_score'] >= self::MIN_COMPATIBILITY_SCORE
+                        && (! $full || $item['compatibility_score'] > (int) $floors[$viewer->id])) {
+                        $upserts[] = $this->indexRow($viewer->id, $item);
+                    } elseif (isset($listed[$viewer->id])) {
+                        $deleteFor[] = $viewer->id;
+                    }
+                }
+
+                if ($deleteFor !== []) {
+                    MatchScore::where('candidate_user_id', $candidate->id)->whereIn('user_id', $deleteFor)->delete();
+                }
+                if ($upserts !== []) {
+                    MatchScore::upsert(
+                        $upserts,
+                        ['user_id', 'candidate_user_id'],
+                        ['compatibility_score', 'common_tags', 'score_breakdown', 'updated_at']
+                    );
+                }
+            });
+    }
+
+    /**
+     * Live scoring over CANDIDATE_LIMIT candidates; used until the viewer's index is built.
+     */
+    private function getLiveMatches(User $user, array $excludedIds, int $page): LengthAwarePaginator
+    {
         $candidates = $this->fetchCandidates($user, $excludedIds);
 
         $scored = $this->scoreAndSort($user, $candidates)
@@ -41,6 +248,11 @@ public function getMatches(User $user, int $page = 1): LengthAwarePaginator
         $offset = ($page - 1) * self::PER_PAGE;
         $items = $scored->slice($offset, self::PER_PAGE)->values()->all();
 
+        return $this->paginate($items, $total, $page);
+    }
+
+    private function paginate(array $items, int $total, int $page): LengthAwarePaginator
+    {
         return new \Illuminate\Pagination\LengthAwarePaginator(
             $items,
             $total,
@@ -50,6 +262,35 @@ public function getMatches(User $user, int $page = 1): LengthAwarePaginator
         );
     }
 
+    /**
+     * @param  array{user: User, compatibility_score: int, common_tags: array, score_breakdown: array}  $item
+     */
+    private function indexRow(int $viewerId, array $item): array
+    {
+        $now = now();
+
+        return [
+            'user_id' => $viewerId,
+            'candidate_user_id' => $item['user']->id,
+            'compatibility_score' => $item['compatibility_score'],
+            'common_tags' => json_encode($item['common_tags']),
+            'score_breakdown' => json_encode($item['score_breakdown']),
+            'created_at' => $now,
+            'updated_at' => $now,
+        ];
+    }
+
+    /** Keep the INDEX_TOP_K highest scores (ties broken by lower candidate id). */
+    private function trimTopK(array $rows): array
+    {
+        if (count($rows) <= self::INDEX_TOP_K) {
+            return $rows;
+        }
+        usort($rows, fn (array $a, array $b): int => [$b['compatibility_score'], $a['candidate_user_id']] <=> [$a['compatibility_score'], $b['candidate_user_id']]);
+
+        return array_slice($rows, 0, self::INDEX_TOP_K);
+    }
+
     /**
      * IDs to exclude: self, following, blocked, blockers, already swiped.
      */
@@ -70,11 +311,11 @@ private function excludedUserIds(User $user): array
     }
 
     /**
-     * Fetch profile_completed users with all fields needed for scoring.
+     * Eligible candidates: profile_completed, active, with a profile picture, not excluded.
      * Emphasizes looking-for by gender: if viewer has preferred_gender set, only candidates
      * of that gender are included (e.g. preferred_gender = Male → exclude non-male).
      */
-    private function fetchCandidates(User $me, array $excludedIds): Collection
+    private function candidateQuery(User $me, array $excludedIds): Builder
     {
         $q = User::query()
             ->where('profile_completed', true)
@@ -82,15 +323,7 @@ private function fetchCandidates(User $me, array $excludedIds): Collection
             ->whereNotNull('profile_picture')
             ->where('profile_picture', '!=', '')
             ->whereNotIn('id', $excludedIds)
-            ->select([
-                'id', 'display_name', 'fullname', 'profile_picture',
-                'campus', 'academic_program', 'year_level', 'date_of_birth',
-                'courses', 'research_interests', 'extracurricular_activities',
-                'academic_goals', 'interests', 'bio',
-                'gender', 'relationship_status', 'looking_for',
-                'preferred_age_min', 'preferred_age_max', 'preferred_campuses', 'ideal_match_qualities', 'preferred_courses',
-            ])
-            ->limit(self::CANDIDATE_LIMIT);
+            ->select(self::CANDIDATE_COLUMNS);
 
         // Looking-for by gender: only show candidates whose gender matches viewer's preferred_gender.
         // If preferred_gender is set (e.g. "Male"), exclude everyone who is not that gender.
@@ -99,6 +332,16 @@ private function fetchCandidates(User $me, array $excludedIds): Collection
             $q->where('gender', $preferredGender);
         }
 
+        return $q;
+    }
+
+    /**
+     * Fetch up to CANDIDATE_LIMIT candidates for live scoring, same campus/program first.
+     */
+    private function fetchCandidates(User $me, array $excludedIds): Collection
+    {
+        $q = $this->candidateQuery($me, $excludedIds)->limit(self::CANDIDATE_LIMIT);
+
         $myCampus = $me->campus;
         $myProgram = $me->academic_program;
         if ($myCampus && $myProgram) {
@@ -120,38 +363,48 @@ private function scoreAndSort(User $me, Collection $candidates): Collection
         $myTags = $this->tagArray($me);
         $myInterestTags = $this->interestTagArray($me);
 
-        $scored = $candidates->map(function (User $other) use ($me, $myTags, $myInterestTags): array {
-            $academic = $this->academicCompatibility($me, $other);
-            $interest = $this->interestCompatibility($me, $other, $myInterestTags);
-            $relationship = $this->relationshipCompatibility($me, $other);
-            $age = $this->ageCompatibility($me, $other);
-            $campus = $this->campusCompatibility($me, $other);
-
-            $weighted = (self::WEIGHT_ACADEMIC * $academic)
-                + (self::WEIGHT_INTEREST * $interest)
-                + (self::WEIGHT_RELATIONSHIP * $relationship)
-                + (self::WEIGHT_AGE * $age)
-                + (self::WEIGHT_CAMPUS * $campus);
-
-            $score = (int) round(min(100, max(0, $weighted)));
-            $otherTags = $this->tagArray($other);
-            $commonTags = array_values(array_intersect($myTags, $otherTags));
-
-            return [
-                'user' => $other,
-                'compatibility_score' => $score,
-                'common_tags' => $commonTags,
-                'score_breakdown' => [
-                    'academic' => $academic,
-                    'interest' => $interest,
-                    'relationship' => $relationship,
-                    'age' => $age,
-                    'campus' => $campus,
-                ],
-            ];
-        });
+        return RequestMetrics::measure('scoring', fn (): Collection => $candidates
+            ->map(fn (User $other): array => $this->scoreCandidate($me, $other, $myTags, $myInterestTags))
+            ->sortByDesc('compatibility_score')
+            ->values());
+    }
 
-        return $scored->sortByDesc('compatibility_score')->values();
+    /**
+     * Weighted score of one candidate for the viewer. Single source of truth for live scoring
+     * and for the precomputed index.
+     *
+     * @return array{user: User, compatibility_score: int, common_tags: array, score_breakdown: array}
+     */
+    private function scoreCandidate(User $me, User $other, array $myTags, array $myInterestTags, ?array $otherTags = null): array
+    {
+        $academic = $this->academicCompatibility($me, $other);
+        $interest = $this->interestCompatibility($me, $other, $myInterestTags);
+        $relationship = $this->relationshipCompatibility($me, $other);
+        $age = $this->ageCompatibility($me, $other);
+        $campus = $this->campusCompatibility($me, $other);
+
+        $weighted = (self::WEIGHT_ACADEMIC * $academic)
+            + (self::WEIGHT_INTEREST * $interest)
+            + (self::WEIGHT_RELATIONSHIP * $relationship)
+            + (self::WEIGHT_AGE * $age)
+            + (self::WEIGHT_CAMPUS * $campus);
+
+        $score = (int) round(min(100, max(0, $weighted)));
+        $otherTags ??= $this->tagArray($other);
+        $commonTags = array_values(array_intersect($myTags, $otherTags));
+
+        return [
+            'user' => $other,
+            'compatibility_score' => $score,
+            'common_tags' => $commonTags,
+            'score_breakdown' => [
+                'academic' => $academic,
+                'interest' => $interest,
+                'relationship' => $relationship,
+                'age' => $age,
+                'campus' => $campus,
+            ],
+        ];
     }
 
     /**
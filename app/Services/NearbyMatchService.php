@@ -3,9 +3,8 @@
 namespace App\Services;
 
 use App\Events\MatchProximityUpdated;
+use App\Events\NearbyUpdated;
 use App\Events\NotificationSent;
-use App\Events\ProximityAlarmTriggered;
-use App\Events\RadarUpdated;
 use App\Models\Notification;
 use App\Models\User;
 use App\Models\AiProximityMatch;
@@ -59,22 +58,21 @@ public static function bearingDegrees(float $lat1, float $lon1, float $lat2, flo
      */
     public function updateLocationAndNotify(User $user, float $latitude, float $longitude): void
     {
+        $previousLatitude = $user->latitude !== null ? (float) $user->latitude : null;
+        $previousLongitude = $user->longitude !== null ? (float) $user->longitude : null;
+
         $user->update([
             'latitude' => $latitude,
             'longitude' => $longitude,
+            'geohash' => GeoHash::encode($latitude, $longitude),
             'location_updated_at' => now(),
         ]);
 
         // Update AI match proximity in real-time (regardless of nearby_match_enabled)
         $this->broadcastAiMatchProximity($user);
 
-        // Proximity alarm: notify users who are within 10m of someone who has romantic feelings for them (Love Alarm style)
-        $this->broadcastProximityAlarmToAffectedUsers($user);
-
-        // Real-time radar: notify everyone on this campus to refetch nearby users (Pusher)
-        if ($user->campus !== null && trim($user->campus) !== '') {
-            broadcast(new RadarUpdated($user->campus));
-        }
+        // Find Your Match: only clients in the cells around the old and new position refetch their hearts
+        $this->broadcastNearbyUpdate($user, $previousLatitude, $previousLongitude);
 
         if ($user->nearby_match_enabled) {
             $this->checkAndNotifyNearbyMatches($user);
@@ -82,27 +80,34 @@ public function updateLocationAndNotify(User $user, float $latitude, float $long
     }
 
     /**
-     * When user B updates location: find all users A within radius of B (same campus). For each A, broadcast
-     * ProximityAlarmTriggered with their current nearby count so their app can refresh (Find Your Match is location-based, no prior like required).
+     * Cell a Find Your Match client subscribes to (private channel nearby.{cell}): the user's stored geohash cut
+     * to the precision whose cells span the nearby radius, so anyone who moves within range of them broadcasts on it.
      */
-    protected function broadcastProximityAlarmToAffectedUsers(User $userWhoMoved): void
+    public static function nearbyCellFor(User $user): ?string
     {
-        if ($userWhoMoved->latitude === null || $userWhoMoved->longitude === null) {
-            return;
+        if ($user->latitude === null || $user->geohash === null || $user->geohash === '') {
+            return null;
         }
 
-        $targetIds = $this->proximityMatch->getUserIdsWithinRadiusOf($userWhoMoved, 15.0);
-        if ($targetIds === []) {
-            return;
-        }
+        $precision = GeoHash::precisionForRadius((float) $user->latitude, ProximityMatchService::NEARBY_RADIUS_M);
 
-        foreach ($targetIds as $targetId) {
-            $targetUser = User::find($targetId);
-            if ($targetUser) {
-                $count = $this->proximityMatch->getLikersWithin10mCount($targetUser);
-                broadcast(new ProximityAlarmTriggered($targetUser, $count));
-            }
+        return substr($user->geohash, 0, $precision);
+    }
+
+    /**
+     * When user B moves, everyone whose nearby hearts may have changed is within the radius of B's old or new
+     * position, so their cell is one of the cells covering those circles. One broadcast reaches all of them;
+     * the mover's own socket is excluded (it refetches after its own update).
+     */
+    protected function broadcastNearbyUpdate(User $userWhoMoved, ?float $previousLatitude, ?float $previousLongitude): void
+    {
+        $radiusM = ProximityMatchService::NEARBY_RADIUS_M;
+        $cells = GeoHash::cellsCovering((float) $userWhoMoved->latitude, (float) $userWhoMoved->longitude, $radiusM);
+        if ($previousLatitude !== null && $previousLongitude !== null) {
+            $cells = array_merge($cells, GeoHash::cellsCovering($previousLatitude, $previousLongitude, $radiusM));
         }
+
+        broadcast(new NearbyUpdated(array_values(array_unique($cells))))->toOthers();
     }
 
     /**
@@ -0,0 +1,106 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Support\Facades\Storage;
+
+/**
+ * Resized WebP derivatives of uploaded post images, so the feed does not ship full-resolution phone photos.
+ *
+ * Uses GD; when GD or its WebP support is missing nothing is generated and the originals keep being served.
+ */
+class PostImageVariants
+{
+    /** Variant name => maximum width in pixels (images are never upscaled). */
+    public const SIZES = [
+        'thumb' => 480,
+        'feed' => 1080,
+    ];
+
+    public const QUALITY = 80;
+
+    private const DISK = 'public';
+
+    private const DIRECTORY = 'post-images/variants';
+
+    public static function supported(): bool
+    {
+        return function_exists('imagecreatefromstring') && function_exists('imagewebp');
+    }
+
+    /**
+     * Generate every variant of one stored image.
+     *
+     * @return array<string, string> Variant name => stored path; empty when unsupported or the file is not a readable image
+     */
+    public function generate(string $path): array
+    {
+        $disk = Storage::disk(self::DISK);
+        if (! self::supported() || ! $disk->exists($path)) {
+            return [];
+        }
+
+        $data = $disk->get($path);
+        $source = @imagecreatefromstring($data);
+        if ($source === false) {
+            return [];
+        }
+        $source = $this->applyExifOrientation($source, $data);
+
+        $name = pathinfo($path, PATHINFO_FILENAME);
+        $variants = [];
+        foreach (self::SIZES as $variant => $maxWidth) {
+            $image = imagesx($source) > $maxWidth ? imagescale($source, $maxWidth) : $source;
+            if ($image === false) {
+                continue;
+            }
+            imagealphablending($image, false);
+            imagesavealpha($image, true);
+
+            ob_start();
+            $ok = imagewebp($image, null, self::QUALITY);
+            $webp = ob_get_clean();
+            if ($image !== $source) {
+                imagedestroy($image);
+            }
+
+            if ($ok && $webp !== false && $webp !== '') {
+                $target = self::DIRECTORY."/{$name}-{$variant}.webp";
+                $disk->put($target, $webp);
+                $variants[$variant] = $target;
+            }
+        }
+        imagedestroy($source);
+
+        return $variants;
+    }
+
+    /**
+     * Phone JPEGs are often stored sideways with an EXIF rotation flag; GD ignores it, so rotate explicitly.
+     */
+    private function applyExifOrientation(\GdImage $image, string $data): \GdImage
+    {
+        if (! function_exists('exif_read_data') || ! str_starts_with($data, "\xFF\xD8")) {
+            return $image;
+        }
+
+        $exif = @exif_read_data('data://image/jpeg;base64,'.base64_encode($data));
+        $angle = match ((int) ($exif['Orientation'] ?? 1)) {
+            3 => 180,
+            6 => -90,
+            8 => 90,
+            default => 0,
+        };
+        if ($angle === 0) {
+            return $image;
+        }
+
+        $rotated = imagerotate($image, $angle, 0);
+        if ($rotated === false) {
+            return $image;
+        }
+        imagedestroy($image);
+
+        return $rotated;
+    }
+}
@@ -0,0 +1,187 @@
+<?php
+
+namespace App\Services;
+
+use App\Events\PresenceChanged;
+use App\Models\User;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Date;
+use Illuminate\Support\Facades\DB;
+
+use function Illuminate\Support\defer;
+
+/**
+ * Online status without a users-row write per request.
+ *
+ * A heartbeat costs O(1) cache operations and takes no shared lock: a per-user key (presence:seen:{id})
+ * throttles it to once per interval, and the user id + timestamp are appended to a bucket sharded by minute
+ * and by user id (an atomic counter plus one slot per heartbeat). presence:flush (every minute, via
+ * cron-worker.php) drains the buckets whose minute has closed into one bulk UPDATE of users.last_seen_at.
+ * If no flush has run recently (scheduler not running) the heartbeat writes last_seen_at directly instead.
+ * A user who comes back online is announced on their campus channel after the response is sent.
+ */
+class PresenceService
+{
+    /** Minimum seconds between recorded heartbeats for the same user. */
+    public const HEARTBEAT_INTERVAL_SECONDS = 60;
+
+    /** Heartbeats bypass the buckets once the last flush is older than this. */
+    public const FLUSH_OVERDUE_SECONDS = 300;
+
+    /** Counters per minute bucket, so concurrent heartbeats do not all increment the same key. */
+    private const SHARDS = 16;
+
+    private const BUCKET_SECONDS = 60;
+
+    /** A bucket is drained this long after its minute ends, so heartbeats that took a slot at :59 have written it. */
+    private const BUCKET_GRACE_SECONDS = 5;
+
+    /** Undrained buckets expire after this long (scheduler down); direct writes have taken over by then. */
+    private const BUCKET_TTL_SECONDS = 900;
+
+    private const FLUSH_CHUNK = 500;
+
+    private const DRAINED_KEY = 'presence:drained_through';
+
+    private const FLUSHED_AT_KEY = 'presence:flushed_at';
+
+    /**
+     * Record that the user is active now. Returns false when throttled (already recorded within the interval).
+     */
+    public function heartbeat(User $user): bool
+    {
+        $now = now()->getTimestamp();
+        if ($user->last_seen_at !== null && $user->last_seen_at->getTimestamp() > $now - self::HEARTBEAT_INTERVAL_SECONDS) {
+            return false;
+        }
+        if (! Cache::add('presence:seen:'.$user->id, $now, self::HEARTBEAT_INTERVAL_SECONDS)) {
+            return false;
+        }
+
+        if ($this->overdue()) {
+            $this->writeLastSeen([$user->id => $now]);
+        } else {
+            $this->append($user->id, $now);
+        }
+
+        // Stored last_seen_at lags by at most interval + flush period, well inside the online window
+        if (! $user->isOnline() && $user->campus !== null && trim($user->campus) !== '') {
+            defer(fn () => broadcast(new PresenceChanged($user, Date::createFromTimestamp($now, config('app.timezone')))));
+        }
+
+        return true;
+    }
+
+    /**
+     * Write heartbeats from closed buckets to users.last_seen_at in bulk. Returns the number of users updated.
+     */
+    public function flush(): int
+    {
+        $lock = Cache::lock('presence:flush', 120);
+        if (! $lock->get()) {
+            return 0;
+        }
+
+        try {
+            $through = intdiv(now()->getTimestamp() - self::BUCKET_GRACE_SECONDS, self::BUCKET_SECONDS) - 1;
+            $from = max(
+                (int) Cache::get(self::DRAINED_KEY, 0) + 1,
+                $through - intdiv(self::BUCKET_TTL_SECONDS, self::BUCKET_SECONDS)
+            );
+
+            $latest = [];
+            for ($bucket = $from; $bucket <= $through; $bucket++) {
+                foreach ($this->drain($bucket) as [$userId, $timestamp]) {
+                    $latest[$userId] = max($latest[$userId] ?? 0, (int) $timestamp);
+                }
+            }
+
+            foreach (array_chunk($latest, self::FLUSH_CHUNK, true) as $chunk) {
+                $this->writeLastSeen($chunk);
+            }
+
+            Cache::forever(self::DRAINED_KEY, $through);
+            Cache::forever(self::FLUSHED_AT_KEY, now()->getTimestamp());
+
+            return count($latest);
+        } finally {
+            $lock->release();
+        }
+    }
+
+    /**
+     * Take the next slot in this minute's shard for the user and store the heartbeat in it.
+     */
+    private function append(int $userId, int $timestamp): void
+    {
+        $shard = $this->shardKey(intdiv($timestamp, self::BUCKET_SECONDS), $userId % self::SHARDS);
+
+        // Only the shard's first heartbeat of the minute creates it (with its TTL); increments keep the expiry
+        Cache::add($shard, 0, self::BUCKET_TTL_SECONDS);
+        $slot = Cache::increment($shard);
+
+        Cache::put($shard.':'.$slot, [$userId, $timestamp], self::BUCKET_TTL_SECONDS);
+    }
+
+    /**
+     * Read and delete every slot of a closed bucket.
+     *
+     * @return list<array{0: int, 1: int}>
+     */
+    private function drain(int $bucket): array
+    {
+        $heartbeats = [];
+        for ($shard = 0; $shard < self::SHARDS; $shard++) {
+            $key = $this->shardKey($bucket, $shard);
+            $count = (int) Cache::get($key, 0);
+            if ($count === 0) {
+                continue;
+            }
+
+            foreach (array_chunk(range(1, $count), self::FLUSH_CHUNK) as $slots) {
+                $keys = array_map(fn (int $slot): string => $key.':'.$slot, $slots);
+                foreach (Cache::many($keys) as $heartbeat) {
+                    if (is_array($heartbeat)) {
+                        $heartbeats[] = $heartbeat;
+                    }
+                }
+                Cache::deleteMultiple($keys);
+            }
+            Cache::forget($key);
+        }
+
+        return $heartbeats;
+    }
+
+    private function shardKey(int $bucket, int $shard): string
+    {
+        return "presence:bucket:{$bucket}:{$shard}";
+    }
+
+    private function overdue(): bool
+    {
+        return now()->getTimestamp() - (int) Cache::get(self::FLUSHED_AT_KEY, 0) > self::FLUSH_OVERDUE_SECONDS;
+    }
+
+    /**
+     * One UPDATE ... SET last_seen_at = CASE id ... END for a chunk of users.
+     *
+     * @param  array<int, int>  $timestamps  User id => unix timestamp
+     */
+    private function writeLastSeen(array $timestamps): void
+    {
+        if ($timestamps === []) {
+            return;
+        }
+
+        $cases = '';
+        foreach ($timestamps as $userId => $timestamp) {
+            $seenAt = Date::createFromTimestamp($timestamp, config('app.timezone'))->format('Y-m-d H:i:s');
+            $cases .= sprintf(" WHEN %d THEN '%s'", $userId, $seenAt);
+        }
+
+        DB::table('users')
+            ->whereIn('id', array_keys($timestamps))
+            ->update(['last_seen_at' => DB::raw('CASE id'.$cases.' END')]);
+    }
+}
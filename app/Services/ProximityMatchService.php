@@ -8,6 +8,9 @@
 use App\Models\NearbyTap;
 use App\Models\Notification;
 use App\Models\User;
+use Illuminate\Database\Eloquent\Builder;
+use Illuminate\Support\Collection;
+use Illuminate\Support\Facades\Cache;
 use Illuminate\Support\Facades\Crypt;
 use Illuminate\Support\Facades\Log;
 use OpenAI\Laravel\Facades\OpenAI;
@@ -26,6 +29,9 @@ class ProximityMatchService
     /** Consider user "active" for nearby if last_seen_at is within this many minutes. */
     public const ACTIVE_NEARBY_MINUTES = 15;
 
+    /** Radius (meters) around the viewer for Find Your Match hearts. */
+    public const NEARBY_RADIUS_M = 15.0;
+
     /**
      * Get campus model by name (matches users.campus string).
      */
@@ -252,30 +258,32 @@ public function getRadarData(User $user): array
             }
         }
 
-        $candidates = $this->getSameCampusCandidates($user);
         $radiusM = self::RADAR_RADIUS_M;
-        $list = [];
-        foreach ($candidates as $other) {
-            $olat = $other->latitude !== null ? (float) $other->latitude : null;
-            $olon = $other->longitude !== null ? (float) $other->longitude : null;
-            if ($olat === null || $olon === null) {
-                continue;
-            }
-            $distFromBase = NearbyMatchService::distanceMeters($baseLat, $baseLon, $olat, $olon);
-            if ($distFromBase === null || $distFromBase > $radiusM) {
-                continue;
+        $candidates = GeoHash::constrainToRadius($this->sameCampusCandidatesQuery($user), $baseLat, $baseLon, $radiusM)
+            ->get(['id', 'display_name', 'profile_picture', 'latitude', 'longitude']);
+        $list = RequestMetrics::measure('distance', function () use ($candidates, $user, $baseLat, $baseLon, $radiusM): array {
+            $list = [];
+            foreach ($candidates as $other) {
+                $olat = (float) $other->latitude;
+                $olon = (float) $other->longitude;
+                $distFromBase = NearbyMatchService::distanceMeters($baseLat, $baseLon, $olat, $olon);
+                if ($distFromBase === null || $distFromBase > $radiusM) {
+                    continue;
+                }
+                $bearing = NearbyMatchService::bearingDegrees($baseLat, $baseLon, $olat, $olon);
+                $distFromMe = $this->distanceToMatchMeters($user, $other);
+                $list[] = [
+                    'id' => $other->id,
+                    'display_name' => $other->display_name ?? '',
+                    'profile_picture' => $other->profile_picture,
+                    'distance_from_base_m' => round($distFromBase, 1),
+                    'bearing_from_base' => round($bearing, 2),
+                    'distance_from_me_m' => $distFromMe !== null ? round($distFromMe, 1) : null,
+                ];
             }
-            $bearing = NearbyMatchService::bearingDegrees($baseLat, $baseLon, $olat, $olon);
-            $distFromMe = $this->distanceToMatchMeters($user, $other);
-            $list[] = [
-                'id' => $other->id,
-                'display_name' => $other->display_name ?? '',
-                'profile_picture' => $other->profile_picture,
-                'distance_from_base_m' => round($distFromBase, 1),
-                'bearing_from_base' => round($bearing, 2),
-                'distance_from_me_m' => $distFromMe !== null ? round($distFromMe, 1) : null,
-            ];
-        }
+
+            return $list;
+        });
         usort($list, fn ($a, $b) => $a['distance_from_base_m'] <=> $b['distance_from_base_m']);
         $result['nearby_users'] = array_values($list);
 
@@ -413,23 +421,26 @@ public function getNearbyUsersWithPosition(User $viewer): array
             return [];
         }
 
-        $campusNormalized = strtolower(trim($campusName));
         $activeSince = now()->subMinutes(self::ACTIVE_NEARBY_MINUTES);
-        $candidates = User::query()
-            ->where('id', '!=', $viewer->id)
-            ->whereNotNull('latitude')
-            ->whereNotNull('longitude')
-            ->where(function ($q) use ($activeSince) {
-                $q->where('last_seen_at', '>=', $activeSince)
-                    ->orWhere('location_updated_at', '>=', $activeSince);
-            })
-            ->get(['id', 'latitude', 'longitude', 'campus', 'gender']);
-
         $preferredGender = $viewer->preferred_gender ? trim((string) $viewer->preferred_gender) : null;
         $myLat = (float) $viewer->latitude;
         $myLon = (float) $viewer->longitude;
         /** @var float Radius in meters */
-        $radiusM = 15.0;
+        $radiusM = self::NEARBY_RADIUS_M;
+
+        // Only rows in the geohash cells around the viewer (and inside the bounding box) are loaded
+        $query = User::query()
+            ->where('id', '!=', $viewer->id)
+            ->where('campus', $campusName)
+            ->where(function ($q) use ($activeSince) {
+                $q->where('last_seen_at', '>=', $activeSince)
+                    ->orWhere('location_updated_at', '>=', $activeSince);
+            });
+        if ($preferredGender !== null && $preferredGender !== '') {
+            $query->where('gender', $preferredGender);
+        }
+        $candidates = GeoHash::constrainToRadius($query, $myLat, $myLon, $radiusM)
+            ->get(['id', 'latitude', 'longitude']);
 
         // Exclude users who already mutually tapped (have an anonymous chat room with viewer)
         $alreadyInRoomIds = AnonymousChatRoom::query()
@@ -441,73 +452,27 @@ public function getNearbyUsersWithPosition(User $viewer): array
             ->flip()
             ->all();
 
-        $nearby = [];
-        foreach ($candidates as $other) {
-            if (isset($alreadyInRoomIds[$other->id])) {
-                continue;
-            }
-            if (strtolower(trim((string) $other->campus)) !== $campusNormalized) {
-                continue;
-            }
-            if ($preferredGender !== null && $preferredGender !== '' && trim((string) $other->gender) !== $preferredGender) {
-                continue;
-            }
-            $otherLat = trim((string) $other->latitude);
-            $otherLon = trim((string) $other->longitude);
-            if ($otherLat === '' || $otherLon === '') {
-                continue;
-            }
-            $lat2 = (float) $other->latitude;
-            $lon2 = (float) $other->longitude;
-            $dist = NearbyMatchService::distanceMeters($myLat, $myLon, $lat2, $lon2);
-            if ($dist !== null && $dist <= $radiusM) {
-                $bearing = NearbyMatchService::bearingDegrees($myLat, $myLon, $lat2, $lon2);
-                $nearby[] = [
-                    'id' => $other->id,
-                    'distance_from_me_m' => round($dist, 2),
-                    'bearing_deg' => round($bearing, 1),
-                ];
+        return RequestMetrics::measure('distance', function () use ($candidates, $alreadyInRoomIds, $myLat, $myLon, $radiusM): array {
+            $nearby = [];
+            foreach ($candidates as $other) {
+                if (isset($alreadyInRoomIds[$other->id])) {
+                    continue;
+                }
+                $lat2 = (float) $other->latitude;
+                $lon2 = (float) $other->longitude;
+                $dist = NearbyMatchService::distanceMeters($myLat, $myLon, $lat2, $lon2);
+                if ($dist !== null && $dist <= $radiusM) {
+                    $bearing = NearbyMatchService::bearingDegrees($myLat, $myLon, $lat2, $lon2);
+                    $nearby[] = [
+                        'id' => $other->id,
+                        'distance_from_me_m' => round($dist, 2),
+                        'bearing_deg' => round($bearing, 1),
+                    ];
+                }
             }
-        }
 
-        return $nearby;
-    }
-
-    /**
-     * User IDs of everyone within radius of the given user (same campus, has location). Used to broadcast count updates.
-     *
-     * @return list<int>
-     */
-    public function getUserIdsWithinRadiusOf(User $centerUser, float $radiusM = 15.0): array
-    {
-        if ($centerUser->latitude === null || $centerUser->longitude === null) {
-            return [];
-        }
-        $campusName = $centerUser->campus;
-        if ($campusName === null || trim($campusName) === '') {
-            return [];
-        }
-        $campusNormalized = strtolower(trim($campusName));
-        $others = User::query()
-            ->where('id', '!=', $centerUser->id)
-            ->whereNotNull('latitude')
-            ->whereNotNull('longitude')
-            ->get(['id', 'latitude', 'longitude', 'campus']);
-        $myLat = (float) $centerUser->latitude;
-        $myLon = (float) $centerUser->longitude;
-        $ids = [];
-        foreach ($others as $other) {
-            if (strtolower(trim((string) $other->campus)) !== $campusNormalized) {
-                continue;
-            }
-            $lat2 = (float) $other->latitude;
-            $lon2 = (float) $other->longitude;
-            $dist = NearbyMatchService::distanceMeters($myLat, $myLon, $lat2, $lon2);
-            if ($dist !== null && $dist <= $radiusM) {
-                $ids[] = $other->id;
-            }
-        }
-        return $ids;
+            return $nearby;
+        });
     }
 
     /**
@@ -548,7 +513,7 @@ public function getNearbyLikersWithTokens(User $viewer): array
     public function getProximityDebugInfo(User $viewer): array
     {
         $activeSince = now()->subMinutes(self::ACTIVE_NEARBY_MINUTES);
-        $radiusM = 15.0;
+        $radiusM = self::NEARBY_RADIUS_M;
         $campusName = $viewer->campus;
         $campusNormalized = $campusName !== null && trim($campusName) !== '' ? strtolower(trim($campusName)) : null;
         $preferredGender = $viewer->preferred_gender ? trim((string) $viewer->preferred_gender) : null;
@@ -560,7 +525,7 @@ public function getProximityDebugInfo(User $viewer): array
                 ->where('id', '!=', $viewer->id)
                 ->whereNotNull('latitude')
                 ->whereNotNull('longitude')
-                ->whereRaw('LOWER(TRIM(campus)) = ?', [$campusNormalized])
+                ->where('campus', $campusName)
                 ->get(['id', 'latitude', 'longitude', 'campus', 'gender', 'last_seen_at', 'location_updated_at'])
             : collect([]);
 
@@ -675,22 +640,27 @@ private function isUserEligible(User $u): bool
     /** @return \Illuminate\Database\Eloquent\Collection<int, User> */
     private function getSameCampusCandidates(User $user)
     {
-        $campusName = $user->campus;
-        if (! $campusName) {
+        if (! $user->campus) {
             return collect([]);
         }
+        return $this->sameCampusCandidatesQuery($user)
+            ->get(['id', 'display_name', 'profile_picture', 'campus', 'interests', 'bio', 'academic_program', 'latitude', 'longitude']);
+    }
+
+    private function sameCampusCandidatesQuery(User $user): Builder
+    {
         return User::query()
             ->where('id', '!=', $user->id)
-            ->where('campus', $campusName)
+            ->where('campus', $user->campus)
             ->where('profile_completed', true)
             ->where(function ($q) {
                 $q->where('is_disabled', false)->orWhereNull('is_disabled');
-            })
-            ->get(['id', 'display_name', 'profile_picture', 'campus', 'interests', 'bio', 'academic_program', 'latitude', 'longitude']);
+            });
     }
 
     /**
      * Pick best match: try OpenAI when configured, then fall back to heuristic scoring.
+     * Only the heuristic top-N shortlist is sent to OpenAI, so prompt size and cost stay flat as campuses grow.
      *
      * @param  array<string, mixed>|null  $debug
      */
@@ -701,7 +671,9 @@ private function pickBestMatch(User $user, $candidates, ?array &$debug = null):
         $apiKey = config('openai.api_key');
         if (is_string($apiKey) && $apiKey !== '') {
             try {
-                $picked = $this->pickBestMatchWithOpenAI($user, $candidates, $debug);
+                $shortlist = $this->shortlistCandidates($user, $candidates);
+                $debug['shortlist_size'] = $shortlist->count();
+                $picked = $this->pickBestMatchWithOpenAI($user, $shortlist, $debug);
                 if ($picked !== null) {
                     $debug['source'] = 'openai';
                     $debug['openai_used'] = true;
@@ -722,9 +694,28 @@ private function pickBestMatch(User $user, $candidates, ?array &$debug = null):
         return $this->pickBestMatchHeuristic($user, $candidates, $debug);
     }
 
+    /**
+     * Top candidates by the local heuristic (ties keep candidate order, like pickBestMatchHeuristic).
+     *
+     * @return Collection<int, User>
+     */
+    private function shortlistCandidates(User $user, $candidates): Collection
+    {
+        $limit = max(1, (int) config('openai.match_shortlist', 20));
+        $myInterests = $this->normalizeTags($user->interests);
+
+        return collect($candidates)
+            ->map(fn (User $c) => ['user' => $c, 'score' => $this->simpleCompatibilityScore($user, $c, $myInterests)])
+            ->sortByDesc('score')
+            ->take($limit)
+            ->pluck('user')
+            ->values();
+    }
+
     /**
      * Use OpenAI to pick the single best match from candidates (same campus).
      * Prompt asks for a 1-based index; invalid or missing response falls back to null.
+     * Answers are cached by a hash of the profile contents, so unchanged profiles never trigger a second call.
      * @param  array<string, mixed>|null  $debug
      */
     private function pickBestMatchWithOpenAI(User $user, $candidates, ?array &$debug = null): ?User
@@ -734,17 +725,32 @@ private function pickBestMatchWithOpenAI(User $user, $candidates, ?array &$debug
             return null;
         }
 
+        $model = config('openai.match_model', 'gpt-4o-mini');
         $userSummary = $this->profileSummary($user);
+        $summaries = array_map(fn (User $c): string => $this->profileSummary($c), $candidatesArray);
+
+        $cacheKey = 'ai_proximity_match:pick:'.sha1(implode("\n", [
+            $model,
+            $userSummary,
+            ...array_map(fn (User $c, string $summary): string => $c->id.':'.$summary, $candidatesArray, $summaries),
+        ]));
+        $cachedId = Cache::get($cacheKey);
+        if ($cachedId !== null) {
+            $debug ??= [];
+            $debug['openai_cached'] = true;
+
+            return collect($candidatesArray)->firstWhere('id', (int) $cachedId);
+        }
+
         $candidatesText = [];
-        foreach ($candidatesArray as $i => $c) {
+        foreach ($summaries as $i => $summary) {
             $oneBased = $i + 1;
-            $candidatesText[] = "Candidate {$oneBased}: " . $this->profileSummary($c);
+            $candidatesText[] = "Candidate {$oneBased}: " . $summary;
         }
 
         $systemPrompt = 'You are a matchmaking assistant for a campus dating app. Given one user profile and a list of candidate profiles (all from the same campus), choose the single best match for compatibility (shared interests, similar goals, complementary personality). Reply with ONLY the 1-based index of your chosen candidate as a single number (e.g. 1 or 2). No explanation.';
         $userPrompt = "User looking for a match:\n{$userSummary}\n\nCandidates:\n" . implode("\n\n", $candidatesText) . "\n\nReply with only the 1-based index of the best match (e.g. 1).";
 
-        $model = config('openai.match_model', 'gpt-4o-mini');
         $response = OpenAI::chat()->create([
             'model' => $model,
             'messages' => [
@@ -756,11 +762,14 @@ private function pickBestMatchWithOpenAI(User $user, $candidates, ?array &$debug
         ]);
 
         $content = $response->choices[0]->message->content ?? null;
-        if ($content === null || $content === '') {
-            return null;
-        }
+        $index = ($content === null || $content === '')
+            ? null
+            : $this->parseOneBasedIndex(trim($content), count($candidatesArray));
+
+        // Unusable answers are cached too (as 0) so they fall back to the heuristic without another call
+        $picked = $index !== null ? ($candidatesArray[$index] ?? null) : null;
+        Cache::put($cacheKey, $picked?->id ?? 0, (int) config('openai.match_cache_ttl', 604800));
 
-        $index = $this->parseOneBasedIndex(trim($content), count($candidatesArray));
         if ($index === null) {
             return null;
         }
@@ -773,7 +782,7 @@ private function pickBestMatchWithOpenAI(User $user, $candidates, ?array &$debug
             'picked_index_1_based' => $index + 1,
         ];
 
-        return $candidatesArray[$index] ?? null;
+        return $picked;
     }
 
     private function profileSummary(User $user): string
@@ -0,0 +1,125 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Cache\Events\CacheHit;
+use Illuminate\Cache\Events\CacheMissed;
+use Illuminate\Database\Events\QueryExecuted;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Event;
+
+/**
+ * Collects per-request metrics: duration, query count, DB time, cache hits/misses and named
+ * service timings. Inert unless config('instrumentation.enabled') is on; see InstrumentRequest.
+ */
+class RequestMetrics
+{
+    private bool $listening = false;
+
+    private bool $active = false;
+
+    private int $startedAt = 0;
+
+    private int $queries = 0;
+
+    private float $dbMs = 0.0;
+
+    private int $cacheHits = 0;
+
+    private int $cacheMisses = 0;
+
+    /** @var array<string, array{ms: float, count: int}> */
+    private array $timings = [];
+
+    public static function enabled(): bool
+    {
+        return (bool) config('instrumentation.enabled', false);
+    }
+
+    /**
+     * Run $callback and add its wall time to the named timing. A plain call when instrumentation is off.
+     *
+     * @template T
+     *
+     * @param  callable(): T  $callback
+     * @return T
+     */
+    public static function measure(string $name, callable $callback): mixed
+    {
+        if (! self::enabled()) {
+            return $callback();
+        }
+
+        $metrics = app(self::class);
+        if (! $metrics->active) {
+            return $callback();
+        }
+
+        $start = hrtime(true);
+        try {
+            return $callback();
+        } finally {
+            $metrics->timings[$name]['ms'] = ($metrics->timings[$name]['ms'] ?? 0.0) + (hrtime(true) - $start) / 1e6;
+            $metrics->timings[$name]['count'] = ($metrics->timings[$name]['count'] ?? 0) + 1;
+        }
+    }
+
+    /** Reset counters and start recording. */
+    public function start(): void
+    {
+        $this->listen();
+
+        $this->active = true;
+        $this->startedAt = hrtime(true);
+        $this->queries = 0;
+        $this->dbMs = 0.0;
+        $this->cacheHits = 0;
+        $this->cacheMisses = 0;
+        $this->timings = [];
+    }
+
+    /**
+     * Stop recording and return what was collected.
+     *
+     * @return array{duration_ms: float, queries: int, db_ms: float, cache_hits: int, cache_misses: int, timings: array<string, array{ms: float, count: int}>}
+     */
+    public function stop(): array
+    {
+        $this->active = false;
+
+        return [
+            'duration_ms' => round((hrtime(true) - $this->startedAt) / 1e6, 2),
+            'queries' => $this->queries,
+            'db_ms' => round($this->dbMs, 2),
+            'cache_hits' => $this->cacheHits,
+            'cache_misses' => $this->cacheMisses,
+            'timings' => array_map(fn (array $t): array => ['ms' => round($t['ms'], 2), 'count' => $t['count']], $this->timings),
+        ];
+    }
+
+    /** Listeners are registered once per application instance and only count while active. */
+    private function listen(): void
+    {
+        if ($this->listening) {
+            return;
+        }
+        $this->listening = true;
+
+        DB::listen(function (QueryExecuted $query): void {
+            if ($this->active) {
+                $this->queries++;
+                $this->dbMs += $query->time;
+            }
+        });
+        Event::listen(CacheHit::class, function (): void {
+            if ($this->active) {
+                $this->cacheHits++;
+            }
+        });
+        Event::listen(CacheMissed::class, function (): void {
+            if ($this->active) {
+                $this->cacheMisses++;
+            }
+        });
+    }
+}
@@ -2,16 +2,32 @@
 
 namespace App\Services;
 
+use App\Jobs\DeliverWebPushes;
 use App\Models\Notification;
 use App\Models\PushSubscription;
-use App\Models\User;
-use Minishlink\WebPush\Subscription;
+use Illuminate\Support\Carbon;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+use Minishlink\WebPush\MessageSentReport;
 use Minishlink\WebPush\WebPush;
 
 class WebPushService
 {
     protected ?WebPush $webPush = null;
 
+    /**
+     * Use the given push client instead of building one from config (tests pass a recording client).
+     */
+    public function usingWebPush(WebPush $webPush): static
+    {
+        $this->webPush = $webPush;
+
+        return $this;
+    }
+
+    /**
+     * One WebPush (and Guzzle client) per worker process so connections to push services are reused.
+     */
     protected function getWebPush(): WebPush
     {
         if ($this->webPush !== null) {
@@ -35,7 +51,8 @@ protected function getWebPush(): WebPush
         ], [
             'TTL' => 3600,
             'urgency' => 'normal',
-        ]);
+        ], (int) config('webpush.timeout', 10));
+        $this->webPush->setReuseVAPIDHeaders(true);
 
         return $this->webPush;
     }
@@ -108,50 +125,171 @@ public static function urlForNotification(Notification $n): string
     }
 
     /**
-     * Send Web Push for a single in-app notification to all of the user's subscriptions.
+     * Record a notification for background delivery. Cheap enough to run inside the request.
+     */
+    public function queueForNotification(Notification $notification): void
+    {
+        DB::table('web_push_outbox')->insert([
+            'notification_id' => $notification->id,
+            'user_id' => $notification->user_id,
+            'created_at' => now(),
+        ]);
+
+        DeliverWebPushes::dispatch()->delay(now()->addSeconds((int) config('webpush.coalesce_seconds', 5)));
+    }
+
+    /**
+     * Claim up to batch_size outbox rows, deliver them, then delete them. Returns the number of rows drained.
+     *
+     * Rows are only deleted once their pushes have been sent; a worker that dies mid-send leaves its rows
+     * claimed, and they become claimable again after claim_timeout_minutes.
      */
-    public function sendForNotification(Notification $notification): void
+    public function deliverPending(): int
     {
-        $subscriptions = PushSubscription::where('user_id', $notification->user_id)->get();
+        $limit = (int) config('webpush.batch_size', 1000);
+        $staleClaim = now()->subMinutes((int) config('webpush.claim_timeout_minutes', 10));
+
+        $rows = DB::transaction(function () use ($limit, $staleClaim) {
+            $rows = DB::table('web_push_outbox')
+                ->where(function ($q) use ($staleClaim) {
+                    $q->whereNull('claimed_at')->orWhere('claimed_at', '<', $staleClaim);
+                })
+                ->orderBy('id')
+                ->limit($limit)
+                ->lockForUpdate()
+                ->get();
+            if ($rows->isNotEmpty()) {
+                DB::table('web_push_outbox')->whereIn('id', $rows->pluck('id')->all())->update(['claimed_at' => now()]);
+            }
+
+            return $rows;
+        });
+
+        if ($rows->isEmpty()) {
+            return 0;
+        }
+
+        $notifications = Notification::query()
+            ->with('fromUser:id,display_name,fullname,profile_picture')
+            ->whereIn('id', $rows->pluck('notification_id')->unique()->all())
+            ->orderBy('id')
+            ->get();
+
+        $this->deliver($notifications, $rows->pluck('created_at')->all());
+        DB::table('web_push_outbox')->whereIn('id', $rows->pluck('id')->all())->delete();
+
+        return $rows->count();
+    }
+
+    /**
+     * Coalesce notifications per user, send every push concurrently and prune expired subscriptions in bulk.
+     *
+     * @param  \Illuminate\Support\Collection<int, Notification>  $notifications
+     * @param  list<string|null>  $queuedAt  Outbox timestamps, for queue latency
+     */
+    protected function deliver($notifications, array $queuedAt): void
+    {
+        $started = microtime(true);
+        $stats = ['users' => 0, 'notifications' => $notifications->count(), 'sent' => 0, 'failed' => 0, 'expired' => 0];
+        $byUser = $notifications->groupBy('user_id');
+        $subscriptions = PushSubscription::whereIn('user_id', $byUser->keys()->all())->get()->groupBy('user_id');
         if ($subscriptions->isEmpty()) {
+            // Nobody to push to; still record the batch so queue latency and volume stay visible
+            $this->logDelivery($stats, $started, $queuedAt);
+
             return;
         }
 
-        [$title, $body] = array_values(self::titleAndBodyForNotification($notification));
-        $url = self::urlForNotification($notification);
-
-        $payload = json_encode([
-            'title' => $title,
-            'body' => $body,
-            'url' => $url,
-            'id' => $notification->id,
-            'type' => $notification->type,
-        ]);
+        $expiredEndpoints = [];
 
         try {
             $webPush = $this->getWebPush();
-            foreach ($subscriptions as $sub) {
-                try {
-                    $subscription = Subscription::create([
-                        'endpoint' => $sub->endpoint,
-                        'keys' => [
-                            'p256dh' => $sub->public_key,
-                            'auth' => $sub->auth_token,
-                        ],
-                    ]);
-                    $webPush->queueNotification($subscription, $payload);
-                } catch (\Throwable $e) {
-                    report($e);
+            foreach ($byUser as $userId => $pending) {
+                $userSubscriptions = $subscriptions->get($userId);
+                if (! $userSubscriptions) {
+                    continue;
                 }
-            }
-            $reports = $webPush->flush();
-            foreach ($reports as $report) {
-                if (! $report->isSuccess() && $report->isSubscriptionExpired()) {
-                    PushSubscription::where('endpoint', $report->getEndpoint())->delete();
+                $stats['users']++;
+                $payload = json_encode(self::payloadForNotifications($pending));
+                foreach ($userSubscriptions as $sub) {
+                    try {
+                        $webPush->queueNotification($sub->toWebPushSubscription(), $payload);
+                    } catch (\Throwable $e) {
+                        report($e);
+                    }
                 }
             }
+
+            $webPush->flushPooled(function (MessageSentReport $report) use (&$stats, &$expiredEndpoints): void {
+                if ($report->isSuccess()) {
+                    $stats['sent']++;
+
+                    return;
+                }
+                $stats['failed']++;
+                if ($report->isSubscriptionExpired()) {
+                    $expiredEndpoints[] = $report->getEndpoint();
+                }
+            }, null, max(1, (int) config('webpush.concurrency', 50)));
         } catch (\Throwable $e) {
             report($e);
         }
+
+        foreach (array_chunk(array_values(array_unique($expiredEndpoints)), 500) as $endpoints) {
+            $stats['expired'] += PushSubscription::whereIn('endpoint', $endpoints)->delete();
+        }
+
+        $this->logDelivery($stats, $started, $queuedAt);
+    }
+
+    /**
+     * @param  array<string, int>  $stats
+     * @param  list<string|null>  $queuedAt
+     */
+    private function logDelivery(array $stats, float $started, array $queuedAt): void
+    {
+        $elapsed = microtime(true) - $started;
+        $latencies = array_map(
+            fn ($at) => max(0, now()->getTimestampMs() - Carbon::parse($at)->getTimestampMs()),
+            array_filter($queuedAt)
+        );
+
+        Log::info('web_push.delivered', $stats + [
+            'duration_ms' => (int) round($elapsed * 1000),
+            'pushes_per_second' => $elapsed > 0 ? round(($stats['sent'] + $stats['failed']) / $elapsed, 1) : null,
+            'queue_latency_ms_avg' => $latencies !== [] ? (int) round(array_sum($latencies) / count($latencies)) : null,
+            'queue_latency_ms_max' => $latencies !== [] ? max($latencies) : null,
+        ]);
+    }
+
+    /**
+     * Push payload for one user's pending notifications. Several notifications of one type collapse into a
+     * single push showing the latest one plus how many more are waiting; a mix of types gets a generic summary,
+     * so e.g. a message excerpt never stands in for a batch of likes.
+     *
+     * @param  \Illuminate\Support\Collection<int, Notification>  $pending
+     */
+    public static function payloadForNotifications($pending): array
+    {
+        $latest = $pending->sortBy('id')->last();
+        [$title, $body] = array_values(self::titleAndBodyForNotification($latest));
+        $count = $pending->count();
+        $urls = $pending->map(fn (Notification $n) => self::urlForNotification($n))->unique();
+
+        if ($pending->pluck('type')->unique()->count() > 1) {
+            $title = 'NEMSU Match';
+            $body = sprintf('You have %d new notifications', $count);
+        } elseif ($count > 1) {
+            $body .= sprintf(' (+%d more)', $count - 1);
+        }
+
+        return [
+            'title' => $title,
+            'body' => $body,
+            'url' => $urls->count() === 1 ? $urls->first() : rtrim(config('app.url'), '/').'/notifications',
+            'id' => $latest->id,
+            'type' => $latest->type,
+            'count' => $count,
+        ];
     }
 }
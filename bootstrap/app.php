@@ -7,6 +7,7 @@
 use App\Http\Middleware\EnsureAccountNotDisabled;
 use App\Http\Middleware\HandleAppearance;
 use App\Http\Middleware\HandleInertiaRequests;
+use App\Http\Middleware\InstrumentRequest;
 use App\Http\Middleware\UpdateLastSeen;
 use App\Http\Middleware\CheckMaintenanceMode;
 use App\Http\Middleware\CheckPreRegistrationMode;
@@ -25,6 +26,11 @@
     ->withMiddleware(function (Middleware $middleware): void {
         $middleware->encryptCookies(except: ['appearance', 'sidebar_state']);
 
+        // Outermost so session, auth and the rest of the stack are included in the numbers
+        $middleware->web(prepend: [
+            InstrumentRequest::class,
+        ]);
+
         $middleware->web(append: [
             HandleAppearance::class,
             HandleInertiaRequests::class,
@@ -0,0 +1,22 @@
+<?php
+
+/**
+ * Per-request instrumentation (off by default).
+ *
+ * When enabled, every web request records its duration, query count, DB time, cache hits/misses
+ * and named service timings (scoring, distance loops, moderation, ...). Results are sent as
+ * X-Metrics-* / Server-Timing response headers and/or logged as "request.metrics".
+ *
+ * Benchmark the hot paths with: php artisan benchmark:hot-paths
+ */
+return [
+    'enabled' => (bool) env('INSTRUMENTATION_ENABLED', false),
+
+    // Add X-Metrics-* and Server-Timing headers to responses
+    'headers' => (bool) env('INSTRUMENTATION_HEADERS', true),
+
+    // Log a "request.metrics" line per request (only requests at least this slow, in ms)
+    'log' => (bool) env('INSTRUMENTATION_LOG', true),
+    'log_channel' => env('INSTRUMENTATION_LOG_CHANNEL'),
+    'log_slower_than_ms' => (int) env('INSTRUMENTATION_LOG_SLOWER_THAN_MS', 0),
+];
@@ -39,4 +39,18 @@
     | Model used to pick the best same-campus match (e.g. gpt-4o-mini).
     */
     'match_model' => env('OPENAI_MATCH_MODEL', 'gpt-4o-mini'),
+
+    /*
+    |--------------------------------------------------------------------------
+    | Find Your Match cost controls
+    |--------------------------------------------------------------------------
+    | Only the top-N candidates by the local heuristic are sent to the model,
+    | and answers are cached (seconds) by a hash of the profiles involved.
+    | Bulk assignment jobs run at most `match_concurrency` OpenAI calls at
+    | once and no more than `match_rate_per_minute` per minute.
+    */
+    'match_shortlist' => (int) env('OPENAI_MATCH_SHORTLIST', 20),
+    'match_cache_ttl' => (int) env('OPENAI_MATCH_CACHE_TTL', 604800),
+    'match_concurrency' => (int) env('OPENAI_MATCH_CONCURRENCY', 4),
+    'match_rate_per_minute' => (int) env('OPENAI_MATCH_RATE_PER_MINUTE', 60),
 ];
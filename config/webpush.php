@@ -8,6 +8,9 @@
  *   VAPID_PUBLIC_KEY=...
  *   VAPID_PRIVATE_KEY=...
  *   VAPID_SUBJECT=mailto:your@email.com
+ *
+ * Delivery is queued: notifications land in web_push_outbox and a single DeliverWebPushes job
+ * drains it after the coalesce window, merging each user's pending notifications into one push.
  */
 return [
     'vapid' => [
@@ -15,4 +18,19 @@
         'private_key' => env('VAPID_PRIVATE_KEY', ''),
         'subject' => env('VAPID_SUBJECT', 'mailto:admin@'.parse_url(env('APP_URL', 'http://localhost'), PHP_URL_HOST)),
     ],
+
+    // Seconds to wait for more notifications before sending (per-user coalescing window)
+    'coalesce_seconds' => (int) env('WEBPUSH_COALESCE_SECONDS', 5),
+
+    // Outbox rows drained per job run
+    'batch_size' => (int) env('WEBPUSH_BATCH_SIZE', 1000),
+
+    // Max simultaneous requests to push services
+    'concurrency' => (int) env('WEBPUSH_CONCURRENCY', 50),
+
+    // Per-request timeout (seconds)
+    'timeout' => (int) env('WEBPUSH_TIMEOUT', 10),
+
+    // Minutes before outbox rows claimed by a worker that never finished become claimable again
+    'claim_timeout_minutes' => (int) env('WEBPUSH_CLAIM_TIMEOUT_MINUTES', 10),
 ];
@@ -3,7 +3,7 @@
 use Illuminate\Contracts\Console\Kernel as ConsoleKernel;
 use Illuminate\Support\Facades\Artisan;
 
-// Simple entry point for Hostinger cron to process queued jobs (including Web Push notifications).
+// Simple entry point for Hostinger cron to run the scheduler and process queued jobs (including Web Push notifications).
 // Example Hostinger cron command (adjust path and PHP binary):
 //   * * * * * /usr/bin/php /home/USER/path/to/dating-app/cron-worker.php
 
@@ -16,6 +16,9 @@
 $kernel = $app->make(ConsoleKernel::class);
 $kernel->bootstrap();
 
+// Run due scheduled commands (routes/console.php), since Hostinger cron is the only scheduler.
+Artisan::call('schedule:run', ['--quiet' => true]);
+
 // Run queued jobs for a short burst, then exit so cron can invoke again.
 Artisan::call('queue:work', [
     '--stop-when-empty' => true,
@@ -0,0 +1,39 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    public function up(): void
+    {
+        // Precomputed Browse compatibility index: per-viewer top-K candidates (see MatchmakingService)
+        Schema::create('match_scores', function (Blueprint $table) {
+            $table->id();
+            $table->foreignId('user_id')->constrained()->onDelete('cascade'); // viewer
+            $table->foreignId('candidate_user_id')->constrained('users')->onDelete('cascade');
+            $table->unsignedTinyInteger('compatibility_score'); // 0–100
+            $table->json('common_tags')->nullable();
+            $table->json('score_breakdown')->nullable();
+            $table->timestamps();
+
+            $table->unique(['user_id', 'candidate_user_id']);
+            $table->index(['user_id', 'compatibility_score']);
+            $table->index('candidate_user_id');
+        });
+
+        Schema::table('users', function (Blueprint $table) {
+            $table->timestamp('match_index_built_at')->nullable()->after('location_updated_at');
+        });
+    }
+
+    public function down(): void
+    {
+        Schema::table('users', function (Blueprint $table) {
+            $table->dropColumn('match_index_built_at');
+        });
+
+        Schema::dropIfExists('match_scores');
+    }
+};
@@ -0,0 +1,41 @@
+<?php
+
+use App\Services\GeoHash;
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    public function up(): void
+    {
+        Schema::table('users', function (Blueprint $table) {
+            $table->string('geohash', 12)->nullable()->after('longitude');
+            $table->index('geohash');
+            $table->index(['campus', 'geohash']);
+        });
+
+        // Backfill existing locations
+        DB::table('users')
+            ->whereNotNull('latitude')
+            ->whereNotNull('longitude')
+            ->select(['id', 'latitude', 'longitude'])
+            ->chunkById(1000, function ($rows) {
+                foreach ($rows as $row) {
+                    DB::table('users')->where('id', $row->id)->update([
+                        'geohash' => GeoHash::encode((float) $row->latitude, (float) $row->longitude),
+                    ]);
+                }
+            });
+    }
+
+    public function down(): void
+    {
+        Schema::table('users', function (Blueprint $table) {
+            $table->dropIndex(['campus', 'geohash']);
+            $table->dropIndex(['geohash']);
+            $table->dropColumn('geohash');
+        });
+    }
+};
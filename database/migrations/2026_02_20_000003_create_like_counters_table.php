@@ -0,0 +1,30 @@
+<?php
+
+use App\Models\LikeCounter;
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    public function up(): void
+    {
+        // Likes received per user per day (bucket = day the swipe was first recorded), for the leaderboard
+        Schema::create('like_counters', function (Blueprint $table) {
+            $table->id();
+            $table->foreignId('user_id')->constrained()->onDelete('cascade');
+            $table->date('day');
+            $table->unsignedInteger('likes')->default(0);
+
+            $table->unique(['user_id', 'day']);
+            $table->index(['day', 'likes']);
+        });
+
+        LikeCounter::rebuildFromSwipeActions();
+    }
+
+    public function down(): void
+    {
+        Schema::dropIfExists('like_counters');
+    }
+};
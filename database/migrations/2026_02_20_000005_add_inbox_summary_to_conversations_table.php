@@ -0,0 +1,84 @@
+<?php
+
+use App\Models\MessageRequest;
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+use Illuminate\Support\Str;
+
+return new class extends Migration
+{
+    public function up(): void
+    {
+        Schema::table('conversations', function (Blueprint $table) {
+            $table->unsignedBigInteger('last_message_id')->nullable()->after('user2_id');
+            $table->unsignedBigInteger('last_message_sender_id')->nullable()->after('last_message_id');
+            $table->string('last_message_body')->nullable()->after('last_message_sender_id');
+            $table->timestamp('last_message_read_at')->nullable()->after('last_message_body');
+            $table->timestamp('last_message_at')->nullable()->after('last_message_read_at');
+            $table->unsignedInteger('user1_unread_count')->default(0)->after('last_message_at');
+            $table->unsignedInteger('user2_unread_count')->default(0)->after('user1_unread_count');
+            $table->unsignedBigInteger('pending_request_from_id')->nullable()->after('user2_unread_count');
+            $table->index(['user1_id', 'updated_at']);
+            $table->index(['user2_id', 'updated_at']);
+        });
+
+        // Backfill the inbox summary from existing messages and pending requests
+        DB::table('conversations')
+            ->select(['id', 'user1_id', 'user2_id'])
+            ->chunkById(500, function ($rows) {
+                foreach ($rows as $row) {
+                    $last = DB::table('messages')
+                        ->where('conversation_id', $row->id)
+                        ->orderByDesc('created_at')
+                        ->orderByDesc('id')
+                        ->first();
+
+                    $unread = DB::table('messages')
+                        ->where('conversation_id', $row->id)
+                        ->whereNull('read_at')
+                        ->selectRaw('SUM(CASE WHEN sender_id = ? THEN 1 ELSE 0 END) AS from_user1', [$row->user1_id])
+                        ->selectRaw('SUM(CASE WHEN sender_id = ? THEN 1 ELSE 0 END) AS from_user2', [$row->user2_id])
+                        ->first();
+
+                    $pendingFrom = DB::table('message_requests')
+                        ->where('status', MessageRequest::STATUS_PENDING)
+                        ->where(function ($q) use ($row) {
+                            $q->where('from_user_id', $row->user1_id)->where('to_user_id', $row->user2_id)
+                                ->orWhere('from_user_id', $row->user2_id)->where('to_user_id', $row->user1_id);
+                        })
+                        ->value('from_user_id');
+
+                    DB::table('conversations')->where('id', $row->id)->update([
+                        'last_message_id' => $last?->id,
+                        'last_message_sender_id' => $last?->sender_id,
+                        'last_message_body' => $last ? Str::limit($last->body, 60) : null,
+                        'last_message_read_at' => $last?->read_at,
+                        'last_message_at' => $last?->created_at,
+                        'user1_unread_count' => (int) ($unread->from_user2 ?? 0),
+                        'user2_unread_count' => (int) ($unread->from_user1 ?? 0),
+                        'pending_request_from_id' => $pendingFrom,
+                    ]);
+                }
+            });
+    }
+
+    public function down(): void
+    {
+        Schema::table('conversations', function (Blueprint $table) {
+            $table->dropIndex(['user1_id', 'updated_at']);
+            $table->dropIndex(['user2_id', 'updated_at']);
+            $table->dropColumn([
+                'last_message_id',
+                'last_message_sender_id',
+                'last_message_body',
+                'last_message_read_at',
+                'last_message_at',
+                'user1_unread_count',
+                'user2_unread_count',
+                'pending_request_from_id',
+            ]);
+        });
+    }
+};
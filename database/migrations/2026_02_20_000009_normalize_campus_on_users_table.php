@@ -0,0 +1,27 @@
+<?php
+
+use App\Models\Campus;
+use App\Models\User;
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Support\Facades\DB;
+
+return new class extends Migration
+{
+    public function up(): void
+    {
+        // Same canonical spelling User::setCampusAttribute() writes, so lookups can use the (campus, geohash) index
+        Campus::forgetCanonicalNames();
+
+        foreach (DB::table('users')->whereNotNull('campus')->distinct()->pluck('campus') as $campus) {
+            $normalized = User::normalizeCampus($campus);
+            if ($normalized !== $campus) {
+                DB::table('users')->where('campus', $campus)->update(['campus' => $normalized]);
+            }
+        }
+    }
+
+    public function down(): void
+    {
+        // Normalized values are kept
+    }
+};
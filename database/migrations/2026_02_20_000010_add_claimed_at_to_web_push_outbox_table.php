@@ -0,0 +1,25 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    public function up(): void
+    {
+        Schema::table('web_push_outbox', function (Blueprint $table) {
+            // Set when a DeliverWebPushes run takes the row; the row is deleted once its push is sent
+            $table->timestamp('claimed_at')->nullable()->after('user_id');
+            $table->index('claimed_at');
+        });
+    }
+
+    public function down(): void
+    {
+        Schema::table('web_push_outbox', function (Blueprint $table) {
+            $table->dropIndex(['claimed_at']);
+            $table->dropColumn('claimed_at');
+        });
+    }
+};
@@ -2,9 +2,10 @@
 
 namespace Database\Seeders;
 
-use App\Http\Controllers\LeaderboardController;
+use App\Models\LikeCounter;
 use App\Models\SwipeAction;
 use App\Models\User;
+use App\Services\LeaderboardService;
 use Carbon\Carbon;
 use Illuminate\Database\Seeder;
 
@@ -97,8 +98,9 @@ public function run(): void
             }
         }
 
-        LeaderboardController::clearCache();
+        LikeCounter::rebuildFromSwipeActions();
+        app(LeaderboardService::class)->refreshAll();
 
-        $this->command->info("Leaderboard seeder: {$created} like swipe actions created, {$skipped} skipped (already exist). Cache cleared so leaderboard will show fresh data.");
+        $this->command->info("Leaderboard seeder: {$created} like swipe actions created, {$skipped} skipped (already exist). Like counters and rankings refreshed.");
     }
 }
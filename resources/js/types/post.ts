@@ -16,6 +16,8 @@ export interface Post {
     image: string | null;
     images?: string[] | null;
     images_list?: string[];
+    /** Small WebP previews, same order as images_list (feed only) */
+    image_thumbnails?: string[];
     likes_count: number;
     comments_count: number;
     reposts_count: number;
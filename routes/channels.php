@@ -2,7 +2,9 @@
 
 use App\Models\Conversation;
 use App\Models\User;
+use App\Services\NearbyMatchService;
 use Illuminate\Support\Facades\Broadcast;
+use Illuminate\Support\Str;
 
 /*
 |--------------------------------------------------------------------------
@@ -36,6 +38,18 @@
     ];
 });
 
+// Private campus channel: PresenceChanged (online dots in Chat)
+Broadcast::channel('campus.{slug}', function (User $user, string $slug): bool {
+    $campus = trim((string) $user->campus);
+
+    return $campus !== '' && Str::slug($campus, '-') === $slug;
+});
+
+// Find Your Match: only the cell the user is currently in (see NearbyMatchService::nearbyCellFor)
+Broadcast::channel('nearby.{cell}', function (User $user, string $cell): bool {
+    return NearbyMatchService::nearbyCellFor($user) === $cell;
+});
+
 // Public channel for app status updates (maintenance mode, pre-registration, etc.)
 // This is a public channel, no authentication needed
 Broadcast::channel('app-status', function (): bool {
@@ -1,8 +1,21 @@
 <?php
 
+use App\Jobs\DeliverWebPushes;
 use Illuminate\Foundation\Inspiring;
 use Illuminate\Support\Facades\Artisan;
+use Illuminate\Support\Facades\Schedule;
 
 Artisan::command('inspire', function () {
     $this->comment(Inspiring::quote());
 })->purpose('Display an inspiring quote');
+
+// Schedules run from cron-worker.php (schedule:run every minute on Hostinger cron)
+
+// Nightly rebuild of the Browse compatibility index (profile edits refresh it incrementally in between)
+Schedule::command('matchmaking:rebuild-index')->dailyAt('02:00');
+
+// Drain buffered presence heartbeats into users.last_seen_at (see PresenceService)
+Schedule::command('presence:flush')->everyMinute();
+
+// Pick up Web Push outbox rows whose worker died mid-send (claims expire after webpush.claim_timeout_minutes)
+Schedule::job(new DeliverWebPushes)->everyFiveMinutes();
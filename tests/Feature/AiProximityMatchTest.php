@@ -0,0 +1,77 @@
+<?php
+
+use App\Jobs\AssignAiProximityMatches;
+use App\Models\AiProximityMatch;
+use App\Models\User;
+use App\Services\ProximityMatchService;
+use OpenAI\Laravel\Facades\OpenAI;
+use OpenAI\Resources\Chat;
+use OpenAI\Responses\Chat\CreateResponse;
+
+function openAiPick(string $content): CreateResponse
+{
+    return CreateResponse::fake(['choices' => [['message' => ['content' => $content]]]]);
+}
+
+function campusUsers(int $count, array $attributes = []): array
+{
+    return User::factory()->count($count)->create(array_merge([
+        'campus' => 'Tandag',
+        'interests' => ['Music'],
+        'academic_program' => 'BS Nursing',
+    ], $attributes))->all();
+}
+
+beforeEach(function () {
+    config(['openai.api_key' => 'test-key', 'openai.match_shortlist' => 3]);
+});
+
+test('only the heuristic shortlist is sent to the model', function () {
+    OpenAI::fake([openAiPick('2')]);
+    [$me] = campusUsers(1, ['interests' => ['Coding', 'Chess', 'Music']]);
+    campusUsers(6);
+    $best = campusUsers(3, ['interests' => ['Coding', 'Chess', 'Music']]);
+
+    $debug = [];
+    $match = app(ProximityMatchService::class)->getOrAssignMatch($me, $debug);
+
+    expect($match->id)->toBe($best[1]->id);
+    expect($debug['source'])->toBe('openai');
+    OpenAI::assertSent(Chat::class, function (string $method, array $parameters): bool {
+        $prompt = $parameters['messages'][1]['content'];
+
+        return str_contains($prompt, 'Candidate 3:') && ! str_contains($prompt, 'Candidate 4:');
+    });
+});
+
+test('unchanged profiles reuse the cached answer', function () {
+    OpenAI::fake([openAiPick('1'), openAiPick('1')]);
+    [$me] = campusUsers(1);
+    campusUsers(2);
+    $service = app(ProximityMatchService::class);
+
+    $first = $service->getOrAssignMatch($me);
+    $service->resetMatch($me);
+    $debug = [];
+    expect($service->getOrAssignMatch($me, $debug)->id)->toBe($first->id);
+    expect($debug['openai_cached'] ?? false)->toBeTrue();
+    OpenAI::assertSent(Chat::class, 1);
+
+    $me->update(['bio' => 'Changed my bio']);
+    $service->resetMatch($me);
+    $service->getOrAssignMatch($me->fresh());
+    OpenAI::assertSent(Chat::class, 2);
+});
+
+test('bulk job assigns every eligible user without a pick', function () {
+    config(['openai.api_key' => null]);
+    OpenAI::fake();
+    $users = campusUsers(4);
+    User::factory()->create(['campus' => 'Tandag', 'is_disabled' => true]);
+
+    AssignAiProximityMatches::dispatch('Tandag');
+
+    expect(AiProximityMatch::pluck('user_id')->sort()->values()->all())
+        ->toBe(collect($users)->pluck('id')->sort()->values()->all());
+    OpenAI::assertNothingSent();
+});
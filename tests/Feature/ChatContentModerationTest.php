@@ -0,0 +1,68 @@
+<?php
+
+use App\Services\ChatContentModeration;
+
+test('each rule reports its own reason in priority order', function () {
+    $moderation = ChatContentModeration::fromConfig();
+
+    expect($moderation->check('   ')['reason'])->toBe('Message cannot be empty.');
+    expect($moderation->check('see example.org/page')['reason'])->toContain('Sharing links is not allowed');
+    expect($moderation->check('Please GCash me later')['reason'])->toContain('money, payments');
+    expect($moderation->check('I will transfer 500 tonight')['reason'])->toContain('money, payments');
+    expect($moderation->check('that is a SCAM')['reason'])->toContain('not allowed. Please keep');
+    expect($moderation->check('Want to study at the library later?'))->toBe(['allowed' => true, 'reason' => null]);
+});
+
+test('social domains are blocked even when generic links are allowed', function () {
+    $moderation = new ChatContentModeration(array_merge(config('chat_moderation'), ['block_links' => false]));
+
+    expect($moderation->check('read docs.example.org')['allowed'])->toBeTrue();
+    expect($moderation->check('add me instagram.com/someone')['reason'])->toContain('social media');
+});
+
+test('checkMany matches check and preserves keys', function () {
+    $moderation = ChatContentModeration::fromConfig();
+    $bodies = ['a' => 'hello there', 'b' => 'my ig is secret', 'c' => '', 'd' => 'venmo me', 'e' => 'see you in class'];
+
+    $results = $moderation->checkMany($bodies);
+
+    expect(array_keys($results))->toBe(array_keys($bodies));
+    foreach ($bodies as $key => $body) {
+        expect($results[$key])->toBe($moderation->check($body));
+    }
+});
+
+test('large and invalid keyword lists compile without breaking moderation', function () {
+    $keywords = ['([broken.*', 'forbiddenword'];
+    for ($i = 0; $i < 5000; $i++) {
+        $keywords[] = "generated keyword {$i}";
+    }
+    $moderation = new ChatContentModeration(['banned_keywords' => $keywords]);
+
+    expect($moderation->check('this has a forbiddenword inside')['allowed'])->toBeFalse();
+    expect($moderation->check('mentions generated keyword 4999 here')['allowed'])->toBeFalse();
+    expect($moderation->check('nothing to see')['allowed'])->toBeTrue();
+});
+
+test('a message PCRE cannot evaluate is blocked instead of allowed', function () {
+    $moderation = new ChatContentModeration(['banned_keywords' => ['forbiddenword']]);
+
+    $results = $moderation->checkMany(['ok' => 'see you in class', 'bad' => "forbidden\xC3\x28word"]);
+
+    expect($results['ok']['allowed'])->toBeTrue();
+    expect($results['bad']['allowed'])->toBeFalse();
+});
+
+test('regex entries with numbered backreferences or clashing group names are handled', function () {
+    $moderation = new ChatContentModeration(['banned_keywords' => [
+        '(a)\1.*x',
+        '(?<w>spam).*here',
+        '(?<w>junk).*mail',
+        'forbiddenword',
+    ]]);
+
+    expect($moderation->check('aa x')['allowed'])->toBeTrue();
+    expect($moderation->check('spam over here')['allowed'])->toBeFalse();
+    expect($moderation->check('junk in the mail')['allowed'])->toBeFalse();
+    expect($moderation->check('a forbiddenword')['allowed'])->toBeFalse();
+});
@@ -0,0 +1,109 @@
+<?php
+
+use App\Models\Conversation;
+use App\Models\MessageRequest;
+use App\Models\User;
+use Illuminate\Support\Facades\DB;
+
+function chatUser(): User
+{
+    return User::factory()->create(['terms_accepted_at' => now()]);
+}
+
+function sendChat(User $from, Conversation $conversation, string $body): void
+{
+    $conversation->postMessage($from->id, $body);
+}
+
+function countQueries(callable $callback): int
+{
+    DB::flushQueryLog();
+    DB::enableQueryLog();
+    $callback();
+    $count = count(DB::getQueryLog());
+    DB::disableQueryLog();
+
+    return $count;
+}
+
+test('inbox and unread badge use a constant number of queries', function () {
+    $me = chatUser();
+    $inboxQueries = [];
+    $badgeQueries = [];
+
+    // Warm up per-user throttles (last seen, settings) so they don't skew the comparison
+    $this->actingAs($me)->getJson('/api/conversations/unread-count')->assertOk();
+
+    foreach ([2, 12] as $size) {
+        while (Conversation::where('user1_id', $me->id)->orWhere('user2_id', $me->id)->count() < $size) {
+            $other = chatUser();
+            $conversation = Conversation::between($me->id, $other->id);
+            sendChat($other, $conversation, 'Hi there');
+        }
+
+        $this->actingAs($me);
+        $inboxQueries[$size] = countQueries(fn () => $this->getJson('/api/conversations')->assertOk()->assertJsonCount($size, 'data'));
+        $badgeQueries[$size] = countQueries(fn () => $this->getJson('/api/conversations/unread-count')->assertOk()->assertJson(['count' => $size]));
+    }
+
+    expect($inboxQueries[12])->toBe($inboxQueries[2]);
+    expect($badgeQueries[12])->toBe($badgeQueries[2]);
+});
+
+test('inbox summary follows sent and read messages', function () {
+    [$me, $other] = [chatUser(), chatUser()];
+    $conversation = Conversation::between($me->id, $other->id);
+
+    sendChat($other, $conversation, 'First');
+    sendChat($other, $conversation, str_repeat('long message ', 10));
+
+    $row = $this->actingAs($me)->getJson('/api/conversations')->assertOk()->json('data.0');
+    expect($row['unread_count'])->toBe(2);
+    expect($row['last_message']['sender_id'])->toBe($other->id);
+    expect($row['last_message']['body'])->toBe(\Str::limit(str_repeat('long message ', 10), 60));
+    expect($row['last_message']['read_at'])->toBeNull();
+    expect($row['is_pending_request'])->toBeFalse();
+
+    $first = $conversation->messages()->oldest()->first();
+    $this->postJson("/api/conversations/{$conversation->id}/read", ['message_ids' => [$first->id]])->assertOk();
+    expect($this->getJson('/api/conversations/unread-count')->json('count'))->toBe(1);
+
+    $this->postJson("/api/conversations/{$conversation->id}/read")->assertOk();
+    $row = $this->getJson('/api/conversations')->json('data.0');
+    expect($row['unread_count'])->toBe(0);
+    expect($row['last_message']['read_at'])->not->toBeNull();
+
+    $this->actingAs($other)->getJson('/api/conversations')->assertJsonPath('data.0.unread_count', 0);
+});
+
+test('marking a conversation read recounts messages that arrived after the read update', function () {
+    [$me, $other] = [chatUser(), chatUser()];
+    $conversation = Conversation::between($me->id, $other->id);
+    sendChat($other, $conversation, 'Hi');
+    $conversation->messages()->update(['read_at' => now()]);
+
+    // Lands between the read UPDATE and the counter refresh
+    sendChat($other, $conversation, 'Still there?');
+    $conversation->syncReadState($me->id);
+
+    expect($conversation->fresh()->unreadCountFor($me->id))->toBe(1);
+});
+
+test('message requests mark the conversation as pending until handled', function () {
+    [$me, $stranger] = [chatUser(), chatUser()];
+
+    $this->actingAs($stranger)
+        ->postJson('/api/conversations/send', ['user_id' => $me->id, 'body' => 'Hello!'])
+        ->assertCreated();
+    $this->getJson('/api/conversations')
+        ->assertJsonPath('data.0.is_pending_request', true)
+        ->assertJsonPath('data.0.pending_request_from_me', true);
+
+    $this->actingAs($me)->getJson('/api/conversations')
+        ->assertJsonPath('data.0.pending_request_from_me', false)
+        ->assertJsonPath('data.0.unread_count', 1);
+
+    $request = MessageRequest::where('to_user_id', $me->id)->firstOrFail();
+    $this->postJson("/api/message-requests/{$request->id}/accept")->assertOk();
+    $this->getJson('/api/conversations')->assertJsonPath('data.0.is_pending_request', false);
+});
@@ -0,0 +1,49 @@
+<?php
+
+use App\Models\User;
+use App\Services\DiscoverMatchmakingService;
+
+function discoverIds(User $viewer, array $filters = [], bool $boost = false): array
+{
+    $paginator = app(DiscoverMatchmakingService::class)->getMatches($viewer, 1, $filters, $boost);
+
+    return collect($paginator->items())->map(fn (array $item) => $item['user']->id)->all();
+}
+
+test('discover never reshows a face until everyone has been served', function () {
+    $viewer = User::factory()->create(['preferred_gender' => null]);
+    $blocked = User::factory()->create();
+    $viewer->block($blocked);
+    $others = User::factory()->count(45)->create()->pluck('id')->all();
+
+    $first = discoverIds($viewer);
+    $second = discoverIds($viewer);
+    $third = discoverIds($viewer);
+
+    expect($first)->toHaveCount(20)->and($second)->toHaveCount(20)->and($third)->toHaveCount(20);
+    expect(array_intersect($first, $second))->toBe([]);
+    expect(array_unique($third))->toHaveCount(20);
+
+    $remaining = array_diff($others, $first, $second);
+    expect($remaining)->toHaveCount(5);
+    expect(array_diff($remaining, $third))->toBe([]);
+
+    foreach ([$first, $second, $third] as $page) {
+        expect($page)->not->toContain($viewer->id)->not->toContain($blocked->id);
+    }
+});
+
+test('boosted users come first and filters still apply', function () {
+    $viewer = User::factory()->create(['preferred_gender' => 'Female']);
+    User::factory()->count(10)->create(['gender' => 'Female', 'campus' => 'Tandag']);
+    User::factory()->count(10)->create(['gender' => 'Male', 'campus' => 'Tandag']);
+    User::factory()->count(10)->create(['gender' => 'Female', 'campus' => 'Bislig']);
+    $boosted = User::factory()->create(['gender' => 'Female', 'campus' => 'Tandag', 'boost_ends_at' => now()->addHour()]);
+
+    $ids = discoverIds($viewer, ['campus' => 'Tandag'], true);
+
+    expect($ids[0])->toBe($boosted->id);
+    expect($ids)->toHaveCount(11);
+    expect(User::whereIn('id', $ids)->pluck('gender')->unique()->all())->toBe(['Female']);
+    expect(User::whereIn('id', $ids)->pluck('campus')->unique()->all())->toBe(['Tandag']);
+});
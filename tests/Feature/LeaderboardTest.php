@@ -0,0 +1,83 @@
+<?php
+
+use App\Models\LikeCounter;
+use App\Models\SwipeAction;
+use App\Models\User;
+use App\Services\LeaderboardService;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Sleep;
+
+function recordSwipe(User $from, User $to, string $intent): void
+{
+    test()->actingAs($from)
+        ->postJson('/api/matchmaking/action', ['target_user_id' => $to->id, 'intent' => $intent])
+        ->assertOk();
+}
+
+function leaderboardUsers(int $count): array
+{
+    return User::factory()->count($count)->create(['terms_accepted_at' => now()])->all();
+}
+
+test('likes are counted incrementally and withdrawn likes are subtracted', function () {
+    [$popular, $other, $a, $b, $c] = leaderboardUsers(5);
+
+    recordSwipe($a, $popular, SwipeAction::INTENT_DATING);
+    recordSwipe($b, $popular, SwipeAction::INTENT_FRIEND);
+    recordSwipe($c, $popular, SwipeAction::INTENT_IGNORED);
+    recordSwipe($c, $popular, SwipeAction::INTENT_STUDY_BUDDY);
+    recordSwipe($a, $other, SwipeAction::INTENT_DATING);
+    recordSwipe($a, $other, SwipeAction::INTENT_IGNORED);
+
+    $ranking = app(LeaderboardService::class)->refresh(LeaderboardService::PERIOD_DAY);
+
+    expect($ranking)->toHaveCount(1);
+    expect($ranking[0]['display_name'])->toBe($popular->display_name);
+    expect($ranking[0]['points'])->toBe(3);
+});
+
+test('submitting the same like twice counts it once', function () {
+    [$target, $fan] = leaderboardUsers(2);
+
+    recordSwipe($fan, $target, SwipeAction::INTENT_DATING);
+    recordSwipe($fan, $target, SwipeAction::INTENT_DATING);
+    recordSwipe($fan, $target, SwipeAction::INTENT_FRIEND);
+
+    expect((int) LikeCounter::where('user_id', $target->id)->sum('likes'))->toBe(1);
+});
+
+test('banned and disabled users are left out of the ranking', function () {
+    [$banned, $disabled, $fan] = leaderboardUsers(3);
+    $banned->update(['banned_at' => now()]);
+    $disabled->update(['is_disabled' => true]);
+
+    recordSwipe($fan, $banned, SwipeAction::INTENT_DATING);
+    recordSwipe($fan, $disabled, SwipeAction::INTENT_DATING);
+
+    expect(app(LeaderboardService::class)->refresh(LeaderboardService::PERIOD_WEEK))->toBe([]);
+});
+
+test('rebuilding counters from swipe actions matches the incremental counts', function () {
+    [$target, $a, $b] = leaderboardUsers(3);
+    recordSwipe($a, $target, SwipeAction::INTENT_DATING);
+    recordSwipe($b, $target, SwipeAction::INTENT_FRIEND);
+
+    $incremental = LikeCounter::where('user_id', $target->id)->sum('likes');
+    LikeCounter::rebuildFromSwipeActions();
+
+    expect((int) LikeCounter::where('user_id', $target->id)->sum('likes'))->toBe((int) $incremental);
+});
+
+test('a cold-cache reader waits out another refresh instead of getting an empty ranking', function () {
+    [$popular, $fan] = leaderboardUsers(2);
+    recordSwipe($fan, $popular, SwipeAction::INTENT_DATING);
+
+    // Another process holds the rebuild lock (and dies before storing anything); waiting advances the clock instead of sleeping
+    Sleep::fake(syncWithCarbon: true);
+    Cache::lock('leaderboard:refresh:day', 1)->get();
+
+    $ranking = app(LeaderboardService::class)->get(LeaderboardService::PERIOD_DAY);
+
+    expect($ranking)->toHaveCount(1);
+    expect($ranking[0]['points'])->toBe(1);
+});
@@ -0,0 +1,94 @@
+<?php
+
+use App\Jobs\RefreshMatchIndex;
+use App\Models\MatchScore;
+use App\Models\SwipeAction;
+use App\Models\User;
+use App\Services\MatchmakingService;
+use Illuminate\Support\Facades\Queue;
+
+function browseViewer(): User
+{
+    return User::factory()->create([
+        'preferred_gender' => null,
+        'preferred_age_min' => null,
+        'preferred_age_max' => null,
+    ]);
+}
+
+function pageSummary($paginator): array
+{
+    return collect($paginator->items())
+        ->map(fn (array $item) => [$item['user']->id, $item['compatibility_score']])
+        ->all();
+}
+
+test('browse pages from the precomputed index with the same scores as live scoring', function () {
+    Queue::fake();
+    $viewer = browseViewer();
+    User::factory()->count(8)->create();
+    $service = app(MatchmakingService::class);
+
+    $live = $service->getMatches($viewer);
+    Queue::assertPushed(RefreshMatchIndex::class);
+
+    $service->rebuildIndexFor($viewer);
+    $indexed = $service->getMatches($viewer->fresh());
+
+    expect($indexed->total())->toBe($live->total());
+    expect(collect(pageSummary($indexed))->sortBy(0)->values()->all())
+        ->toBe(collect(pageSummary($live))->sortBy(0)->values()->all());
+});
+
+test('a profile change re-scores the user inside existing indexes', function () {
+    Queue::fake();
+    $viewer = browseViewer();
+    $candidate = User::factory()->create();
+    $service = app(MatchmakingService::class);
+    $service->rebuildIndexFor($viewer);
+
+    $candidate->update(['is_disabled' => true]);
+    $service->refreshCandidateInIndexes($candidate);
+
+    expect(MatchScore::where('candidate_user_id', $candidate->id)->exists())->toBeFalse();
+});
+
+test('profile changes only touch indexes whose gender preference accepts the candidate', function () {
+    Queue::fake();
+    $candidate = User::factory()->create(['gender' => 'Female']);
+    $wantsMale = User::factory()->create(['preferred_gender' => 'Male', 'match_index_built_at' => now()]);
+    MatchScore::insert([
+        'user_id' => $wantsMale->id,
+        'candidate_user_id' => $candidate->id,
+        'compatibility_score' => 90,
+        'created_at' => now(),
+        'updated_at' => now(),
+    ]);
+
+    app(MatchmakingService::class)->refreshCandidateInIndexes($candidate);
+
+    expect(MatchScore::where('user_id', $wantsMale->id)->exists())->toBeFalse();
+});
+
+test('a drained index falls back to live scoring and queues a rebuild', function () {
+    Queue::fake();
+    $viewer = browseViewer();
+    User::factory()->count(3)->create();
+    $service = app(MatchmakingService::class);
+    $service->rebuildIndexFor($viewer);
+    $indexed = $service->getMatches($viewer->fresh());
+    Queue::assertNotPushed(RefreshMatchIndex::class);
+
+    // Hours later every indexed candidate has been swiped and new users have signed up
+    $this->travel(2)->hours();
+    foreach ($indexed->items() as $item) {
+        $viewer->swipeActions()->create(['target_user_id' => $item['user']->id, 'intent' => SwipeAction::INTENT_IGNORED]);
+    }
+    $newcomers = User::factory()->count(3)->create();
+
+    $page = $service->getMatches($viewer->fresh());
+
+    Queue::assertPushed(RefreshMatchIndex::class, fn (RefreshMatchIndex $job): bool => $job->userId === $viewer->id && ! $job->asCandidate);
+    // Live results: only users that were never in the index
+    expect(collect($page->items())->pluck('user.id')->diff($newcomers->modelKeys())->all())->toBe([]);
+});
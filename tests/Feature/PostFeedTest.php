@@ -0,0 +1,84 @@
+<?php
+
+use App\Models\Post;
+use App\Models\User;
+use App\Services\FeedService;
+use App\Services\PostImageVariants;
+use Illuminate\Http\UploadedFile;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Storage;
+
+function feedUser(): User
+{
+    return User::factory()->create(['terms_accepted_at' => now()]);
+}
+
+test('feed pages by cursor with slim authors and per-viewer flags', function () {
+    $author = feedUser();
+    $ids = collect(range(1, 20))->map(fn (int $i) => Post::create(['user_id' => $author->id, 'content' => "Post {$i}"])->id);
+    $viewer = feedUser();
+    $viewer->following()->attach($author->id);
+    Post::find($ids->last())->toggleLike($viewer->id);
+
+    $first = $this->actingAs($viewer)->getJson('/api/posts?per_page=10')->assertOk()->json();
+
+    expect(array_column($first['data'], 'id'))->toBe($ids->reverse()->take(10)->values()->all());
+    expect(array_keys($first['data'][0]['user']))->toBe(FeedService::AUTHOR_COLUMNS);
+    expect($first['data'][0]['is_liked_by_user'])->toBeTrue();
+    expect($first['data'][1]['is_liked_by_user'])->toBeFalse();
+    expect($first['data'][0]['is_followed_by_user'])->toBeTrue();
+    expect($first)->not->toHaveKey('total');
+
+    $second = $this->actingAs($viewer)->getJson($first['next_page_url'])->assertOk()->json();
+    expect(array_column($second['data'], 'id'))->toBe($ids->reverse()->skip(10)->values()->all());
+    expect($second['next_cursor'])->toBeNull();
+
+    // Same cached page, the other viewer's own flags
+    $page = $this->actingAs($author)->getJson('/api/posts?per_page=10')->assertOk()->json();
+    expect($page['data'][0]['is_liked_by_user'])->toBeFalse();
+    expect($page['data'][0]['is_followed_by_user'])->toBeFalse();
+    expect($page['data'][0]['is_own_post'])->toBeTrue();
+});
+
+test('likes and reposts show on cached pages; new posts invalidate them', function () {
+    $author = feedUser();
+    $post = Post::create(['user_id' => $author->id, 'content' => 'Hello']);
+    $viewer = feedUser();
+
+    $this->actingAs($viewer)->getJson('/api/posts')->assertOk();
+    $version = Cache::get('feed:version', 0);
+
+    $this->actingAs($viewer)->postJson("/api/posts/{$post->id}/like")->assertOk();
+    $this->actingAs($viewer)->postJson("/api/posts/{$post->id}/repost")->assertOk();
+    expect(Cache::get('feed:version', 0))->toBe($version);
+
+    $data = $this->actingAs($viewer)->getJson('/api/posts')->json('data');
+    expect($data[0]['likes_count'])->toBe(1);
+    expect($data[0]['reposts_count'])->toBe(1);
+    expect($data[0]['is_liked_by_user'])->toBeTrue();
+
+    $this->actingAs($author)->postJson('/api/posts', ['content' => 'Newer'])->assertCreated();
+    expect($this->actingAs($viewer)->getJson('/api/posts')->json('data.0.content'))->toBe('Newer');
+});
+
+test('uploaded images are served as resized webp variants', function () {
+    Storage::fake('public');
+    $author = feedUser();
+
+    $this->actingAs($author)->post('/api/posts', [
+        'content' => 'Sunset',
+        'images' => [UploadedFile::fake()->image('sunset.jpg', 2400, 1600)],
+    ], ['Accept' => 'application/json'])->assertCreated();
+
+    $post = Post::latest('id')->first();
+    $variants = $post->image_variants[$post->images[0]];
+    Storage::disk('public')->assertExists([$variants['thumb'], $variants['feed']]);
+    expect(getimagesizefromstring(Storage::disk('public')->get($variants['feed']))[0])->toBe(PostImageVariants::SIZES['feed']);
+
+    $item = $this->actingAs($author)->getJson('/api/posts')->json('data.0');
+    expect($item['images_list'])->toBe([$variants['feed']]);
+    expect($item['image_thumbnails'])->toBe([$variants['thumb']]);
+
+    $this->actingAs($author)->deleteJson("/api/posts/{$post->id}")->assertOk();
+    Storage::disk('public')->assertMissing([$post->images[0], $variants['thumb'], $variants['feed']]);
+})->skip(fn () => ! PostImageVariants::supported(), 'GD with WebP support is not installed');
@@ -0,0 +1,98 @@
+<?php
+
+use App\Events\NearbyUpdated;
+use App\Events\PresenceChanged;
+use App\Models\User;
+use App\Services\GeoHash;
+use App\Services\NearbyMatchService;
+use App\Services\PresenceService;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Event;
+
+function userAt(float $latitude, float $longitude): User
+{
+    return User::factory()->create([
+        'campus' => 'Tandag',
+        'latitude' => $latitude,
+        'longitude' => $longitude,
+        'geohash' => GeoHash::encode($latitude, $longitude),
+        'location_updated_at' => now(),
+    ]);
+}
+
+beforeEach(function () {
+    config(['broadcasting.default' => 'log']);
+    // PresenceChanged is broadcast after the response; run deferred callbacks inline
+    $this->withoutDefer();
+});
+
+test('heartbeats are buffered and flushed in one bulk update', function () {
+    $users = User::factory()->count(3)->create(['last_seen_at' => null]);
+    $presence = app(PresenceService::class);
+    $presence->flush();
+
+    foreach ($users as $user) {
+        expect($presence->heartbeat($user))->toBeTrue();
+    }
+    expect($presence->heartbeat($users[0]))->toBeFalse();
+    expect(User::whereNotNull('last_seen_at')->count())->toBe(0);
+
+    // Only buckets whose minute has closed are drained
+    $this->travel(2)->minutes();
+    DB::enableQueryLog();
+    expect($presence->flush())->toBe(3);
+    $updates = collect(DB::getQueryLog())->filter(fn (array $q): bool => str_starts_with(strtolower($q['query']), 'update'));
+    DB::disableQueryLog();
+
+    expect($updates)->toHaveCount(1);
+    expect($users->every(fn (User $u): bool => $u->fresh()->isOnline()))->toBeTrue();
+    expect($presence->flush())->toBe(0);
+});
+
+test('heartbeats write last seen directly while no flush is running', function () {
+    $user = User::factory()->create(['last_seen_at' => null]);
+    $presence = app(PresenceService::class);
+
+    expect($presence->heartbeat($user))->toBeTrue();
+    expect($user->fresh()->isOnline())->toBeTrue();
+    expect($presence->heartbeat($user->fresh()))->toBeFalse();
+
+    // Scheduler stopped after an earlier flush
+    $presence->flush();
+    $seenAt = $user->fresh()->last_seen_at;
+    $this->travel(PresenceService::FLUSH_OVERDUE_SECONDS + 60)->seconds();
+    expect($presence->heartbeat($user->fresh()))->toBeTrue();
+    expect($user->fresh()->last_seen_at->gt($seenAt))->toBeTrue();
+});
+
+test('coming back online is announced on the private campus channel', function () {
+    Event::fake([PresenceChanged::class]);
+    $away = User::factory()->create(['campus' => 'Tandag', 'last_seen_at' => now()->subHour()]);
+    $active = User::factory()->create(['campus' => 'Tandag', 'last_seen_at' => now()->subMinute()]);
+    $presence = app(PresenceService::class);
+
+    $presence->heartbeat($away);
+    $presence->heartbeat($active);
+
+    Event::assertDispatchedTimes(PresenceChanged::class, 1);
+    Event::assertDispatched(PresenceChanged::class, fn (PresenceChanged $e): bool => $e->user->is($away)
+        && $e->broadcastOn()[0]->name === 'private-campus.tandag');
+});
+
+test('a location update signals only the cells around the mover', function () {
+    Event::fake([NearbyUpdated::class]);
+    $mover = User::factory()->create(['campus' => 'Tandag', 'terms_accepted_at' => now()]);
+    $near = userAt(9.07831, 126.19861);
+    $far = userAt(9.0883, 126.1986);
+
+    $this->actingAs($mover)->putJson('/api/account/location', ['latitude' => 9.0783, 'longitude' => 126.1986])->assertOk();
+    $this->actingAs($mover)->putJson('/api/account/location', ['latitude' => 9.07832, 'longitude' => 126.19862])->assertOk();
+
+    Event::assertDispatchedTimes(NearbyUpdated::class, 2);
+    Event::assertDispatched(NearbyUpdated::class, function (NearbyUpdated $e) use ($near, $far): bool {
+        $channels = collect($e->broadcastOn())->pluck('name');
+
+        return $channels->contains('private-nearby.'.NearbyMatchService::nearbyCellFor($near))
+            && ! $channels->contains('private-nearby.'.NearbyMatchService::nearbyCellFor($far));
+    });
+});
@@ -0,0 +1,72 @@
+<?php
+
+use App\Models\Campus;
+use App\Models\User;
+use App\Services\GeoHash;
+use App\Services\ProximityMatchService;
+
+/** Longitude of the first cell edge east of the campus base at the precision used for this radius. */
+function cellEdgeLongitude(float $radiusM): float
+{
+    [, $lonDeg] = GeoHash::cellSizeDegrees(GeoHash::precisionForRadius(9.0783, $radiusM));
+
+    return -180 + ceil((126.1986 + 180) / $lonDeg) * $lonDeg;
+}
+
+/** Longitude offset for a distance in meters at the test latitude. */
+function metersEast(float $meters): float
+{
+    return $meters / (111320 * cos(deg2rad(9.0783)));
+}
+
+function placedUser(float $longitude, array $attributes = []): User
+{
+    return User::factory()->create($attributes + [
+        'campus' => 'Tandag',
+        'gender' => 'Female',
+        'preferred_gender' => null,
+        'latitude' => 9.0783,
+        'longitude' => $longitude,
+        'geohash' => GeoHash::encode(9.0783, $longitude),
+        'last_seen_at' => now(),
+        'location_updated_at' => now(),
+    ]);
+}
+
+beforeEach(function () {
+    Campus::create(['name' => 'Tandag', 'base_latitude' => 9.0783, 'base_longitude' => cellEdgeLongitude(ProximityMatchService::RADAR_RADIUS_M) - metersEast(50)]);
+});
+
+test('campus spellings are stored in one canonical form', function () {
+    expect(placedUser(126.1986, ['campus' => "  tandag \t"])->campus)->toBe('Tandag');
+    expect(User::normalizeCampus('San   Miguel '))->toBe('San Miguel');
+});
+
+test('nearby hearts include users across a geohash cell edge and drop everyone else', function () {
+    $edge = cellEdgeLongitude(ProximityMatchService::NEARBY_RADIUS_M);
+    $viewer = placedUser($edge - metersEast(5));
+    $acrossEdge = placedUser($edge + metersEast(5), ['campus' => 'tandag ']);
+    placedUser($edge + metersEast(40));
+    placedUser($edge + metersEast(3), ['campus' => 'San Miguel']);
+    placedUser($edge + metersEast(3), ['last_seen_at' => now()->subHour(), 'location_updated_at' => now()->subHour()]);
+
+    $precision = GeoHash::precisionForRadius(9.0783, ProximityMatchService::NEARBY_RADIUS_M);
+    expect(substr($acrossEdge->geohash, 0, $precision))->not->toBe(substr($viewer->geohash, 0, $precision));
+
+    $ids = array_column(app(ProximityMatchService::class)->getNearbyUsersWithPosition($viewer), 'id');
+
+    expect($ids)->toBe([$acrossEdge->id]);
+});
+
+test('radar blips come from both sides of a cell edge within the radar radius', function () {
+    $edge = cellEdgeLongitude(ProximityMatchService::RADAR_RADIUS_M);
+    $viewer = placedUser($edge - metersEast(100));
+    $near = placedUser($edge + metersEast(200));
+    placedUser($edge + metersEast(ProximityMatchService::RADAR_RADIUS_M + 100));
+
+    $radar = app(ProximityMatchService::class)->getRadarData($viewer);
+
+    expect($radar['campus_base'])->not->toBeNull();
+    expect(array_column($radar['nearby_users'], 'id'))->toBe([$near->id]);
+    expect($radar['nearby_users'][0]['distance_from_base_m'])->toBeLessThan(ProximityMatchService::RADAR_RADIUS_M);
+});
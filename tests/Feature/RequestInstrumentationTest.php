@@ -0,0 +1,27 @@
+<?php
+
+use App\Models\User;
+
+test('instrumentation is off by default', function () {
+    $user = User::factory()->create(['terms_accepted_at' => now()]);
+
+    $response = $this->actingAs($user)->getJson('/api/matchmaking/discover')->assertOk();
+
+    expect($response->headers->has('X-Metrics-Queries'))->toBeFalse();
+    expect($response->headers->has('Server-Timing'))->toBeFalse();
+});
+
+test('enabled instrumentation reports queries, cache and service timings', function () {
+    config(['instrumentation.enabled' => true, 'instrumentation.log' => false]);
+    $user = User::factory()->create(['terms_accepted_at' => now()]);
+    User::factory()->count(3)->create();
+
+    $response = $this->actingAs($user)->getJson('/api/matchmaking/discover')->assertOk();
+
+    expect((int) $response->headers->get('X-Metrics-Queries'))->toBeGreaterThan(0);
+    expect($response->headers->get('X-Metrics-Cache'))->toMatch('/^hits=\d+; misses=\d+$/');
+    expect($response->headers->get('Server-Timing'))
+        ->toContain('total;dur=')
+        ->toContain('db;dur=')
+        ->toContain('discover-sample;dur=');
+});
@@ -0,0 +1,140 @@
+<?php
+
+use App\Jobs\DeliverWebPushes;
+use App\Models\Notification;
+use App\Models\PushSubscription;
+use App\Models\User;
+use App\Services\WebPushService;
+use GuzzleHttp\HandlerStack;
+use GuzzleHttp\Psr7\Response;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Queue;
+use Minishlink\WebPush\SubscriptionInterface;
+use Minishlink\WebPush\VAPID;
+use Minishlink\WebPush\WebPush;
+use Psr\Http\Message\RequestInterface;
+
+/**
+ * Push client that records each queued payload and sends it to a local fake push service,
+ * which answers 410 Gone for endpoints containing "dead".
+ */
+function fakePushClient(array &$requests): WebPush
+{
+    // Deliveries are driven explicitly below instead of through the (sync) queue
+    Queue::fake();
+    $vapid = VAPID::createVapidKeys();
+    config(['webpush.coalesce_seconds' => 0]);
+
+    $handler = function (RequestInterface $request, array $options) use (&$requests) {
+        $requests[] = (string) $request->getUri();
+
+        return \GuzzleHttp\Promise\Create::promiseFor(
+            new Response(str_contains((string) $request->getUri(), 'dead') ? 410 : 201)
+        );
+    };
+
+    $client = new class(['VAPID' => $vapid + ['subject' => 'mailto:test@example.test']], [], 10, ['handler' => HandlerStack::create($handler)]) extends WebPush
+    {
+        /** @var list<array{endpoint: string, payload: array}> */
+        public array $queued = [];
+
+        public function queueNotification(SubscriptionInterface $subscription, ?string $payload = null, array $options = [], array $auth = []): void
+        {
+            $this->queued[] = ['endpoint' => $subscription->getEndpoint(), 'payload' => json_decode((string) $payload, true)];
+            parent::queueNotification($subscription, $payload, $options, $auth);
+        }
+    };
+    app()->instance(WebPushService::class, (new WebPushService)->usingWebPush($client));
+
+    return $client;
+}
+
+function browserSubscription(User $user, string $endpoint): PushSubscription
+{
+    $key = openssl_pkey_new(['curve_name' => 'prime256v1', 'private_key_type' => OPENSSL_KEYTYPE_EC]);
+    $ec = openssl_pkey_get_details($key)['ec'];
+    $b64 = fn (string $bin) => rtrim(strtr(base64_encode($bin), '+/', '-_'), '=');
+
+    return PushSubscription::create([
+        'user_id' => $user->id,
+        'endpoint' => $endpoint,
+        'public_key' => $b64("\x04".$ec['x'].$ec['y']),
+        'auth_token' => $b64(random_bytes(16)),
+    ]);
+}
+
+test('pending notifications are coalesced per user and sent to every endpoint', function () {
+    $requests = [];
+    $client = fakePushClient($requests);
+    $service = app(WebPushService::class);
+    [$recipient, $sender] = User::factory()->count(2)->create()->all();
+    browserSubscription($recipient, 'https://push.example.test/phone');
+    browserSubscription($recipient, 'https://push.example.test/laptop');
+
+    foreach (range(1, 3) as $i) {
+        $latest = Notification::notify($recipient->id, 'follow', $sender->id, 'user', $sender->id);
+        $service->queueForNotification($latest);
+    }
+    expect($service->deliverPending())->toBe(3);
+
+    Queue::assertPushed(DeliverWebPushes::class);
+    // One coalesced push per endpoint, not one per notification
+    expect($requests)->toHaveCount(2);
+    expect(array_column($client->queued, 'endpoint'))->toBe(['https://push.example.test/phone', 'https://push.example.test/laptop']);
+    foreach ($client->queued as $push) {
+        expect($push['payload']['count'])->toBe(3);
+        expect($push['payload']['id'])->toBe($latest->id);
+        expect($push['payload']['body'])->toEndWith('(+2 more)');
+    }
+    expect(DB::table('web_push_outbox')->count())->toBe(0);
+});
+
+test('expired subscriptions are pruned after delivery', function () {
+    $requests = [];
+    fakePushClient($requests);
+    $service = app(WebPushService::class);
+    [$recipient, $sender] = User::factory()->count(2)->create()->all();
+    browserSubscription($recipient, 'https://push.example.test/alive');
+    browserSubscription($recipient, 'https://push.example.test/dead');
+
+    $service->queueForNotification(Notification::notify($recipient->id, 'follow', $sender->id, 'user', $sender->id));
+    $service->deliverPending();
+
+    expect(PushSubscription::pluck('endpoint')->all())->toBe(['https://push.example.test/alive']);
+});
+
+test('rows claimed by another worker are skipped until the claim goes stale', function () {
+    $requests = [];
+    $client = fakePushClient($requests);
+    $service = app(WebPushService::class);
+    [$recipient, $sender] = User::factory()->count(2)->create()->all();
+    browserSubscription($recipient, 'https://push.example.test/phone');
+
+    $service->queueForNotification(Notification::notify($recipient->id, 'follow', $sender->id, 'user', $sender->id));
+    DB::table('web_push_outbox')->update(['claimed_at' => now()]);
+
+    expect($service->deliverPending())->toBe(0);
+    expect(DB::table('web_push_outbox')->count())->toBe(1);
+
+    // The claiming worker died mid-send
+    $this->travel(config('webpush.claim_timeout_minutes') + 1)->minutes();
+    expect($service->deliverPending())->toBe(1);
+    expect($client->queued)->toHaveCount(1);
+    expect(DB::table('web_push_outbox')->count())->toBe(0);
+});
+
+test('a mix of notification types is summarized instead of reusing one excerpt', function () {
+    $requests = [];
+    $client = fakePushClient($requests);
+    $service = app(WebPushService::class);
+    [$recipient, $sender] = User::factory()->count(2)->create()->all();
+    browserSubscription($recipient, 'https://push.example.test/phone');
+
+    $service->queueForNotification(Notification::notify($recipient->id, 'follow', $sender->id, 'user', $sender->id));
+    $service->queueForNotification(Notification::notify($recipient->id, 'message', $sender->id, 'user', $sender->id, ['excerpt' => 'See you at the library']));
+    $service->deliverPending();
+
+    expect($client->queued)->toHaveCount(1);
+    expect($client->queued[0]['payload']['body'])->toBe('You have 2 new notifications');
+    expect($client->queued[0]['payload']['body'])->not->toContain('library');
+});
@@ -0,0 +1,24 @@
+<?php
+
+use App\Services\GeoHash;
+use App\Services\NearbyMatchService;
+
+test('geohash encodes the reference point', function () {
+    expect(GeoHash::encode(57.64911, 10.40744, 11))->toBe('u4pruydqqvj');
+});
+
+test('covering cells contain every point inside the radius', function () {
+    $lat = 9.0783;
+    $lon = 126.1986;
+    $radius = 15.0;
+    $cells = GeoHash::cellsCovering($lat, $lon, $radius);
+
+    for ($bearing = 0; $bearing < 360; $bearing += 15) {
+        $dLat = ($radius * 0.99 * cos(deg2rad($bearing))) / 111320;
+        $dLon = ($radius * 0.99 * sin(deg2rad($bearing))) / (111320 * cos(deg2rad($lat)));
+        $hash = GeoHash::encode($lat + $dLat, $lon + $dLon);
+
+        expect(NearbyMatchService::distanceMeters($lat, $lon, $lat + $dLat, $lon + $dLon))->toBeLessThanOrEqual($radius);
+        expect(collect($cells)->contains(fn (string $cell) => str_starts_with($hash, $cell)))->toBeTrue();
+    }
+});